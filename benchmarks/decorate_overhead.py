@@ -0,0 +1,90 @@
+"""
+Measures per-call overhead that `open_api` decorators add to decorated view functions.
+
+Compares undecorated callables with decorated ones, in both decoration modes:
+
+- `wrapt`: `FlaskPathsManager.WRAP_VIEW_FUNCTIONS = True` (legacy behavior)
+- `attr`: `FlaskPathsManager.WRAP_VIEW_FUNCTIONS = False` (default)
+
+for plain view functions and for `MethodView` methods.
+
+Usage:
+
+    python benchmarks/decorate_overhead.py [--number 1000000]
+"""
+
+import argparse
+import timeit
+
+import flask.views
+import marshmallow as ma
+
+from flask_marshmallow_openapi import open_api
+from flask_marshmallow_openapi.flask_paths import FlaskPathsManager
+
+
+class BenchSchema(ma.Schema):
+    id = ma.fields.Integer()
+
+
+def _make_view_function(*, decorate: bool):
+    def view(item_id):
+        return item_id
+
+    if decorate:
+        view = open_api.get_detail(BenchSchema)(view)
+
+    return view
+
+
+def _make_method_view(*, decorate: bool):
+    class BenchView(flask.views.MethodView):
+        def get(self, item_id):
+            return item_id
+
+    if decorate:
+        BenchView.get = open_api.get_detail(BenchSchema)(BenchView.get)
+
+    return BenchView()
+
+
+def _per_call_ns(callable_, number: int) -> float:
+    timer = timeit.Timer(lambda: callable_(42))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    results = {}
+
+    results["function", "undecorated"] = _per_call_ns(
+        _make_view_function(decorate=False), args.number
+    )
+    results["MethodView.get", "undecorated"] = _per_call_ns(
+        _make_method_view(decorate=False).get, args.number
+    )
+
+    saved_wrap = FlaskPathsManager.WRAP_VIEW_FUNCTIONS
+    try:
+        for mode, wrap in [("wrapt", True), ("attr", False)]:
+            FlaskPathsManager.WRAP_VIEW_FUNCTIONS = wrap
+            results["function", mode] = _per_call_ns(
+                _make_view_function(decorate=True), args.number
+            )
+            results["MethodView.get", mode] = _per_call_ns(
+                _make_method_view(decorate=True).get, args.number
+            )
+    finally:
+        FlaskPathsManager.WRAP_VIEW_FUNCTIONS = saved_wrap
+
+    print(f"{'callable':<16} {'mode':<12} {'ns/call':>9} {'overhead':>9}")
+    for (kind, mode), ns in results.items():
+        overhead = ns - results[kind, "undecorated"]
+        print(f"{kind:<16} {mode:<12} {ns:>9.1f} {overhead:>+9.1f}")
+
+
+if __name__ == "__main__":
+    main()
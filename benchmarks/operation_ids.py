@@ -0,0 +1,46 @@
+"""
+Measures how `operationId` de-duplication scales with number of routes.
+
+Worst case is measured: every route generates the same `operationId`, so each one of
+them gets a numeric suffix. Per-operation time should stay roughly constant as number
+of routes grows (former implementation was scanning all already registered IDs, which
+was quadratic in total).
+
+Usage:
+
+    python benchmarks/operation_ids.py [--routes 10000 40000]
+"""
+
+import argparse
+import time
+
+import flask
+
+from flask_marshmallow_openapi.flask_paths import FlaskPathsManager
+
+
+def _register_s(count: int) -> float:
+    paths_manager = FlaskPathsManager(flask.Flask(__name__))
+    operations = [{"operationId": "get_foo"} for _ in range(count)] + [
+        {"operationId": f"get_bar_{i}"} for i in range(count)
+    ]
+    start = time.perf_counter()
+    for operation in operations:
+        paths_manager._register_operation_id(operation)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--routes", type=int, nargs="+", default=[10_000, 40_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'routes':>9} {'total_s':>9} {'us/route':>9}")
+    for count in args.routes:
+        seconds = min(_register_s(count) for _ in range(args.repeat))
+        print(f"{count:>9} {seconds:>9.3f} {seconds / (2 * count) * 1e6:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Per-worker memory use of pre-fork spec build.
+
+Simulates pre-forking server (ie. gunicorn with `preload_app = True`) serving synthetic
+app (see `synthetic_app.py`) and compares two setups:
+
+- `postfork` - master imports app package, each worker calls `OpenAPI.init_app`
+- `prefork` - master calls `OpenAPI.init_app` and `OpenAPI.prefork`, workers only
+  serve already serialized documents
+
+Each worker serves swagger.json and swagger.yaml a few times, runs full garbage
+collection (as it eventually would under load) and then reports its memory from
+`/proc/self/smaps_rollup`:
+
+- `rss_bytes` - resident memory, including pages shared with master
+- `pss_bytes` - proportional share of resident memory
+- `private_bytes` - memory used only by that worker (USS); this is what each
+  additional worker costs
+
+Each setup runs in fresh Python process and results (medians across workers) are
+printed as JSON. Linux only.
+
+Usage:
+
+    python benchmarks/prefork_memory.py --routes 2000 --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from synthetic_app import generate_app
+
+from flask_marshmallow_openapi import OpenAPI, OpenAPISettings, __version__
+
+_REQUESTS = 5
+
+_SMAPS_FIELDS = {
+    "Rss": "rss_bytes",
+    "Pss": "pss_bytes",
+    "Private_Clean": "private_bytes",
+    "Private_Dirty": "private_bytes",
+}
+
+
+def _open_api(package_name: str):
+    return OpenAPI(
+        config=OpenAPISettings(
+            api_name="Synthetic API",
+            api_version="v1",
+            app_package_name=package_name,
+            mounted_at="/v1",
+            changelog_md_loader=lambda: "# CHANGELOG\n",
+        )
+    )
+
+
+def _memory() -> dict:
+    retv = dict.fromkeys(_SMAPS_FIELDS.values(), 0)
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+        name, _, value = line.partition(":")
+        if name in _SMAPS_FIELDS:
+            # Values are in kB
+            retv[_SMAPS_FIELDS[name]] += int(value.split()[0]) * 1024
+    return retv
+
+
+def _serve(app) -> dict:
+    client = app.test_client()
+    for _ in range(_REQUESTS):
+        client.get("/v1/docs/static/swagger.json")
+        client.get("/v1/docs/static/swagger.yaml")
+    gc.collect()
+    return _memory()
+
+
+def _run_workers(job: dict) -> dict:
+    sys.path.insert(0, job["apps_dir"])
+    package = importlib.import_module(job["package_name"])
+
+    app = None
+    if job["setup"] == "prefork":
+        app = package.create_app()
+        open_api = _open_api(job["package_name"])
+        open_api.init_app(app)
+        open_api.prefork()
+
+    master = _memory()
+
+    workers = []
+    for _ in range(job["workers"]):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            if app is None:
+                app = package.create_app()
+                _open_api(job["package_name"]).init_app(app)
+            with os.fdopen(write_fd, "w") as f:
+                f.write(json.dumps(_serve(app)))
+            os._exit(0)
+        os.close(write_fd)
+        workers.append((pid, read_fd))
+
+    # Workers are measured while all of them are still alive, so shared pages are
+    # really shared
+    results = []
+    for pid, read_fd in workers:
+        with os.fdopen(read_fd) as f:
+            results.append(json.loads(f.read()))
+        os.waitpid(pid, 0)
+
+    retv = {"master_rss_bytes": master["rss_bytes"]}
+    for key in _SMAPS_FIELDS.values():
+        retv[f"worker_{key}"] = statistics.median(_[key] for _ in results)
+    return retv
+
+
+def _run_in_subprocess(job: dict) -> dict:
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, "--run", json.dumps(job)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Per-worker memory use of pre-fork spec build.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--routes", type=int, default=2000, help="Generated app size, as routes"
+    )
+    parser.add_argument(
+        "--routes-per-schema",
+        type=int,
+        default=5,
+        help="Number of routes for each generated schema",
+    )
+    parser.add_argument("--workers", type=int, default=4, help="Forked workers")
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    parser.add_argument("--run", type=json.loads, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        print(json.dumps(_run_workers(args.run)))
+        return
+
+    schemas_count = max(1, args.routes // args.routes_per_schema)
+    results = {}
+    with tempfile.TemporaryDirectory() as apps_dir:
+        package_name = generate_app(
+            apps_dir, routes_count=args.routes, schemas_count=schemas_count
+        )
+        for setup in ["postfork", "prefork"]:
+            results[setup] = _run_in_subprocess(
+                {
+                    "apps_dir": apps_dir,
+                    "package_name": package_name,
+                    "setup": setup,
+                    "workers": args.workers,
+                }
+            )
+            print(
+                f"{setup}: worker private "
+                f"{results[setup]['worker_private_bytes'] / 2**20:.1f}MiB",
+                file=sys.stderr,
+            )
+
+    report = json.dumps(
+        {
+            "flask_marshmallow_openapi": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "routes": args.routes,
+            "schemas": schemas_count,
+            "workers": args.workers,
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,242 @@
+"""
+Spec build scaling benchmarks.
+
+For each requested app size, generates synthetic app (see `synthetic_app.py`) and
+measures:
+
+- `import_s` - import time of app package (decorators run at import time)
+- `init_app_s` - `OpenAPI.init_app` wall time
+- `schema_conversions` - number of marshmallow schemas converted into JSON schema
+  while building spec; each schema is converted once, no matter how many other schemas
+  nest it (0 if spec is loaded from `spec_snapshot_dir`)
+- `init_app_peak_bytes` - peak memory allocated during `OpenAPI.init_app` (tracemalloc)
+- `retained_bytes` - memory allocated since `OpenAPI.init_app` started that is still
+  allocated after first `GET swagger.json` (tracemalloc)
+- `swagger_json_first_s` - latency of first `GET swagger.json`
+- `swagger_json_warm_s` - median latency of subsequent `GET swagger.json`
+- `collect_static_s` - `OpenAPI.collect_static` wall time
+
+Each measurement runs in fresh Python process (memory measurement in separate one,
+because tracemalloc slows everything down) and results are printed as JSON.
+
+Usage:
+
+    python benchmarks/spec_build.py --routes 100 1000 5000 --output results.json
+    python benchmarks/spec_build.py --routes 1000 --settings '{"spec_build_workers": 4}'
+    python benchmarks/spec_build.py --routes 2000 \
+        --settings '{"release_build_data": true}'
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import importlib
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from apispec.ext.marshmallow.openapi import OpenAPIConverter
+from synthetic_app import generate_app
+
+from flask_marshmallow_openapi import OpenAPI, OpenAPISettings, __version__
+
+_SWAGGER_JSON_WARM_REQUESTS = 20
+
+
+def _open_api(package_name: str, settings: dict):
+    return OpenAPI(
+        config=OpenAPISettings(
+            api_name="Synthetic API",
+            api_version="v1",
+            app_package_name=package_name,
+            mounted_at="/v1",
+            changelog_md_loader=lambda: "# CHANGELOG\n",
+            **settings,
+        )
+    )
+
+
+def _measure_timings(job: dict) -> dict:
+    sys.path.insert(0, job["apps_dir"])
+
+    start = time.perf_counter()
+    package = importlib.import_module(job["package_name"])
+    import_s = time.perf_counter() - start
+
+    app = package.create_app()
+    open_api = _open_api(job["package_name"], job["settings"])
+
+    start = time.perf_counter()
+    open_api.init_app(app)
+    init_app_s = time.perf_counter() - start
+
+    client = app.test_client()
+
+    start = time.perf_counter()
+    response = client.get("/v1/docs/static/swagger.json")
+    swagger_json_first_s = time.perf_counter() - start
+    swagger_json_bytes = len(response.data)
+    paths_count = len(response.json["paths"])
+
+    warm = []
+    for _ in range(_SWAGGER_JSON_WARM_REQUESTS):
+        start = time.perf_counter()
+        client.get("/v1/docs/static/swagger.json")
+        warm.append(time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as destination_dir, app.app_context():
+        start = time.perf_counter()
+        open_api.collect_static(destination_dir)
+        collect_static_s = time.perf_counter() - start
+
+    # Counted in another build, after timings, because wrapper adds overhead
+    schema2jsonschema = OpenAPIConverter.schema2jsonschema
+    conversions = 0
+
+    def counting_schema2jsonschema(*args, **kwargs):
+        nonlocal conversions
+        conversions += 1
+        return schema2jsonschema(*args, **kwargs)
+
+    OpenAPIConverter.schema2jsonschema = counting_schema2jsonschema
+    try:
+        counted_app = package.create_app()
+        _open_api(job["package_name"], job["settings"]).init_app(counted_app)
+        # Builds spec, if lazy_spec_build is set
+        counted_app.test_client().get("/v1/docs/static/swagger.json")
+    finally:
+        OpenAPIConverter.schema2jsonschema = schema2jsonschema
+
+    return {
+        "paths": paths_count,
+        "swagger_json_bytes": swagger_json_bytes,
+        "import_s": import_s,
+        "init_app_s": init_app_s,
+        "schema_conversions": conversions,
+        "swagger_json_first_s": swagger_json_first_s,
+        "swagger_json_warm_s": statistics.median(warm),
+        "collect_static_s": collect_static_s,
+    }
+
+
+def _measure_memory(job: dict) -> dict:
+    sys.path.insert(0, job["apps_dir"])
+
+    package = importlib.import_module(job["package_name"])
+    app = package.create_app()
+    open_api = _open_api(job["package_name"], job["settings"])
+    gc.collect()
+
+    # Started only now, so that only blocks allocated by spec build are traced.
+    # Blocks allocated before (ie. by imports) that spec build frees aren't traced
+    # and don't make retained memory look smaller than it is.
+    tracemalloc.start()
+
+    open_api.init_app(app)
+    _, peak = tracemalloc.get_traced_memory()
+
+    app.test_client().get("/v1/docs/static/swagger.json")
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {"init_app_peak_bytes": peak, "retained_bytes": retained}
+
+
+_MEASUREMENTS = {"timings": _measure_timings, "memory": _measure_memory}
+
+
+def _run_in_subprocess(measurement: str, job: dict) -> dict:
+    output = subprocess.run(  # noqa: S603
+        [sys.executable, __file__, "--measure", measurement, json.dumps(job)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Spec build scaling benchmarks.",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=__doc__,
+    )
+    parser.add_argument(
+        "--routes",
+        type=int,
+        nargs="+",
+        default=[100, 500, 1000],
+        help="Generated apps sizes, as number of routes",
+    )
+    parser.add_argument(
+        "--routes-per-schema",
+        type=int,
+        default=5,
+        help="Number of routes for each generated schema",
+    )
+    parser.add_argument(
+        "--settings",
+        type=json.loads,
+        default={},
+        help="JSON object with additional OpenAPISettings kwargs",
+    )
+    parser.add_argument("--output", type=Path, help="Write results to this file")
+    parser.add_argument("--measure", choices=_MEASUREMENTS, help=argparse.SUPPRESS)
+    parser.add_argument("job", nargs="?", type=json.loads, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps(_MEASUREMENTS[args.measure](args.job)))
+        return
+
+    results = []
+    with tempfile.TemporaryDirectory() as apps_dir:
+        for routes_count in args.routes:
+            schemas_count = max(1, routes_count // args.routes_per_schema)
+            job = {
+                "apps_dir": apps_dir,
+                "package_name": generate_app(
+                    apps_dir, routes_count=routes_count, schemas_count=schemas_count
+                ),
+                "settings": args.settings,
+            }
+
+            result = {"routes": routes_count, "schemas": schemas_count}
+            for measurement in _MEASUREMENTS:
+                result.update(_run_in_subprocess(measurement, job))
+            results.append(result)
+
+            print(
+                f"routes={routes_count} init_app={result['init_app_s']:.3f}s "
+                f"peak={result['init_app_peak_bytes'] / 2**20:.1f}MiB "
+                f"retained={result['retained_bytes'] / 2**20:.1f}MiB",
+                file=sys.stderr,
+            )
+
+    report = json.dumps(
+        {
+            "flask_marshmallow_openapi": __version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "settings": args.settings,
+            "results": results,
+        },
+        indent=2,
+    )
+
+    if args.output:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
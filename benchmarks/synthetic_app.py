@@ -0,0 +1,210 @@
+"""
+Generator of synthetic Flask apps documented by `flask-marshmallow-openapi`.
+
+Generated app is regular Python package written to disk, so it can be imported the same
+way real app is (decorators register schemas when app package is imported). It contains:
+
+- `schemas.py` - `schemas_count` marshmallow schemas; every schema except the first
+  one nests previous schema, every third one also has list of nested schemas
+- `views.py` - `routes_count` routes decorated by `open_api.get_list`,
+  `open_api.get_detail`, `open_api.post`, `open_api.patch` and `open_api.delete`,
+  every fifth route is `MethodView`, most of routes have YAML docstrings
+- `__init__.py` - `create_app()` factory
+
+Example:
+
+    from synthetic_app import generate_app
+
+    package_name = generate_app("/tmp/bench", routes_count=1000, schemas_count=200)
+    sys.path.insert(0, "/tmp/bench")
+    app = importlib.import_module(package_name).create_app()
+"""
+
+from __future__ import annotations
+
+import textwrap
+from pathlib import Path
+
+_SCHEMAS_HEADER = """
+import marshmallow as ma
+
+
+class SchemaOpts(ma.SchemaOpts):
+    def __init__(self, meta, *args, **kwargs):
+        self.tags = getattr(meta, "tags", [])
+        self.url_id_field = getattr(meta, "url_id_field", None)
+        super().__init__(meta, *args, **kwargs)
+"""
+
+_SCHEMA_TEMPLATE = """
+
+class Resource{i}Schema(ma.Schema):
+    OPTIONS_CLASS = SchemaOpts
+
+    class Meta:
+        tags = ["Group{group}", "Resource{i}"]
+        url_id_field = "resource{i}_id"
+
+    id = ma.fields.Integer(as_string=True)
+    name = ma.fields.String(required=True, metadata={{"description": "Name {i}"}})
+    created_at = ma.fields.DateTime()
+    size = ma.fields.Float(allow_none=True)
+    flags = ma.fields.List(ma.fields.String())
+"""
+
+_VIEWS_HEADER = """
+import flask
+import flask.views
+
+from flask_marshmallow_openapi import Securities, open_api
+
+from . import schemas
+
+api = flask.Blueprint("api", __name__)
+"""
+
+_DOCSTRING = '''
+    """
+    description: |
+        Route number {i}, served by {{{{ config.get("SERVER_NAME") or "server" }}}}.
+
+        | foo | bar | baz |
+        | --- | --- | --- |
+        | 1   | 2   | 3   |
+    summary: Route {i}
+    """
+'''
+
+_FUNCTION_VIEW_TEMPLATE = """
+
+@api.route("/resources{schema}/r{i}{path_suffix}", methods=["{method}"])
+@open_api.{decorator}
+def route_{i}(**kwargs):{docstring}
+    return flask.jsonify({{}})
+"""
+
+_METHOD_VIEW_TEMPLATE = """
+
+class Route{i}View(flask.views.MethodView):
+    @open_api.get_list(schemas.Resource{schema}Schema)
+    def get(self):{docstring}
+        return flask.jsonify([])
+
+    @open_api.post(
+        schemas.Resource{schema}Schema, security=Securities.refresh_token
+    )
+    def post(self):
+        return flask.jsonify({{}})
+
+
+api.add_url_rule(
+    "/resources{schema}/v{i}", view_func=Route{i}View.as_view("route_{i}")
+)
+"""
+
+#: Every 5th route is `MethodView`, others cycle through these decorated functions
+_METHOD_VIEW_PERIOD = 5
+#: Every 10th route also gets a DELETE route, at this offset
+_DELETE_ROUTE_PERIOD, _DELETE_ROUTE_OFFSET = 10, 3
+
+_INIT = """
+import flask
+
+from . import schemas, views
+
+
+def create_app():
+    app = flask.Flask(__name__)
+    app.register_blueprint(views.api, url_prefix="/v1")
+    return app
+"""
+
+
+def generate_app(
+    destination_dir: str | Path,
+    *,
+    routes_count: int,
+    schemas_count: int,
+    package_name: str | None = None,
+) -> str:
+    """
+    Writes synthetic app package into `destination_dir` and returns its name.
+    """
+    package_name = package_name or f"synthetic_api_{routes_count}_{schemas_count}"
+    package_dir = Path(destination_dir) / package_name
+    package_dir.mkdir(parents=True, exist_ok=True)
+
+    (package_dir / "__init__.py").write_text(_INIT)
+    (package_dir / "schemas.py").write_text(_schemas_module(schemas_count))
+    (package_dir / "views.py").write_text(_views_module(routes_count, schemas_count))
+
+    return package_name
+
+
+def _schemas_module(schemas_count: int) -> str:
+    parts = [_SCHEMAS_HEADER]
+
+    for i in range(schemas_count):
+        part = _SCHEMA_TEMPLATE.format(i=i, group=i % 10)
+        if i > 0:
+            part += f"    parent = ma.fields.Nested(Resource{i - 1}Schema)\n"
+        if i > 0 and i % 3 == 0:
+            part += (
+                "    children = ma.fields.List("
+                f"ma.fields.Nested(Resource{i - 1}Schema)"
+                ")\n"
+            )
+        parts.append(part)
+
+    return "".join(parts)
+
+
+def _views_module(routes_count: int, schemas_count: int) -> str:
+    parts = [_VIEWS_HEADER]
+
+    for i in range(routes_count):
+        schema = i % schemas_count
+        docstring = _DOCSTRING.format(i=i) if i % 4 else ""
+
+        if i % _METHOD_VIEW_PERIOD == _METHOD_VIEW_PERIOD - 1:
+            parts.append(
+                _METHOD_VIEW_TEMPLATE.format(
+                    i=i,
+                    schema=schema,
+                    docstring=textwrap.indent(docstring, "    ").rstrip(),
+                )
+            )
+            continue
+
+        method, decorator, path_suffix = [
+            ("GET", f"get_list(schemas.Resource{schema}Schema)", ""),
+            (
+                "GET",
+                f"get_detail(schemas.Resource{schema}Schema, errors={{404: 'Nope'}})",
+                "/<int:resource_id>",
+            ),
+            ("POST", f"post(schemas.Resource{schema}Schema)", ""),
+            ("PATCH", f"patch(schemas.Resource{schema}Schema)", "/<int:resource_id>"),
+        ][i % _METHOD_VIEW_PERIOD]
+
+        parts.append(
+            _FUNCTION_VIEW_TEMPLATE.format(
+                i=i,
+                schema=schema,
+                method=method,
+                decorator=decorator,
+                path_suffix=path_suffix,
+                docstring=docstring.rstrip(),
+            )
+        )
+
+        if i % _DELETE_ROUTE_PERIOD == _DELETE_ROUTE_OFFSET:
+            parts.append(f"""
+
+@api.route("/resources{schema}/r{i}/<int:resource_id>", methods=["DELETE"])
+@open_api.delete(schemas.Resource{schema}Schema)
+def route_{i}_delete(resource_id):
+    return flask.jsonify({{}})
+""")
+
+    return "".join(parts)
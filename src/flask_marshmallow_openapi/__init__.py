@@ -2,5 +2,5 @@ __version__ = "0.7.0"
 
 from . import decorators as open_api
 from .middleware import OpenAPI, OpenAPISettings
-from .schemas_registry import main_schema_cls
+from .schemas_registry import main_schema_cls, register_schema
 from .securities import Securities
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import mimetypes
+import threading
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import TYPE_CHECKING, Final, NamedTuple
+
+import flask
+import werkzeug.security
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+#: Files with these extensions get precompressed `.gz` siblings.
+COMPRESSIBLE_SUFFIXES: Final[frozenset[str]] = frozenset(
+    {".css", ".html", ".js", ".json", ".yaml"}
+)
+
+
+def is_compressible(path: str | Path) -> bool:
+    return Path(path).suffix.lower() in COMPRESSIBLE_SUFFIXES
+
+
+def gzip_bytes(data: bytes, compresslevel: int = 6) -> bytes:
+    """
+    Compresses data with gzip.
+
+    Output is reproducible: gzip header timestamp is fixed, so the same input always
+    produces the same bytes (and the same ETag, and the same file digest).
+    """
+    return gzip.compress(data, compresslevel=compresslevel, mtime=0)
+
+
+def gzip_chunks(
+    chunks: Iterable[bytes], compresslevel: int = 6
+) -> Generator[bytes, None, None]:
+    """
+    Compresses stream of chunks into gzip format, chunk by chunk.
+    """
+    # wbits 16 + MAX_WBITS gives gzip container with zero timestamp
+    compressor = zlib.compressobj(compresslevel, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk)
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def write_gzip_sibling(path: str | Path) -> Path:
+    """
+    Writes `path.gz` next to `path`, ready to be served by ie. nginx `gzip_static`.
+    """
+    path = Path(path)
+    dest = path.with_name(path.name + ".gz")
+    dest.write_bytes(gzip_bytes(path.read_bytes(), compresslevel=9))
+    return dest
+
+
+def accepts_gzip(request: flask.Request) -> bool:
+    return request.accept_encodings["gzip"] > 0
+
+
+class _GzippedFile(NamedTuple):
+    mtime_ns: int
+    size: int
+    data: bytes
+    etag: str
+
+
+class OpenAPIBlueprint(flask.Blueprint):
+    """
+    Blueprint that serves gzipped static files to clients that accept them.
+
+    Compressed file contents are kept in memory so each file is compressed only once
+    (or again after it changes on disk). At most `GZIPPED_FILES_CACHE_SIZE` most
+    recently served files are kept. Cache is shared by all threads serving the app,
+    files are compressed outside of its lock.
+    """
+
+    GZIPPED_FILES_CACHE_SIZE: Final[int] = 64
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._gzipped_files: OrderedDict[str, _GzippedFile] = OrderedDict()
+        self._gzipped_files_lock = threading.Lock()
+
+    def send_static_file(self, filename: str) -> flask.Response:
+        if not (is_compressible(filename) and accepts_gzip(flask.request)):
+            response = super().send_static_file(filename)
+            if is_compressible(filename):
+                response.vary.add("Accept-Encoding")
+            return response
+
+        file_path = werkzeug.security.safe_join(str(self.static_folder), filename)
+        if file_path is None or not Path(file_path).is_file():
+            return super().send_static_file(filename)
+
+        gzipped = self._gzipped_file(file_path)
+        response = flask.Response(
+            gzipped.data, mimetype=mimetypes.guess_type(filename)[0]
+        )
+        response.content_encoding = "gzip"
+        response.vary.add("Accept-Encoding")
+        response.set_etag(gzipped.etag)
+        # Same caching headers as flask.send_from_directory would've given
+        response.cache_control.no_cache = True
+        max_age = self.get_send_file_max_age(filename)
+        if max_age is not None:
+            if max_age > 0:
+                response.cache_control.no_cache = None
+                response.cache_control.public = True
+            response.cache_control.max_age = max_age
+
+        return response.make_conditional(flask.request)
+
+    def _gzipped_file(self, file_path: str) -> _GzippedFile:
+        path = Path(file_path)
+        stat = path.stat()
+        with self._gzipped_files_lock:
+            retv = self._gzipped_files.get(file_path)
+            if retv is not None and (retv.mtime_ns, retv.size) == (
+                stat.st_mtime_ns,
+                stat.st_size,
+            ):
+                self._gzipped_files.move_to_end(file_path)
+                return retv
+
+        data = gzip_bytes(path.read_bytes())
+        retv = _GzippedFile(
+            mtime_ns=stat.st_mtime_ns,
+            size=stat.st_size,
+            data=data,
+            etag=hashlib.sha256(data).hexdigest(),
+        )
+        with self._gzipped_files_lock:
+            self._gzipped_files[file_path] = retv
+            self._gzipped_files.move_to_end(file_path)
+            if len(self._gzipped_files) > self.GZIPPED_FILES_CACHE_SIZE:
+                self._gzipped_files.popitem(last=False)
+        return retv
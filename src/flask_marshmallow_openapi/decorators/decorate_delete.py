@@ -10,8 +10,9 @@ from openapi_pydantic_models import (
 )
 
 from ..flask_paths import FlaskPathsManager
+from ..operation_record import OperationRecord
 from ..securities import Securities
-from .helpers import _parameters_from_schema, _update_errors
+from .helpers import _parameters_from_schema, _unique_tags, _update_errors
 
 
 def delete(
@@ -25,25 +26,44 @@ def delete(
     Decorator that will inject standard sets of our OpenAPI DELETE docs into decorated
     method.
     """
+    return functools.partial(
+        FlaskPathsManager.decorate,
+        open_api_data=OperationRecord(
+            _delete_operation,
+            response_schema=resource_schema,
+            operation_id=operation_id,
+            errors=errors,
+            security=security,
+        ),
+    )
+
+
+def _delete_operation(record: OperationRecord) -> OperationObject:
     open_api_data = OperationObject()
 
-    open_api_data.operationId = operation_id or FlaskPathsManager.generate_operation_id(
-        "delete", False, resource_schema
+    open_api_data.operationId = (
+        record.operation_id
+        or FlaskPathsManager.generate_operation_id(
+            "delete", False, record.response_schema
+        )
     )
     _parameters_from_schema(
-        resource_schema, requires_id_in_path=True, open_api_data=open_api_data
+        record.response_schema, requires_id_in_path=True, open_api_data=open_api_data
     )
 
     open_api_data.responses = ResponsesObject()
 
     open_api_data.responses["204"] = {"description": "Resource was deleted"}
 
-    if security != Securities.no_token:
-        open_api_data.security = [SecurityRequirementObject({f"{security.name}": []})]
+    if record.security != Securities.no_token:
+        open_api_data.security = [
+            SecurityRequirementObject({f"{record.security.name}": []})
+        ]
 
-    open_api_data.tags = getattr(resource_schema.opts, "tags", None)
-    open_api_data.tags = list(set(open_api_data.tags or []))
+    open_api_data.tags = _unique_tags(
+        getattr(record.response_schema.opts, "tags", None)
+    )
 
-    _update_errors(open_api_data, errors)
+    _update_errors(open_api_data, record.errors)
 
-    return functools.partial(FlaskPathsManager.decorate, open_api_data=open_api_data)
+    return open_api_data
@@ -11,9 +11,10 @@ from openapi_pydantic_models import (
 )
 
 from ..flask_paths import FlaskPathsManager
+from ..operation_record import OperationRecord
 from ..schemas_registry import SchemasRegistry
 from ..securities import Securities
-from .helpers import _parameters_from_schema, _update_errors
+from .helpers import _parameters_from_schema, _unique_tags, _update_errors
 
 
 def get(
@@ -32,14 +33,35 @@ def get(
     Decorator that will inject standard sets of our OpenAPI GET docs into decorated
     method.
     """
+    return functools.partial(
+        FlaskPathsManager.decorate,
+        open_api_data=OperationRecord(
+            _get_operation,
+            response_schema=response_schema,
+            operation_id=operation_id,
+            summary=summary,
+            is_list=is_list,
+            has_id_in_path=has_id_in_path,
+            errors=errors,
+            security=security,
+            additional_content=additional_content,
+            tags_override=tags_override,
+        ),
+    )
+
+
+def _get_operation(record: OperationRecord) -> OperationObject:
     open_api_data = OperationObject()
 
-    open_api_data.operationId = operation_id or FlaskPathsManager.generate_operation_id(
-        "get", is_list, response_schema
+    open_api_data.operationId = (
+        record.operation_id
+        or FlaskPathsManager.generate_operation_id(
+            "get", record.is_list, record.response_schema
+        )
     )
     _parameters_from_schema(
-        response_schema,
-        requires_id_in_path=has_id_in_path,
+        record.response_schema,
+        requires_id_in_path=record.has_id_in_path,
         open_api_data=open_api_data,
     )
 
@@ -47,31 +69,33 @@ def get(
     open_api_data.responses["200"] = {
         "content": {
             "application/json": {
-                "schema": {"$ref": SchemasRegistry.schema_ref(response_schema)}
+                "schema": {"$ref": SchemasRegistry.schema_ref(record.response_schema)}
             }
         }
     }
 
-    if security != Securities.no_token:
-        open_api_data.security = [SecurityRequirementObject({f"{security.name}": []})]
+    if record.security != Securities.no_token:
+        open_api_data.security = [
+            SecurityRequirementObject({f"{record.security.name}": []})
+        ]
 
-    if additional_content:
-        for content_type, media in additional_content.items():
+    if record.additional_content:
+        for content_type, media in record.additional_content.items():
             if not isinstance(media, MediaTypeObject):
                 media = MediaTypeObject(**media)
             open_api_data.responses["200"].content[content_type] = media
 
-    tags = tags_override or getattr(response_schema.opts, "tags", None)
+    tags = record.tags_override or getattr(record.response_schema.opts, "tags", None)
     if tags:
         open_api_data.tags = tags
 
-    open_api_data.tags = list(set(open_api_data.tags or []))
+    open_api_data.tags = _unique_tags(open_api_data.tags)
 
-    open_api_data.summary = summary
+    open_api_data.summary = record.summary
 
-    _update_errors(open_api_data, errors)
+    _update_errors(open_api_data, record.errors)
 
-    return functools.partial(FlaskPathsManager.decorate, open_api_data=open_api_data)
+    return open_api_data
 
 
 def get_list(
@@ -12,9 +12,10 @@ from openapi_pydantic_models import (
 )
 
 from ..flask_paths import FlaskPathsManager
+from ..operation_record import OperationRecord
 from ..schemas_registry import SchemasRegistry
 from ..securities import Securities
-from .helpers import _parameters_from_schema, _update_errors
+from .helpers import _parameters_from_schema, _unique_tags, _update_errors
 
 
 def patch(
@@ -75,21 +76,41 @@ def patch(
             \"\"\"
     """
 
-    if not response_schema:
-        response_schema = request_schema
+    return functools.partial(
+        FlaskPathsManager.decorate,
+        open_api_data=OperationRecord(
+            _patch_operation,
+            request_schema=request_schema,
+            response_schema=response_schema,
+            operation_id=operation_id,
+            has_id_in_path=has_id_in_path,
+            errors=errors,
+            additional_content=additional_content,
+            security=security,
+        ),
+    )
+
+
+def _patch_operation(record: OperationRecord) -> OperationObject:
+    response_schema = record.response_schema or record.request_schema
 
     open_api_data = OperationObject()
 
-    open_api_data.operationId = operation_id or FlaskPathsManager.generate_operation_id(
-        "patch", False, response_schema
+    open_api_data.operationId = (
+        record.operation_id
+        or FlaskPathsManager.generate_operation_id("patch", False, response_schema)
     )
     # has_id = bool(getattr(response_schema.opts, "url_id_field", None))
     _parameters_from_schema(
-        response_schema, requires_id_in_path=has_id_in_path, open_api_data=open_api_data
+        response_schema,
+        requires_id_in_path=record.has_id_in_path,
+        open_api_data=open_api_data,
     )
 
-    if security != Securities.no_token:
-        open_api_data.security = [SecurityRequirementObject({f"{security.name}": []})]
+    if record.security != Securities.no_token:
+        open_api_data.security = [
+            SecurityRequirementObject({f"{record.security.name}": []})
+        ]
 
     open_api_data.responses = ResponsesObject()
     open_api_data.responses["200"] = {
@@ -104,25 +125,25 @@ def patch(
         **{
             "content": {
                 "application/json": {
-                    "schema": {"$ref": SchemasRegistry.schema_ref(request_schema)}
+                    "schema": {
+                        "$ref": SchemasRegistry.schema_ref(record.request_schema)
+                    }
                 }
             }
         }
     )
 
-    if additional_content:
-        for content_type, media in additional_content.items():
+    if record.additional_content:
+        for content_type, media in record.additional_content.items():
             if not isinstance(media, MediaTypeObject):
                 media = MediaTypeObject(**media)
             open_api_data.requestBody.content[content_type] = media
 
-    open_api_data.tags = list(
-        set(
-            getattr(request_schema.opts, "tags", [])
-            + getattr(response_schema.opts, "tags", [])
-        )
+    open_api_data.tags = _unique_tags(
+        getattr(record.request_schema.opts, "tags", None),
+        getattr(response_schema.opts, "tags", None),
     )
 
-    _update_errors(open_api_data, errors)
+    _update_errors(open_api_data, record.errors)
 
-    return functools.partial(FlaskPathsManager.decorate, open_api_data=open_api_data)
+    return open_api_data
@@ -13,9 +13,10 @@ from openapi_pydantic_models import (
 )
 
 from ..flask_paths import FlaskPathsManager
+from ..operation_record import OperationRecord
 from ..schemas_registry import SchemasRegistry
 from ..securities import Securities
-from .helpers import _parameters_from_schema, _update_errors
+from .helpers import _parameters_from_schema, _unique_tags, _update_errors
 
 
 def post(
@@ -85,21 +86,39 @@ def post(
             \"\"\"
     """
 
-    if not response_schema:
-        response_schema = request_schema
+    return functools.partial(
+        FlaskPathsManager.decorate,
+        open_api_data=OperationRecord(
+            _post_operation,
+            request_schema=request_schema,
+            response_schema=response_schema,
+            operation_id=operation_id,
+            summary=summary,
+            errors=errors,
+            headers=headers,
+            security=security,
+        ),
+    )
+
+
+def _post_operation(record: OperationRecord) -> OperationObject:
+    response_schema = record.response_schema or record.request_schema
 
     open_api_data = OperationObject()
 
-    open_api_data.operationId = operation_id or FlaskPathsManager.generate_operation_id(
-        "post", False, response_schema
+    open_api_data.operationId = (
+        record.operation_id
+        or FlaskPathsManager.generate_operation_id("post", False, response_schema)
     )
 
     _parameters_from_schema(
-        request_schema, requires_id_in_path=False, open_api_data=open_api_data
+        record.request_schema, requires_id_in_path=False, open_api_data=open_api_data
     )
 
-    if security != Securities.no_token:
-        open_api_data.security = [SecurityRequirementObject({f"{security.name}": []})]
+    if record.security != Securities.no_token:
+        open_api_data.security = [
+            SecurityRequirementObject({f"{record.security.name}": []})
+        ]
 
     open_api_data.responses = ResponsesObject()
     # TODO: This convention of having "create" in schema name makes our code smelly,
@@ -119,28 +138,28 @@ def post(
         **{
             "content": {
                 "application/json": {
-                    "schema": {"$ref": SchemasRegistry.schema_ref(request_schema)}
+                    "schema": {
+                        "$ref": SchemasRegistry.schema_ref(record.request_schema)
+                    }
                 }
             }
         }
     )
 
-    if summary:
-        open_api_data.summary = summary
+    if record.summary:
+        open_api_data.summary = record.summary
 
-    open_api_data.tags = list(
-        set(
-            getattr(request_schema.opts, "tags", [])
-            + getattr(response_schema.opts, "tags", [])
-        )
+    open_api_data.tags = _unique_tags(
+        getattr(record.request_schema.opts, "tags", None),
+        getattr(response_schema.opts, "tags", None),
     )
 
-    _update_errors(open_api_data, errors)
+    _update_errors(open_api_data, record.errors)
 
-    for header in headers or []:
+    for header in record.headers or []:
         if isinstance(header, dict):
             header = ParameterObject(**header)
         header.in_ = Locations.header
         open_api_data.parameters.append(header)
 
-    return functools.partial(FlaskPathsManager.decorate, open_api_data=open_api_data)
+    return open_api_data
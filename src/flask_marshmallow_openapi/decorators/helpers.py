@@ -10,6 +10,11 @@ from openapi_pydantic_models import (
 )
 
 
+def _unique_tags(*tags: list[str] | None) -> list[str]:
+    """Concatenates lists of tags, keeping only first occurrence of each tag."""
+    return list(dict.fromkeys(tag for _ in tags for tag in _ or []))
+
+
 def _update_errors(open_api_data: OperationObject, errors: dict[int, str] | None):
     open_api_data.responses = open_api_data.responses or ResponsesObject()
 
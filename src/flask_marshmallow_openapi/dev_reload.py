@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import ast
+import inspect
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+def source_file(obj) -> str | None:
+    """Path of Python source file in which function or class was defined."""
+    try:
+        return inspect.getsourcefile(inspect.unwrap(obj))
+    except TypeError:
+        return None
+
+
+def read_docstrings(file_path: str | Path) -> dict[str, str | None]:
+    """
+    Reads docstrings of all functions and methods from Python source file, without
+    importing it.
+
+    Returned dict is keyed by function's `__qualname__`.
+    """
+    tree = ast.parse(Path(file_path).read_bytes(), filename=str(file_path))
+
+    retv: dict[str, str | None] = {}
+    stack: list[tuple[ast.AST, str]] = [(tree, "")]
+    while stack:
+        node, prefix = stack.pop()
+        for child in ast.iter_child_nodes(node):
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                qualname = prefix + child.name
+                retv[qualname] = ast.get_docstring(child, clean=False)
+                stack.append((child, f"{qualname}.<locals>."))
+            elif isinstance(child, ast.ClassDef):
+                stack.append((child, f"{prefix}{child.name}."))
+            else:
+                stack.append((child, prefix))
+
+    return retv
+
+
+class FilesWatcher:
+    """Detects changes of files by comparing their modification times."""
+
+    def __init__(self, files: Iterable[str]):
+        self._mtimes = {_: _mtime(_) for _ in files}
+
+    def changed(self) -> list[str]:
+        """Files that changed since last call (or since watcher was created)."""
+        retv = []
+        for file_path, old_mtime in self._mtimes.items():
+            new_mtime = _mtime(file_path)
+            if new_mtime != old_mtime:
+                self._mtimes[file_path] = new_mtime
+                retv.append(file_path)
+        return retv
+
+
+def _mtime(file_path: str) -> int | None:
+    try:
+        return Path(file_path).stat().st_mtime_ns
+    except OSError:
+        return None
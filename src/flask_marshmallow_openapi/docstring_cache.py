@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+import sys
+import textwrap
+from pathlib import Path
+from typing import Any, Final
+
+import yaml
+
+from . import __version__
+
+# libyaml based loader is much faster than pure Python one
+_YAML_LOADER: Final = getattr(yaml, "CFullLoader", yaml.FullLoader)
+
+
+def parse_docstring(docstring: str) -> Any:
+    """Parses YAML from view function docstring."""
+    return yaml.load(textwrap.dedent(docstring), Loader=_YAML_LOADER)  # noqa: S506
+
+
+class DocstringCache:
+    """
+    On-disk cache of parsed view function docstrings.
+
+    Similar to `__pycache__`, parsed docstrings are stored in `marshal` format, keyed
+    by hash of dedented docstring, version of this library and of Python itself.
+    This way, only changed docstrings need to be parsed again when app restarts.
+
+    All entries are kept in single file that is rewritten (atomically) only if
+    there were any cache misses. Rewritten file contains only entries that were used
+    since cache was loaded, so docstrings that no longer exist don't accumulate in it.
+
+    Any problems with reading or writing cache file are ignored - cache just stops
+    being useful but docs are still generated.
+    """
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = Path(file_path)
+        self._stored: dict[str, Any] | None = None
+        self._used: dict[str, Any] = {}
+        self._is_dirty = False
+
+    def parse(self, docstring: str) -> Any:
+        """Returns parsed docstring, from cache if possible."""
+        try:
+            return self.get(docstring)
+        except KeyError:
+            pass
+
+        data = parse_docstring(docstring)
+        self.set(docstring, data)
+        return data
+
+    def __contains__(self, docstring: str) -> bool:
+        return self._key(docstring) in self._load()
+
+    def get(self, docstring: str) -> Any:
+        """Returns cached parsed docstring or raises KeyError."""
+        key = self._key(docstring)
+        data = self._load()[key]
+        self._used[key] = data
+        return data
+
+    def set(self, docstring: str, data: Any):
+        self._used[self._key(docstring)] = data
+        self._is_dirty = True
+
+    def save(self):
+        if not self._is_dirty:
+            return
+
+        try:
+            data = marshal.dumps(self._used)
+        except ValueError:
+            # Something in parsed YAML can't be marshaled, ie. datetime.date.
+            # Drop such entries and keep the rest.
+            data = marshal.dumps(
+                {k: v for k, v in self._used.items() if _is_marshalable(v)}
+            )
+
+        tmp_path = self.file_path.with_name(f"{self.file_path.name}.{os.getpid()}.tmp")
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            tmp_path.replace(self.file_path)
+        except OSError:
+            return
+
+        self._is_dirty = False
+
+    def _load(self) -> dict[str, Any]:
+        if self._stored is None:
+            try:
+                # Our own cache file, same trust level as __pycache__
+                self._stored = marshal.loads(  # noqa: S302
+                    self.file_path.read_bytes()
+                )
+            except (OSError, EOFError, ValueError, TypeError):
+                self._stored = {}
+            if not isinstance(self._stored, dict):
+                self._stored = {}
+        return self._stored
+
+    @classmethod
+    def _key(cls, docstring: str) -> str:
+        hash_obj = hashlib.sha256()
+        for _ in (
+            __version__,
+            f"{sys.version_info.major}.{sys.version_info.minor}",
+            str(marshal.version),
+            textwrap.dedent(docstring),
+        ):
+            hash_obj.update(_.encode("utf-8"))
+            hash_obj.update(b"\0")
+        return hash_obj.hexdigest()
+
+
+def _is_marshalable(value) -> bool:
+    try:
+        marshal.dumps(value)
+    except ValueError:
+        return False
+    return True
@@ -1,24 +1,39 @@
+import contextlib
+import contextvars
+import itertools
 import re
-import textwrap
-from collections.abc import Generator
-from typing import Any, Callable, Final, Type
+import types
+import typing
+from collections.abc import Generator, Iterable, MutableMapping
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Callable, ClassVar, Final, Type
 
 import flask
 import inflection
+import jinja2
 import marshmallow as ma
+import pydantic
 import werkzeug
 import werkzeug.routing
 import wrapt
-import yaml
-from openapi_pydantic_models import OperationObject, PathItemObject
+from jinja2.lexer import newline_re
+from openapi_pydantic_models import OperationObject, PathItemObject, ReferenceObject
 
+from .docstring_cache import DocstringCache, parse_docstring
+from .operation_record import OperationRecord
 from .schemas_registry import SchemasRegistry
 
 
 class FlaskPathsManager:
-    _ENCOUNTERED_OPERATION_IDS: Final[set[str]] = set()
     _PATH_TEMPLATE_CONVERTER: Final[re.Pattern] = re.compile(r"<([a-z]*:)?([a-z_]*)>")
     ATTRIBUTE_NAME: Final[str] = "_open_api"
+    _DOCSTRINGS_CHUNKSIZE: Final[int] = 32
+
+    #: If True, decorated view functions are wrapped into `wrapt` proxy that forwards
+    #: calls to original function (legacy behavior). By default, docs are only attached
+    #: to view function which is then returned as is, so decorators don't add any
+    #: per-request overhead.
+    WRAP_VIEW_FUNCTIONS: ClassVar[bool] = False
 
     @classmethod
     def generate_operation_id(
@@ -48,6 +63,13 @@ class FlaskPathsManager:
     @classmethod
     def decorate(cls, wrapped, open_api_data):
         setattr(wrapped, cls.ATTRIBUTE_NAME, open_api_data)
+        if isinstance(open_api_data, OperationRecord):
+            SchemasRegistry.register_used(
+                wrapped, open_api_data.request_schema, open_api_data.response_schema
+            )
+
+        if not cls.WRAP_VIEW_FUNCTIONS:
+            return wrapped
 
         @wrapt.decorator
         def wrapper(wrapped, instance, args, kwargs):
@@ -55,113 +77,465 @@ class FlaskPathsManager:
 
         return wrapper(wrapped)
 
-    def __init__(
+    @classmethod
+    def operation_docs(cls, view_func) -> OperationObject | None:
+        """
+        Docs attached to view function by `open_api` decorators, if any. Decorators
+        attach only `OperationRecord` from which new `OperationObject` is built on
+        each call.
+        """
+        data = getattr(view_func, cls.ATTRIBUTE_NAME, None)
+        if isinstance(data, OperationRecord):
+            return data.to_operation()
+        return data
+
+    def __init__(  # noqa: PLR0913, keyword-only options
         self,
         app: flask.Flask,
         is_excluded_cb: Callable[[str, str], bool] | None = None,
         overrides: dict[tuple[str, str], OperationObject] | None = None,
+        *,
+        excluded_blueprints: Iterable[str] | None = None,
+        docstring_cache: DocstringCache | None = None,
+        validate_docstrings: bool = False,
     ) -> None:
         self.app = app
         self.is_excluded_cb = is_excluded_cb
-        self.overrides: dict[tuple[str, str], OperationObject] = overrides or {}
+        # Not copied, so overrides added later are used by incremental rebuilds
+        self.overrides: dict[tuple[str, str], OperationObject] = (
+            overrides if overrides is not None else {}
+        )
+        self._excluded_endpoint_prefixes = tuple(
+            f"{_}." for _ in excluded_blueprints or []
+        )
+        self.docstring_cache = docstring_cache
+        self.validate_docstrings = validate_docstrings
+        self._parsed_docstrings: dict[str, Any] = {}
+        # Current docstrings of view functions whose sources changed since they were
+        # imported, used instead of their `__doc__` (see `rebuild_views_docs`)
+        self._view_docstrings: dict[Callable, str | None] = {}
+        # Descriptions rendered so far, by their source text. Not None only while
+        # docs are being built (see `_descriptions_rendering`)
+        self._rendered_descriptions: dict[str, str] | None = None
+        self._encountered_operation_ids: set[str] = set()
+        # For each operationId prefix, how many of encountered IDs match `prefix[_0-9]*`
+        self._operation_id_counters: dict[str, int] = {}
+        # For each (rule, method), operationId before and after it was de-duplicated
+        self._operation_ids: dict[tuple[str, str], tuple[str, str]] = {}
+        # Routes index, updated by `_index_routes()`, and number of app's routes
+        # already added to it
+        self._rules: list[werkzeug.routing.Rule] = []
+        self._indexed_rules_count = 0
+        # (method, view function) of indexed rules, by `_rule_key()`; rules aren't
+        # hashable
+        self._rule_methods: dict[
+            tuple[str, frozenset[str]], list[tuple[str, Callable]]
+        ] = {}
+        self._view_rules: dict[Callable, list[werkzeug.routing.Rule]] = {}
+        self._documented_views: set[Callable] = set()
 
     def collect_endpoints_docs(
+        self, executor: Executor | None = None
+    ) -> Generator[tuple[str, dict[str, Any]], None, None]:
+        """
+        Generates docs for each of app's routes, as OpenAPI PathItem dicts.
+
+        If `executor` is given, work is distributed across its workers:
+
+        - `ThreadPoolExecutor` - operations for each route are built concurrently
+        - `ProcessPoolExecutor` - YAML docstrings are parsed in worker processes
+
+        Either way, output is the same as the one of serial build: results are
+        merged in `app.url_map` order and operation IDs are de-duplicated in that same
+        order.
+        """
+        rules = self.rules()
+
+        with self._descriptions_rendering():
+            if isinstance(executor, ProcessPoolExecutor):
+                self._parse_docstrings(rules, executor)
+                results = list(map(self._operations_for_rule, rules))
+            elif executor:
+                # Worker threads don't see request context pushed in this one
+                context = contextvars.copy_context()
+                results = list(
+                    executor.map(
+                        lambda rule: context.copy().run(
+                            self._operations_for_rule, rule
+                        ),
+                        rules,
+                    )
+                )
+            else:
+                results = list(map(self._operations_for_rule, rules))
+
+        for rule, result in zip(rules, results, strict=True):
+            if result:
+                path_item, methods = result
+                for method in methods:
+                    self._keep_operation_id(rule, method, path_item[method])
+                yield (
+                    self._flask_path_template_to_open_api_path_template(rule.rule),
+                    path_item,
+                )
+
+        if self.docstring_cache:
+            self.docstring_cache.save()
+
+    def rebuild_views_docs(
         self,
-    ) -> Generator[tuple[str, PathItemObject], None, None]:
-        for rule in self.app.url_map.iter_rules():
-            operations = self._operations_for_rule(rule)
-            if operations:
+        view_funcs: Iterable[Callable],
+        docstrings: dict[Callable, str | None] | None = None,
+    ) -> Generator[tuple[str, dict[str, Any]], None, None]:
+        """
+        Generates docs again, only for routes handled by given view functions.
+
+        `docstrings` are current docstrings of view functions (ie. read from their
+        changed source files), they are used instead of `__doc__` of these functions
+        from now on.
+
+        Operations keep IDs they got when they were built before, unless their
+        operationId changed (ie. in docstring). Changed IDs are de-duplicated again.
+        """
+        self._view_docstrings.update(docstrings or {})
+
+        rules: list[werkzeug.routing.Rule] = []
+        for view_func in view_funcs:
+            for rule in self.rules_for(view_func):
+                # Rules aren't hashable
+                if not any(_ is rule for _ in rules):
+                    rules.append(rule)
+
+        with self._descriptions_rendering():
+            results = [(rule, self._operations_for_rule(rule)) for rule in rules]
+
+        for rule, result in results:
+            if result:
+                path_item, methods = result
+                for method in methods:
+                    operation = path_item[method]
+                    kept = self._operation_ids.get((rule.rule, method))
+                    if kept and kept[0] == operation["operationId"]:
+                        operation["operationId"] = kept[1]
+                    else:
+                        self._keep_operation_id(rule, method, operation)
                 yield (
                     self._flask_path_template_to_open_api_path_template(rule.rule),
-                    operations,
+                    path_item,
                 )
 
-    def _operations_for_rule(
+        if self.docstring_cache:
+            self.docstring_cache.save()
+
+    def rules(self) -> list[werkzeug.routing.Rule]:
+        """App's routes that are documented, in `app.url_map` order."""
+        self._index_routes()
+        return list(self._rules)
+
+    def view_functions(
         self, rule: werkzeug.routing.Rule
-    ) -> PathItemObject | None:
-        docs_for_methods = [
-            _.lower() for _ in (rule.methods or []) if _ not in {"HEAD", "OPTIONS"}
-        ]
-        view = self.app.view_functions[rule.endpoint]
-        retv = PathItemObject()
-        any_found = False
+    ) -> Generator[Callable, None, None]:
+        """Functions handling documented methods of given rule."""
+        for _, view_func in self._methods(rule):
+            yield view_func
+
+    def rules_for(self, view_func: Callable) -> list[werkzeug.routing.Rule]:
+        """Documented routes handled by given view function, in `app.url_map` order."""
+        self._index_routes()
+        return list(self._view_rules.get(view_func, []))
+
+    def _index_routes(self):
+        """
+        Adds routes registered since previous call to index: resolves view functions
+        of documented routes and notes which of them have docs attached by `open_api`
+        decorators. Docs for routes handled by other functions are then generated
+        without looking for decorators docs at all.
+
+        Each route is resolved only once, routes added after spec had been built only
+        extend index. Flask only ever appends routes to `app.url_map`, so new ones
+        are those after already indexed ones.
+        """
+        new_rules = list(
+            itertools.islice(
+                self.app.url_map.iter_rules(), self._indexed_rules_count, None
+            )
+        )
+        self._indexed_rules_count += len(new_rules)
+
+        for rule in new_rules:
+            if self._excluded_endpoint_prefixes and rule.endpoint.startswith(
+                self._excluded_endpoint_prefixes
+            ):
+                continue
 
-        for method in docs_for_methods:
-            view_func = self._view_func(view, method)
-            method_attr = method.lower() if method.lower() != "delete" else "delete_"
+            self._rules.append(rule)
+            methods = self._resolve_methods(rule)
+            self._rule_methods[self._rule_key(rule)] = methods
+            for _, view_func in methods:
+                view_rules = self._view_rules.setdefault(view_func, [])
+                if not view_rules or view_rules[-1] is not rule:
+                    view_rules.append(rule)
+                if hasattr(view_func, self.ATTRIBUTE_NAME):
+                    self._documented_views.add(view_func)
+
+    def _methods(self, rule: werkzeug.routing.Rule) -> list[tuple[str, Callable]]:
+        methods = self._rule_methods.get(self._rule_key(rule))
+        if methods is None:
+            # Not a rule from index
+            methods = self._resolve_methods(rule)
+        return methods
+
+    @staticmethod
+    def _rule_key(rule: werkzeug.routing.Rule) -> tuple[str, frozenset[str]]:
+        """Everything `_resolve_methods()` depends on."""
+        return rule.endpoint, frozenset(rule.methods or ())
+
+    def _resolve_methods(
+        self, rule: werkzeug.routing.Rule
+    ) -> list[tuple[str, Callable]]:
+        view = self.app.view_functions[rule.endpoint]
+        # rule.methods is a set, sort it so that operation IDs are always registered
+        # in the same order
+        return [
+            (method.lower(), self._view_func(view, method))
+            for method in sorted(rule.methods or [])
+            if method not in {"HEAD", "OPTIONS"}
+        ]
 
-            operation: OperationObject = getattr(
-                view_func, self.ATTRIBUTE_NAME, OperationObject()
+    def _operations_for_rule(
+        self, rule: werkzeug.routing.Rule
+    ) -> tuple[dict[str, Any], list[str]] | None:
+        """
+        Builds docs for all methods of given rule.
+
+        Returns built PathItem dict and list of its methods whose operationId still
+        needs to be registered (and possibly de-duplicated).
+
+        Docs are merged as plain dicts. Data from docstrings is validated as
+        `OperationObject` only if `validate_docstrings` is set. Otherwise it is
+        emitted as is, except for whitespace stripping and removal of blank values
+        that `PathItemObject.model_dump()` does.
+        """
+        retv: dict[str, Any] = {}
+        any_found = False
+        to_register: list[str] = []
+        # Whitespace stripping and blank values removal is needed only if some
+        # operation has any docs
+        needs_cleanup = False
+
+        for method, view_func in self._methods(rule):
+            operation = (
+                self.operation_docs(view_func)
+                if view_func in self._documented_views
+                else None
             )
 
-            if operation.operationId == "hidden":
+            if operation is not None and operation.operationId == "hidden":
                 # Support for legacy, deprecated behavior
                 continue
 
             # Check for override first, and only then is_excluded_cb
             # If override exists, we don't want to skip docs
 
-            override = self.overrides.get(
-                (rule.rule, method.lower()), None
-            ) or self.overrides.get((rule.endpoint, method.lower()), None)
-            if override:
-                setattr(retv, method_attr, override)
-                any_found = True
-                continue
+            if self.overrides:
+                override = self.overrides.get(
+                    (rule.rule, method), None
+                ) or self.overrides.get((rule.endpoint, method), None)
+                if override:
+                    retv[method] = override
+                    any_found = needs_cleanup = True
+                    continue
 
             if self.is_excluded_cb and self.is_excluded_cb(rule.rule, method):
-                setattr(retv, method_attr, None)
                 continue
 
-            if not operation.operationId:
-                operation.operationId = f"{method}_{rule.endpoint}"
+            docstring_data = self._docstring_data(view_func, method)
+            if operation is None and docstring_data is None:
+                # Undocumented view, there is nothing to merge or clean up
+                retv[method] = {"operationId": f"{method}_{rule.endpoint}".strip()}
+                to_register.append(method)
+                any_found = True
+                continue
 
-            docstring_data = self._docstring_data(view, method)
-            if docstring_data:
-                operation_data = operation.model_dump()
-                operation_data.update(docstring_data)
-                operation = OperationObject.model_validate(operation_data)
+            needs_cleanup = True
+            retv[method] = self._merged_operation(
+                operation, docstring_data, f"{method}_{rule.endpoint}"
+            )
+            to_register.append(method)
+            any_found = True
 
-            self._register_operation_id(operation)
+        if not any_found:
+            return None
 
-            setattr(retv, method_attr, operation)
-            any_found = True
+        if needs_cleanup:
+            retv = _path_item_dict(retv)
+        return retv, [_ for _ in to_register if _ in retv]
 
-        return retv if any_found else None
+    def _merged_operation(
+        self,
+        operation: OperationObject | None,
+        docstring_data: dict[str, Any] | None,
+        default_operation_id: str,
+    ) -> OperationObject | dict[str, Any]:
+        """
+        Docs from `open_api` decorators updated by data from docstring. Merged data is
+        validated only if `validate_docstrings` is set, otherwise it is returned as
+        plain dict with keys in the same order validated `OperationObject` would dump
+        them, so that spec is the same in both cases.
+        """
+        if not docstring_data:
+            if not operation.operationId:
+                operation = operation.model_copy(
+                    update={"operationId": default_operation_id}
+                )
+            return operation
+
+        operation_data = operation.model_dump() if operation is not None else {}
+        if not operation_data.get("operationId"):
+            operation_data["operationId"] = default_operation_id
+        operation_data.update(docstring_data)
+        if self.validate_docstrings:
+            return OperationObject.model_validate(operation_data)
+        return _in_fields_order(operation_data, OperationObject)
+
+    def _parse_docstrings(self, rules: list[werkzeug.routing.Rule], executor: Executor):
+        docstrings = dict.fromkeys(
+            self._docstring(view_func)
+            for rule in rules
+            for view_func in self.view_functions(rule)
+        )
 
-    def _docstring_data(self, view, method: str) -> dict[str, Any] | None:
-        f = self._view_func(view, method)
+        to_parse = []
+        for docstring in docstrings:
+            if self.docstring_cache and docstring in self.docstring_cache:
+                self._parsed_docstrings[docstring] = self.docstring_cache.get(docstring)
+            else:
+                to_parse.append(docstring)
+
+        for docstring, data in zip(
+            to_parse,
+            executor.map(
+                parse_docstring, to_parse, chunksize=self._DOCSTRINGS_CHUNKSIZE
+            ),
+            strict=True,
+        ):
+            self._parsed_docstrings[docstring] = data
+            if self.docstring_cache:
+                self.docstring_cache.set(docstring, data)
+
+    def _parse_docstring(self, docstring: str) -> Any:
+        if docstring not in self._parsed_docstrings:
+            self._parsed_docstrings[docstring] = (
+                self.docstring_cache.parse(docstring)
+                if self.docstring_cache
+                else parse_docstring(docstring)
+            )
+        return self._parsed_docstrings[docstring]
+
+    def _docstring(self, view_func: Callable) -> str:
+        return self._view_docstrings.get(view_func, view_func.__doc__) or ""
 
-        data = yaml.full_load(textwrap.dedent(f.__doc__ or "")) or {}
+    def _docstring_data(self, view_func, method: str) -> dict[str, Any] | None:
+        data = self._parse_docstring(self._docstring(view_func)) or {}
+        if isinstance(data, dict):
+            # Parsed data is shared between all views with the same docstring and
+            # we're about to modify it
+            data = dict(data)
 
         if isinstance(data, str):
             data = {"description": data}
 
         if data and "description" in data:
-            with self.app.test_request_context():
-                data["description"] = flask.render_template_string(data["description"])
+            data["description"] = self._render_description(data["description"])
 
         if method.lower() in data:
             data = data[method.lower()]
 
         return data or None
 
-    def _register_operation_id(self, operation: OperationObject):
-        if operation.operationId in self.__class__._ENCOUNTERED_OPERATION_IDS:
-            operation.operationId = (
-                operation.operationId
-                + "_"
-                + str(
-                    len(
-                        [
-                            _
-                            for _ in self.__class__._ENCOUNTERED_OPERATION_IDS
-                            if re.match(operation.operationId + r"[_0-9]*$", _)
-                        ]
-                    )
-                )
-            )
-        self.__class__._ENCOUNTERED_OPERATION_IDS.add(operation.operationId)
+    @contextlib.contextmanager
+    def _descriptions_rendering(self):
+        """
+        Single request context in which all descriptions of one build are rendered.
+        Each distinct description is rendered only once.
+        """
+        self._rendered_descriptions = {}
+        try:
+            with self.app.test_request_context():
+                yield
+        finally:
+            self._rendered_descriptions = None
+
+    def _render_description(self, description: str) -> str:
+        """
+        Renders description as Jinja template. Descriptions without any Jinja syntax
+        aren't rendered, only environment's newline settings are applied to them.
+        """
+        rendered_descriptions = self._rendered_descriptions
+        if rendered_descriptions is None:
+            with self._descriptions_rendering():
+                return self._render_description(description)
+
+        if not isinstance(description, str):
+            return flask.render_template_string(description)
+
+        if description not in rendered_descriptions:
+            env = self.app.jinja_env
+            if _has_jinja_syntax(env, description):
+                rendered = flask.render_template_string(description)
+            else:
+                rendered = newline_re.sub(env.newline_sequence, description)
+                if not env.keep_trailing_newline:
+                    rendered = rendered.removesuffix(env.newline_sequence)
+            rendered_descriptions[description] = rendered
+
+        return rendered_descriptions[description]
+
+    def _keep_operation_id(
+        self, rule: werkzeug.routing.Rule, method: str, operation: dict[str, Any]
+    ):
+        """Registers operation's ID and remembers it for `rebuild_views_docs`."""
+        replaced = self._operation_ids.get((rule.rule, method))
+        if replaced:
+            self._unregister_operation_id(replaced[1])
+
+        operation_id = operation["operationId"]
+        self._register_operation_id(operation)
+        self._operation_ids[(rule.rule, method)] = (
+            operation_id,
+            operation["operationId"],
+        )
+
+    def _register_operation_id(self, operation: dict[str, Any]):
+        """
+        Makes operation["operationId"] unique among all operations of this app seen so
+        far.
+
+        Duplicate ID `foo` gets suffix `_N` where `N` is number of already encountered
+        IDs matching `foo[_0-9]*` (ie. `foo`, `foo_1`, ...). Instead of scanning all
+        encountered IDs, counters for all such prefixes are updated whenever new ID is
+        registered, so this is O(1) for each operation.
+        """
+        encountered = self._encountered_operation_ids
+        counters = self._operation_id_counters
+
+        if operation["operationId"] in encountered:
+            base = operation["operationId"]
+            suffix = counters.get(base, 0)
+            while f"{base}_{suffix}" in encountered:
+                suffix += 1
+            operation["operationId"] = f"{base}_{suffix}"
+
+        encountered.add(operation["operationId"])
+        for prefix in _operation_id_prefixes(operation["operationId"]):
+            counters[prefix] = counters.get(prefix, 0) + 1
+
+    def _unregister_operation_id(self, operation_id: str):
+        """Makes operation ID available again, ie. for operation that replaced it."""
+        if operation_id in self._encountered_operation_ids:
+            self._encountered_operation_ids.remove(operation_id)
+            for prefix in _operation_id_prefixes(operation_id):
+                self._operation_id_counters[prefix] -= 1
 
     def _view_func(self, view, method):
         if hasattr(view, "view_class"):
@@ -173,3 +547,118 @@ class FlaskPathsManager:
     @classmethod
     def _flask_path_template_to_open_api_path_template(cls, path: str):
         return cls._PATH_TEMPLATE_CONVERTER.sub(r"{\2}", path)
+
+
+def _path_item_dict(
+    operations: dict[str, OperationObject | dict[str, Any]],
+) -> dict[str, Any]:
+    """
+    Dumps operations by `PathItemObject.model_dump()`, which strips whitespace and
+    removes blank values, without validating operations that are plain dicts.
+    """
+    # Serializer would warn about operations that are plain dicts
+    return PathItemObject.model_construct(**operations).model_dump(warnings=False)
+
+
+def _in_fields_order(
+    data: dict[str, Any], model: type[pydantic.BaseModel]
+) -> dict[str, Any]:
+    """
+    Copy of `data` with keys ordered as `model.model_validate(data).model_dump()`
+    would order them: model fields first, then mapping items and then extensions.
+    """
+    fields = {
+        field.alias or name: field.annotation
+        for name, field in model.model_fields.items()
+    }
+    retv = {
+        key: _value_in_fields_order(data[key], fields[key])
+        for key in fields
+        if key in data
+    }
+
+    items_annotation = _mapping_items_annotation(model)
+    for key, value in data.items():
+        if key not in retv and not key.startswith("x-"):
+            retv[key] = _value_in_fields_order(value, items_annotation)
+    for key, value in data.items():
+        if key not in retv:
+            retv[key] = value
+
+    return retv
+
+
+def _value_in_fields_order(value: Any, annotation: Any) -> Any:
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        annotation = _union_member(value, typing.get_args(annotation))
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+
+    if origin is list and args and isinstance(value, list):
+        return [_value_in_fields_order(_, args[0]) for _ in value]
+
+    if origin is dict and args and isinstance(value, dict):
+        return {k: _value_in_fields_order(v, args[-1]) for k, v in value.items()}
+
+    if (
+        isinstance(annotation, type)
+        and issubclass(annotation, pydantic.BaseModel)
+        and isinstance(value, dict)
+    ):
+        return _in_fields_order(value, annotation)
+
+    return value
+
+
+def _union_member(value: Any, members: tuple[Any, ...]) -> Any:
+    """
+    Member of union that `value` would be validated as. Approximates pydantic smart
+    union mode well enough for OpenAPI models, where only `ReferenceObject` competes
+    with other models.
+    """
+    models = [
+        _ for _ in members if isinstance(_, type) and issubclass(_, pydantic.BaseModel)
+    ]
+    if isinstance(value, dict) and models:
+        if "$ref" in value and ReferenceObject in models:
+            return ReferenceObject
+        return next((_ for _ in models if _ is not ReferenceObject), models[0])
+
+    others = [_ for _ in members if _ is not type(None)]
+    return others[0] if len(others) == 1 else Any
+
+
+def _mapping_items_annotation(model: type[pydantic.BaseModel]) -> Any:
+    """
+    Type of items of models that are also mappings, ie. `ResponsesObject`
+    """
+    for base in getattr(model, "__orig_bases__", ()):
+        if typing.get_origin(base) is MutableMapping:
+            return typing.get_args(base)[1]
+    return None
+
+
+def _has_jinja_syntax(env: jinja2.Environment, text: str) -> bool:
+    if env.line_statement_prefix or env.line_comment_prefix:
+        return True
+    return any(
+        _ in text
+        for _ in (
+            env.block_start_string,
+            env.variable_start_string,
+            env.comment_start_string,
+        )
+    )
+
+
+def _operation_id_prefixes(operation_id: str) -> Generator[str, None, None]:
+    """
+    Yields all prefixes of `operation_id` that are followed only by `[_0-9]*`.
+
+    Example: "foo_1_2" -> "foo_1_2", "foo_1_", "foo_1", "foo_", "foo"
+    """
+    end = len(operation_id)
+    yield operation_id
+    while end and operation_id[end - 1] in "_0123456789":
+        end -= 1
+        yield operation_id[:end]
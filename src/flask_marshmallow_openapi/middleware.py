@@ -1,25 +1,39 @@
 from __future__ import annotations
 
+import contextlib
+import gc
+import inspect
 import json
+import marshal
 import os
+import sys
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from copy import deepcopy
 from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Literal
 
 import apispec
 import flask
 import requests
-from apispec.exceptions import DuplicateComponentNameError
 from apispec.ext.marshmallow import MarshmallowPlugin
 
+from .compression import OpenAPIBlueprint, accepts_gzip, gzip_chunks
+from .dev_reload import FilesWatcher, read_docstrings, source_file
+from .docstring_cache import DocstringCache
 from .flask_paths import FlaskPathsManager
 from .schemas_registry import SchemasRegistry
-from .static_collector import StaticResourcesCollector
+from .spec_cache import SpecCache
+from .spec_snapshot import SpecFingerprint, SpecSnapshot
+from .spec_writer import dump_yaml, iter_json, json_backend
+from .static_collector import StaticResourcesCollector, asset_url_builder
 
 if TYPE_CHECKING:
     from collections.abc import Callable
-    from pathlib import Path
+    from concurrent.futures import Executor
 
+    import marshmallow as ma
     from openapi_pydantic_models import OperationObject
 
 _MINIMAL_SPEC = {"title": "Some API", "openapi_version": "3.0.2", "version": "v1"}
@@ -48,7 +62,9 @@ class OpenAPISettings:
     #: Version string displayed in various places in of API docs
     api_version: str
 
-    #: Top level python package in which to search for marshmallow.Schema classes
+    #: Top level python package of app. Spec documents marshmallow.Schema classes
+    #: used by `open_api` decorators in its modules and classes registered by
+    #: `register_schema` from its modules.
     app_package_name: str
 
     #: Where to mount OpenAPI blueprint? Giving ie. "/v1" will create following docs
@@ -117,6 +133,98 @@ class OpenAPISettings:
     #     )
     is_excluded_cb: Callable[[str, str], bool] | None = None
 
+    #: If True, all marshmallow.Schema classes defined in `app_package_name` or
+    #: imported into its modules are documented, not only registered ones. App
+    #: package is scanned for them once per process. Fallback for apps that don't
+    #: register schemas that decorators don't use.
+    discover_schemas: bool = False
+
+    #: If True, `init_app()` only registers docs routes and OpenAPI spec is built on
+    #: first access to it (first `GET swagger.json`, `collect_static()`, ...) instead
+    #: of during `init_app()`. This keeps spec building out of app startup, which
+    #: helps when app runs in many worker processes and most of them never serve docs.
+    lazy_spec_build: bool = False
+
+    #: Number of workers used for building docs of app's routes. If 0, routes are
+    #: processed serially. Built spec is the same, regardless of this setting.
+    spec_build_workers: int = 0
+
+    #: What kind of workers to use when `spec_build_workers > 0`:
+    #:
+    #: - "thread" - docs for each route (docstring parsing, description rendering and
+    #:   validation) are built in a thread pool
+    #: - "process" - YAML docstrings are parsed in a process pool; this sidesteps GIL
+    #:   but has to send docstrings to worker processes and parsed data back
+    spec_build_executor: Literal["thread", "process"] = "thread"
+
+    #: If True, data from view docstrings is validated as OpenAPI `OperationObject`
+    #: before being merged into spec and invalid docstrings fail spec build. If False,
+    #: docstring data is merged into spec as is, which makes spec build considerably
+    #: faster. If None, docstrings are validated only when app runs in debug or
+    #: testing mode.
+    validate_docstrings: bool | None = None
+
+    #: Directory for caching parsed YAML docstrings of view functions (similar to
+    #: `__pycache__`). If set, docstrings are parsed only when they change and app
+    #: restarts mostly skip YAML parsing. If None, docstrings are parsed on every
+    #: spec build.
+    docstring_cache_dir: str | Path | None = None
+
+    #: Directory for snapshot of built spec. If set, built spec is stored there
+    #: together with fingerprint of everything it was built from (schema classes,
+    #: routes, view docstrings, decorators data, docs overrides, swagger.json
+    #: template, app config values used by docstrings). Processes booting with the
+    #: same fingerprint (ie. gunicorn workers) load spec from snapshot instead of
+    #: building it. Ignored when `incremental_rebuild` is enabled.
+    spec_snapshot_dir: str | Path | None = None
+
+    #: If True, data used only while building spec is released once spec is built:
+    #: apispec objects, parsed docstrings and operation IDs registry are dropped and
+    #: built spec is kept in `marshal` format until some document needs to be
+    #: serialized, when it is unpacked once. Spec can still be built again (ie. when
+    #: docs override is added). Ignored when `incremental_rebuild` is enabled.
+    release_build_data: bool = False
+
+    #: Development helper. If True, `GET swagger.json` and `GET swagger.yaml` first
+    #: check if source files of documented view functions and of schemas changed and
+    #: update only affected parts of already built spec:
+    #:
+    #: - docstrings of view functions are read again from changed files (without
+    #:   reimporting them) and docs of their routes are rebuilt
+    #: - changed modules containing only schemas (no view functions) are reloaded and
+    #:   their components are replaced
+    #:
+    #: Other changes (ie. arguments of `open_api` decorators, new routes) still need
+    #: app restart. Don't use in production.
+    incremental_rebuild: bool = False
+
+    #: If True, in addition to swagger.json, spec is also served split into one
+    #: document for each tag (`docs/static/swagger/<tag>.json`, listed in
+    #: `docs/static/swagger/index.json`). Each of these contains only operations with
+    #: that tag and components they use. SwaggerUI then loads only selected shard
+    #: instead of whole spec, which is much faster for big APIs. `collect_static()`
+    #: writes shards to disk too.
+    shard_spec_by_tag: bool = False
+
+    #: Development helper. If True, `GET swagger.json` serializes spec on each request
+    #: and sends it in chunks, as it is being serialized (and compressed), instead of
+    #: keeping whole serialized document in memory. Peak memory use stays flat even
+    #: for very big specs, but responses don't have ETag.
+    stream_spec_json: bool = False
+
+    #: Which library serializes spec into JSON, both in `swagger.json` route and in
+    #: `collect_static()`:
+    #:
+    #: - "stdlib" - Python's json module, with its default options
+    #: - "orjson" - orjson, from `flask-marshmallow-openapi[orjson]` extra. Falls back
+    #:   to "stdlib", with warning, when it is not installed.
+    #:
+    #: orjson is much faster, but doesn't produce the same bytes: it writes UTF-8
+    #: instead of `\uXXXX` escapes, compact JSON without spaces and ie. floats in
+    #: exponent notation differently. Switching it changes names of cache busted spec
+    #: files. YAML is always serialized by libyaml when available.
+    spec_json_backend: Literal["stdlib", "orjson"] = "stdlib"
+
 
 class OpenAPI:
     """
@@ -146,11 +254,41 @@ class OpenAPI:
     +--------------------------+--------+------------------------------------------------+
     | open_api.static          | GET    | /{self.mounted_at}/docs/static/<path:filename> |
     +--------------------------+--------+------------------------------------------------+
+
+    and, if `OpenAPISettings.shard_spec_by_tag` is set:
+
+    +------------------------------+--------+------------------------------------------+
+    |           endpoint           | method |                   path                   |
+    +==============================+========+==========================================+
+    | open_api.swagger_json_shards | GET    | /{self.mounted_at}/docs/static/swagger/  |
+    |                              |        | index.json                               |
+    +------------------------------+--------+------------------------------------------+
+    | open_api.swagger_json_shard  | GET    | /{self.mounted_at}/docs/static/swagger/  |
+    |                              |        | <shard>.json                             |
+    +------------------------------+--------+------------------------------------------+
     """
 
     def __init__(self, config: OpenAPISettings, app: flask.Flask | None = None):
         self._apispec = None
-        self.blueprint = flask.Blueprint(
+        # Built spec as plain dict, when it isn't kept in self._apispec (loaded from
+        # snapshot or after build data had been released)
+        self._spec_dict: dict | None = None
+        # Marshaled spec, after build data had been released and until spec is
+        # needed as dict
+        self._packed_spec: bytes | None = None
+        self._unpack_lock = threading.Lock()
+        self._app: flask.Flask | None = None
+        self._is_spec_built = False
+        self._build_lock = threading.Lock()
+        self._spec_cache = SpecCache(self)
+        self._ma_plugin: MarshmallowPlugin | None = None
+        self._paths_manager: FlaskPathsManager | None = None
+        self._sources_watcher: FilesWatcher | None = None
+        # For each watched source file, documented view functions from it
+        self._watched_views: dict[str, list[Callable]] = {}
+        # For each watched source file, name of schemas module loaded from it
+        self._watched_schema_modules: dict[str, str] = {}
+        self.blueprint = OpenAPIBlueprint(
             name="open_api",
             import_name=__name__,
             url_prefix="/docs",
@@ -158,6 +296,10 @@ class OpenAPI:
             static_folder="./static",
         )
         self.config = config
+        self._json_dumps = json_backend(config.spec_json_backend)
+        self._schemas_registry = SchemasRegistry(
+            config.app_package_name, discover=config.discover_schemas
+        )
 
         self._map_to_openapi_types = []
         self._attribute_functions = []
@@ -172,8 +314,21 @@ class OpenAPI:
 
         This will be used by OpenAPI middleware to override whatever docs would've been
         generated for that path and method.
+
+        If called after `init_app()`, already generated spec is updated and served
+        swagger.json and swagger.yaml are regenerated.
         """
-        self.docs_overrides[(path, method.lower())] = docs
+        with self._build_lock:
+            self.docs_overrides[(path, method.lower())] = docs
+
+            if self._is_spec_built and self._app:
+                if self._apispec is None:
+                    # Spec from snapshot or released spec can't be updated, build it
+                    # again instead
+                    self._is_spec_built = False
+                else:
+                    self._apply_override(self._app, path, method.lower(), docs)
+                self._spec_cache.invalidate()
 
     def add_map_to_openapi_types(self, data):
         """
@@ -245,11 +400,12 @@ class OpenAPI:
             ]
         )
 
-        with app.test_request_context():
-            SchemasRegistry.find_all_schemas(self.config.app_package_name)
-            self._init_apispec()
-            self._collect_shema_docs()
-            self._collect_endpoints_docs(app)
+        self._app = app
+        self._is_spec_built = False
+        self._spec_cache.invalidate()
+
+        if not self.config.lazy_spec_build:
+            self._build_spec()
 
         app.register_blueprint(self.blueprint, url_prefix=full_url_prefix)
 
@@ -257,16 +413,299 @@ class OpenAPI:
             app.extensions = {}
         app.extensions["open_api"] = self
 
-    def _collect_endpoints_docs(self, app):
-        for converted_path, operations in FlaskPathsManager(
-            app, self.config.is_excluded_cb, self.docs_overrides
-        ).collect_endpoints_docs():
-            self._apispec.path(path=converted_path, operations=operations.model_dump())
+    def prefork(self, *, freeze_gc: bool = True):
+        """
+        Builds and serializes spec in advance, before server process forks workers.
+
+        Call this after `init_app()` in the process that forks (ie. gunicorn master
+        with `preload_app = True`). All served documents (swagger.json,
+        swagger.yaml and per tag shards) are serialized into immutable bytes, so
+        workers don't build or serialize anything and copy-on-write memory pages
+        holding spec stay shared between them.
+
+        If `freeze_gc` is True, `gc.freeze()` is called at the end. This moves all
+        objects that exist at that point (not only ones belonging to spec) into
+        permanent generation, so garbage collector in workers never writes into their
+        memory pages.
+        """
+        self._ensure_spec()
+
+        self._spec_cache.json()
+        self._spec_cache.yaml()
+        if self.config.shard_spec_by_tag:
+            self._spec_cache.shards()
+            self._spec_cache.shards_index()
+
+        if freeze_gc:
+            gc.collect()
+            gc.freeze()
+
+    def _ensure_spec(self) -> apispec.APISpec | None:
+        """
+        Builds OpenAPI spec unless it had already been built.
+
+        Safe to be called from multiple threads, spec is built exactly once. Returns
+        None if spec was loaded from snapshot or if build data had been released.
+        """
+        if not self._is_spec_built:
+            with self._build_lock:
+                if not self._is_spec_built:
+                    self._build_spec()
+        return self._apispec
+
+    def _build_spec(self):
+        if not self._app:
+            msg = "OpenAPI spec can't be built before calling init_app()!"
+            raise RuntimeError(msg)
+
+        snapshot = (
+            SpecSnapshot(
+                Path(self.config.spec_snapshot_dir)
+                / f"spec-{self.config.app_package_name}.marshal"
+            )
+            if self.config.spec_snapshot_dir and not self.config.incremental_rebuild
+            else None
+        )
+
+        with self._app.test_request_context():
+            self._schemas_registry.schemas()
+            self._init_paths_manager(self._app)
+
+            self._spec_dict = None
+            self._packed_spec = None
+            fingerprint = self._spec_fingerprint() if snapshot else None
+            if fingerprint:
+                self._spec_dict = snapshot.load(fingerprint)
+
+            if self._spec_dict is None:
+                self._init_apispec()
+                self._collect_shema_docs()
+                self._collect_endpoints_docs()
+                if fingerprint:
+                    snapshot.save(fingerprint, self._apispec.to_dict())
+            else:
+                self._apispec = None
+
+        if self.config.incremental_rebuild:
+            self._watch_sources()
+        elif self.config.release_build_data:
+            self._release_build_data()
+
+        self._is_spec_built = True
+
+    def _release_build_data(self):
+        spec = self._apispec.to_dict() if self._apispec else self._spec_dict
+        try:
+            self._packed_spec = marshal.dumps(spec)
+        except ValueError:
+            # Something in spec can't be marshaled, ie. datetime.date in docstring
+            self._spec_dict = spec
+        else:
+            self._spec_dict = None
+
+        self._apispec = None
+        self._ma_plugin = None
+        self._paths_manager = None
+
+    def _watch_sources(self):
+        self._watched_views = {}
+        view_funcs = dict.fromkeys(
+            view_func
+            for rule in self._paths_manager.rules()
+            for view_func in self._paths_manager.view_functions(rule)
+        )
+        for view_func in view_funcs:
+            file_path = source_file(view_func)
+            if file_path:
+                self._watched_views.setdefault(file_path, []).append(view_func)
+
+        self._watched_schema_modules = {}
+        for klass in self._schemas_registry.schemas().values():
+            file_path = getattr(sys.modules.get(klass.__module__), "__file__", None)
+            # Modules with views can't be reloaded, routes would be registered again
+            if file_path and file_path not in self._watched_views:
+                self._watched_schema_modules[file_path] = klass.__module__
+
+        self._sources_watcher = FilesWatcher(
+            [*self._watched_views, *self._watched_schema_modules]
+        )
+
+    def _refresh_spec(self):
+        """
+        Updates parts of spec whose sources changed since spec was built (or since
+        previous call).
+        """
+        if not (self.config.incremental_rebuild and self._is_spec_built):
+            return
+
+        with self._build_lock:
+            changed_files = self._sources_watcher.changed()
+            if not changed_files:
+                return
+
+            view_funcs: list[Callable] = []
+            view_docstrings: dict[Callable, str | None] = {}
+            schemas: dict[str, type[ma.Schema]] = {}
+
+            for file_path in changed_files:
+                if file_path in self._watched_views:
+                    docstrings = read_docstrings(file_path)
+                    for view_func in self._watched_views[file_path]:
+                        qualname = inspect.unwrap(view_func).__qualname__
+                        if qualname in docstrings:
+                            view_docstrings[view_func] = docstrings[qualname]
+                        view_funcs.append(view_func)
+                else:
+                    schemas.update(
+                        self._schemas_registry.reload_module(
+                            self._watched_schema_modules[file_path]
+                        )
+                    )
+
+            with self._app.test_request_context():
+                self._replace_schema_docs(schemas)
+                self._rebuild_views_docs(view_funcs, view_docstrings)
+
+            self._spec_cache.invalidate()
+
+    def _replace_schema_docs(self, schemas: dict[str, type[ma.Schema]]):
+        refs = self._ma_plugin.converter.refs
+        for schema_key, name in list(refs.items()):
+            if name in schemas:
+                del refs[schema_key]
+        for name in schemas:
+            self._apispec.components.schemas.pop(name, None)
+
+        self._register_schema_docs(schemas)
+
+    def _rebuild_views_docs(
+        self, view_funcs: list[Callable], docstrings: dict[Callable, str | None]
+    ):
+        for converted_path, operations in self._paths_manager.rebuild_views_docs(
+            view_funcs, docstrings
+        ):
+            self._add_path(converted_path, operations)
+
+    def _add_path(self, converted_path: str, operations: dict[str, Any]):
+        self._apispec.path(path=converted_path, operations=operations)
+
+    def _spec_fingerprint(self) -> str | None:
+        """
+        Fingerprint of spec build inputs, or None if they can't be fingerprinted
+        reliably and snapshot can't be used.
+        """
+        fingerprint = SpecFingerprint()
+
+        fingerprint.update(
+            json.dumps(self._load_initial_spec(), default=fingerprint.repr)
+        )
+        fingerprint.update(str(self._validate_docstrings))
+
+        for data in self._map_to_openapi_types:
+            fingerprint.update(fingerprint.repr(data))
+        for f in [*self._attribute_functions, self.config.is_excluded_cb]:
+            if f:
+                fingerprint.update(getattr(f, "__qualname__", type(f).__qualname__))
+                fingerprint.update_source(f)
+
+        for (path, method), docs in self.docs_overrides.items():
+            fingerprint.update(path, method, docs.model_dump_json())
+
+        for name, klass in self._schemas_registry.schemas().items():
+            fingerprint.update(name, f"{klass.__module__}.{klass.__qualname__}")
+            for base in klass.__mro__:
+                fingerprint.update_source(base)
+            for field in klass._declared_fields.values():
+                fingerprint.update_source(type(field))
+
+        docstrings = self._fingerprint_routes(fingerprint)
+        # Docstrings descriptions are Jinja templates that can use app config
+        fingerprint.update_config(self._app.config, self._app.jinja_env, docstrings)
+
+        return fingerprint.hexdigest() if fingerprint.is_reliable else None
+
+    def _fingerprint_routes(self, fingerprint: SpecFingerprint) -> list[str]:
+        """Adds documented routes to fingerprint, returns docstrings of their views."""
+        docstrings = []
+        for rule in self._paths_manager.rules():
+            fingerprint.update(rule.rule, rule.endpoint, *sorted(rule.methods or []))
+            for view_func in self._paths_manager.view_functions(rule):
+                operation = FlaskPathsManager.operation_docs(view_func)
+                fingerprint.update(
+                    view_func.__doc__,
+                    operation.model_dump_json() if operation else None,
+                )
+                if view_func.__doc__:
+                    docstrings.append(view_func.__doc__)
+
+        return docstrings
+
+    def _init_paths_manager(self, app):
+        self._paths_manager = FlaskPathsManager(
+            app,
+            self.config.is_excluded_cb,
+            self.docs_overrides,
+            excluded_blueprints=[self.blueprint.name],
+            docstring_cache=(
+                DocstringCache(
+                    Path(self.config.docstring_cache_dir)
+                    / f"docstrings-{self.config.app_package_name}.marshal"
+                )
+                if self.config.docstring_cache_dir
+                else None
+            ),
+            validate_docstrings=self._validate_docstrings,
+        )
+
+    @property
+    def _validate_docstrings(self) -> bool:
+        if self.config.validate_docstrings is None:
+            return self._app.debug or self._app.testing
+        return self.config.validate_docstrings
+
+    def _collect_endpoints_docs(self):
+        with self._spec_build_executor() as executor:
+            for (
+                converted_path,
+                operations,
+            ) in self._paths_manager.collect_endpoints_docs(executor):
+                self._add_path(converted_path, operations)
+
+    def _spec_build_executor(self) -> contextlib.AbstractContextManager:
+        workers = self.config.spec_build_workers
+        executor: Executor | None = None
+
+        if workers:
+            if self.config.spec_build_executor == "thread":
+                executor = ThreadPoolExecutor(max_workers=workers)
+            elif self.config.spec_build_executor == "process":
+                executor = ProcessPoolExecutor(max_workers=workers)
+            else:
+                msg = (
+                    "Unsupported spec_build_executor "
+                    f'"{self.config.spec_build_executor}"!'
+                )
+                raise ValueError(msg)
+
+        return executor or contextlib.nullcontext()
+
+    def _apply_override(
+        self, app: flask.Flask, path: str, method: str, docs: OperationObject
+    ):
+        to_open_api_path = (
+            FlaskPathsManager._flask_path_template_to_open_api_path_template
+        )
+
+        for rule in app.url_map.iter_rules():
+            if path in (rule.rule, rule.endpoint) and method.upper() in (
+                rule.methods or []
+            ):
+                self._add_path(to_open_api_path(rule.rule), {method: docs.model_dump()})
 
     def _init_apispec(self):
         initial_swagger_json = self._load_initial_spec()
 
-        ma_plugin = MarshmallowPlugin()
+        self._ma_plugin = ma_plugin = MarshmallowPlugin()
         self._apispec = apispec.APISpec(plugins=[ma_plugin], **(initial_swagger_json))
         for _ in self._map_to_openapi_types:
             ma_plugin.map_to_openapi_type(*_)
@@ -274,27 +713,32 @@ class OpenAPI:
             ma_plugin.converter.add_attribute_function(_)
 
     def _collect_shema_docs(self):
-        for name, klass in SchemasRegistry.all_schemas().items():
-            # apispec automatically registers all nested schema so we must prevent
-            # registering them ourselves because of DuplicateSchemaError
-            x_tags = getattr(klass.opts, "x_tags", None)
-
-            try:
-                if x_tags:
-                    self._apispec.components.schema(
-                        name, component={"x-tags": x_tags}, schema=klass
-                    )
-                else:
-                    self._apispec.components.schema(name, schema=klass)
-            except DuplicateComponentNameError:
-                pass
+        self._register_schema_docs(self._schemas_registry.schemas())
+
+    def _register_schema_docs(self, schemas: dict[str, type[ma.Schema]]):
+        registered = self._apispec.components.schemas
+        # Nested schemas are registered before schemas nesting them, so apispec only
+        # references them and each schema is converted once
+        for name, schema in SchemasRegistry.in_dependency_order(schemas).items():
+            if name in registered:
+                # Name was taken by schema apispec registered by itself, ie. schema
+                # nested with `only`
+                continue
+
+            x_tags = getattr(schema.opts, "x_tags", None)
+            if x_tags:
+                self._apispec.components.schema(
+                    name, component={"x-tags": x_tags}, schema=schema
+                )
+            else:
+                self._apispec.components.schema(name, schema=schema)
 
     def _load_initial_spec(self):
-        initial_swagger_json: dict = _MINIMAL_SPEC
+        initial_swagger_json: dict = deepcopy(_MINIMAL_SPEC)
         if self.config.api_name:
-            _MINIMAL_SPEC["title"] = self.config.api_name
+            initial_swagger_json["title"] = self.config.api_name
         if self.config.api_version:
-            _MINIMAL_SPEC["version"] = self.config.api_version
+            initial_swagger_json["version"] = self.config.api_version
 
         if self.config.swagger_json_template_loader:
             if self.config.swagger_json_template_loader_kwargs:
@@ -316,8 +760,15 @@ class OpenAPI:
 
         return initial_swagger_json
 
-    def collect_static(
-        self, destination_dir: str | Path, *, cache_bust_swagger_json: bool = True
+    def collect_static(  # noqa: PLR0913, keyword-only options
+        self,
+        destination_dir: str | Path,
+        *,
+        cache_bust_swagger_json: bool = True,
+        gzip_static: bool = True,
+        hardlink_static: bool = False,
+        exclude_unused_static: bool = False,
+        cache_bust_static: bool = False,
     ):
         """
         Collects static file into specified directory.
@@ -336,13 +787,48 @@ class OpenAPI:
 
         - creates different URL for `GET swagger.json`
         - different contents of generated HTML for doc viewers
+
+        If `OpenAPISettings.shard_spec_by_tag` is set, per tag shards of spec are
+        written to `swagger/` subdirectory (cache busted the same way as
+        `swagger.json`) and listed in `swagger/index.json`.
+
+        `gzip_static` - if `True`, each of collected HTML, JS, CSS and spec files gets
+        precompressed `.gz` sibling (ie. `swagger-ui-bundle.js.gz`) that can be served
+        as is by reverse proxy (ie. `gzip_static on;` in Nginx). Siblings of static
+        files that didn't change since previous call are not written again.
+
+        Static files of doc viewers are copied only if they changed since previous
+        call (this is tracked in `docs/.collect_static.json`).
+
+        `hardlink_static` - if `True`, static files of doc viewers are hardlinked
+        instead of copied (falling back to copying if that is not possible, ie.
+        because `destination_dir` is on different filesystem).
+
+        `exclude_unused_static` - if `True`, source maps and SwaggerUI bundle variants
+        that doc viewers don't use (see `static_collector.UNUSED_STATIC`) are not
+        collected.
+
+        `cache_bust_static` - if `True`, each of static files of doc viewers is also
+        written under content hashed name (ie. `swagger-ui-bundle.0123456789ab.js`)
+        and generated HTML uses these names. Such files never change and can be served
+        with `Cache-Control: immutable`. Mapping of original names to hashed ones
+        (including cache busted spec files) is written to
+        `docs/static/asset_manifest.json`.
         """
 
         return StaticResourcesCollector(
-            self, destination_dir, cache_bust_swagger_json=cache_bust_swagger_json
+            self,
+            destination_dir,
+            cache_bust_swagger_json=cache_bust_swagger_json,
+            gzip_static=gzip_static,
+            hardlink_static=hardlink_static,
+            exclude_unused_static=exclude_unused_static,
+            cache_bust_static=cache_bust_static,
         ).collect()
 
-    def _swagger_ui_template_config(self, config_overrides=None, oauth_config=None):
+    def _swagger_ui_template_config(
+        self, config_overrides=None, oauth_config=None, asset_names=None
+    ):
         # Swagger UI config
         # see: https://github.com/swagger-api/swagger-ui
         config = {
@@ -361,18 +847,34 @@ class OpenAPI:
             ),
         }
 
+        if self.config.shard_spec_by_tag and "urls" not in (config_overrides or {}):
+            config["urls"] = self._shards_urls()
+
         if config_overrides:
             config.update(config_overrides)
 
+        if "urls" in config:
+            config.pop("url", None)
+
         fields = {"config_json": json.dumps(config)}
 
         if oauth_config:
             fields["oauth_config_json"] = json.dumps(oauth_config)
 
         fields["api_name"] = self.config.api_name
+        fields["asset_url"] = asset_url_builder(asset_names)
 
         return fields
 
+    def _shards_urls(self) -> list[dict[str, str]]:
+        return [
+            {
+                "url": flask.url_for("open_api.swagger_json_shard", shard=slug),
+                "name": shard.tag,
+            }
+            for slug, shard in self._spec_cache.shards().items()
+        ]
+
     def _add_own_endpoints(self):
         # How this stuff works?
         #
@@ -398,22 +900,27 @@ class OpenAPI:
         self.blueprint.add_url_rule(
             rule="/static/swagger.json",
             endpoint="swagger_json",
-            view_func=lambda: flask.make_response(
-                json.dumps(self._apispec.to_dict()),
-                requests.codes["✓"],
-                {"Content-Type": "application/json"},
-            ),
+            view_func=lambda: self._spec_response("json"),
             methods=["GET"],
         )
         self.blueprint.add_url_rule(
             rule="/static/swagger.yaml",
             endpoint="swagger_yaml",
-            view_func=lambda: flask.Response(
-                response=self._apispec.to_yaml(),
-                status=requests.codes["✓"],
-                mimetype="application/x-yaml",
-            ),
+            view_func=lambda: self._spec_response("yaml"),
         )
+        if self.config.shard_spec_by_tag:
+            self.blueprint.add_url_rule(
+                rule="/static/swagger/index.json",
+                endpoint="swagger_json_shards",
+                view_func=lambda: self._spec_response("shards_index"),
+                methods=["GET"],
+            )
+            self.blueprint.add_url_rule(
+                rule="/static/swagger/<shard>.json",
+                endpoint="swagger_json_shard",
+                view_func=self._shard_response,
+                methods=["GET"],
+            )
         self.blueprint.add_url_rule(
             rule="/swagger_ui",
             endpoint="swagger_ui",
@@ -426,7 +933,9 @@ class OpenAPI:
             rule="/re_doc",
             endpoint="re_doc",
             view_func=lambda: flask.render_template(
-                "re_doc.jinja2", api_name=self.config.api_name
+                "re_doc.jinja2",
+                api_name=self.config.api_name,
+                asset_url=asset_url_builder(),
             ),
             methods=["GET"],
         )
@@ -451,10 +960,52 @@ class OpenAPI:
                 methods=["GET"],
             )
 
+    def _spec_response(
+        self, fmt: Literal["json", "yaml", "shards_index"]
+    ) -> flask.Response:
+        self._refresh_spec()
+        if fmt == "json" and self.config.stream_spec_json:
+            return self._streamed_spec_response()
+        return getattr(self._spec_cache, fmt)().make_response()
+
+    def _streamed_spec_response(self) -> flask.Response:
+        chunks = iter_json(self._to_dict, dumps=self._json_dumps)
+        if accepts_gzip(flask.request):
+            response = flask.Response(gzip_chunks(chunks), mimetype="application/json")
+            response.content_encoding = "gzip"
+        else:
+            response = flask.Response(chunks, mimetype="application/json")
+        response.vary.add("Accept-Encoding")
+        return response
+
+    def _shard_response(self, shard: str) -> flask.Response:
+        self._refresh_spec()
+        serialized = self._spec_cache.shards().get(shard)
+        if serialized is None:
+            flask.abort(requests.codes["not_found"])
+        return serialized.spec.make_response()
+
     @property
-    def _to_dict(self):
-        return self._apispec.to_dict()
+    def _to_dict(self) -> dict:
+        """
+        Built spec.
+
+        Returned dict is not a copy: it shares nested data with built spec (and,
+        once build data is released, it is the very dict all documents are
+        serialized from). It must be treated as read-only, callers that need to
+        modify it should `copy.deepcopy()` it first.
+        """
+        spec = self._ensure_spec()
+        if spec is not None:
+            return spec.to_dict()
+        with self._unpack_lock:
+            if self._spec_dict is None:
+                # Our own data, marshaled by _release_build_data(). Unpacked only
+                # once, when first document is serialized.
+                self._spec_dict = marshal.loads(self._packed_spec)  # noqa: S302
+                self._packed_spec = None
+        return self._spec_dict
 
     @property
     def _to_yaml(self):
-        return self._apispec.to_yaml()
+        return dump_yaml(self._to_dict)
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+from .securities import Securities
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    import marshmallow as ma
+    from openapi_pydantic_models import OperationObject
+
+
+class OperationRecord:
+    """
+    Arguments of single `open_api` decorator call.
+
+    Decorators run when app modules are imported, but docs built from their
+    arguments are needed only when spec is generated. So decorators only record
+    their arguments into this compact object and pydantic `OperationObject` is
+    built from it by `to_operation()`, each time it is needed.
+    """
+
+    __slots__ = (
+        "additional_content",
+        "build",
+        "errors",
+        "has_id_in_path",
+        "headers",
+        "is_list",
+        "operation_id",
+        "request_schema",
+        "response_schema",
+        "security",
+        "summary",
+        "tags_override",
+    )
+
+    def __init__(  # noqa: PLR0913, mirrors arguments of decorators
+        self,
+        build: Callable[[OperationRecord], OperationObject],
+        *,
+        request_schema: type[ma.Schema] | None = None,
+        response_schema: type[ma.Schema] | None = None,
+        operation_id: str | None = None,
+        summary: str | None = None,
+        is_list: bool = False,
+        has_id_in_path: bool = False,
+        errors: dict[int, str] | None = None,
+        security: Securities = Securities.access_token,
+        additional_content: dict[str, Any] | None = None,
+        tags_override: list[str] | None = None,
+        headers: list[Any] | None = None,
+    ):
+        self.build = build
+        self.request_schema = request_schema
+        self.response_schema = response_schema
+        self.operation_id = operation_id
+        self.summary = summary
+        self.is_list = is_list
+        self.has_id_in_path = has_id_in_path
+        # Copies, so that later changes of caller's containers don't change docs
+        self.errors = dict(errors) if errors else None
+        self.security = security
+        self.additional_content = (
+            dict(additional_content) if additional_content else None
+        )
+        self.tags_override = list(tags_override) if tags_override else None
+        self.headers = list(headers) if headers else None
+
+    def to_operation(self) -> OperationObject:
+        return self.build(self)
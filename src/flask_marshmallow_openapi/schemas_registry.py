@@ -1,31 +1,176 @@
 import importlib
 import inspect
-from typing import Type
+import sys
+import threading
+from collections.abc import Generator
+from types import ModuleType
 
 import marshmallow as ma
+from apispec.ext.marshmallow.common import filter_excluded_fields, make_schema_key
 
-_KNOWN_SCHEMAS: dict[str, Type[ma.Schema]] = dict()
+# All schemas known in this process, registered or discovered for any app package
+_KNOWN_SCHEMAS: dict[str, type[ma.Schema]] = {}
+
+# Schemas registered by `open_api` decorators and `register_schema`, in registration
+# order. Keys are (name of module that registered schema, schema name), None module
+# means schema is registered for all apps.
+_REGISTERED_SCHEMAS: dict[tuple[str | None, str], type[ma.Schema]] = {}
+
+# Schemas found by scanning app packages, for each already scanned package
+_DISCOVERED_PACKAGES: dict[str, dict[str, type[ma.Schema]]] = {}
+
+# Guards all of module level state above
+_LOCK = threading.RLock()
+
+_IGNORED_SCHEMA_NAMES = {"Schema", "JsonApiSchema"}
 
 
 class SchemasRegistry:
+    """
+    Schemas documented for single app.
+
+    Schemas are recorded when they are used: `open_api` decorators register their
+    request and response schemas when view functions are decorated and
+    `register_schema` registers any other schema. App gets schemas registered from
+    modules of its app package, so multiple apps can be documented in the same
+    process (ie. in tests or in app serving multiple APIs) without seeing each other's
+    schemas.
+
+    If `discover` is set, app package is also scanned for schemas that were never
+    registered.
+
+    Class methods operate on process wide registry of all known schemas and are
+    safe to be called from multiple threads.
+    """
+
+    def __init__(self, app_package_name: str, *, discover: bool = False):
+        self.app_package_name = app_package_name
+        self.discover = discover
+        self._schemas: dict[str, type[ma.Schema]] | None = None
+        self._lock = threading.Lock()
+
+    def schemas(self) -> dict[str, type[ma.Schema]]:
+        """
+        Schemas registered for app package (and for all apps), plus schemas found by
+        scanning app package if `discover` is set.
+
+        App package is imported on first call, after that this is just an attribute
+        lookup.
+        """
+        if self._schemas is None:
+            with self._lock:
+                if self._schemas is None:
+                    if self.discover:
+                        schemas = self.find_all_schemas(self.app_package_name)
+                    else:
+                        schemas = self.registered_schemas(self.app_package_name)
+                    self._schemas = dict(schemas)
+        return self._schemas
+
+    def reload_module(self, module_name: str) -> dict[str, type[ma.Schema]]:
+        """
+        Reloads already imported module and replaces known schemas defined in it with
+        their new versions.
+
+        Returns reloaded schemas.
+        """
+        module = importlib.reload(sys.modules[module_name])
+
+        schemas = self.schemas()
+        retv = {}
+        for name, klass in schemas.items():
+            reloaded = getattr(module, klass.__name__, None)
+            if klass.__module__ == module_name and _is_schema_cls(reloaded):
+                retv[name] = reloaded
+        with _LOCK:
+            # Schemas registered again while module was executed
+            retv.update(
+                (name, klass)
+                for (registered_from, name), klass in _REGISTERED_SCHEMAS.items()
+                if registered_from == module_name
+            )
+        if self.discover:
+            retv.update(_module_schemas(module, defined_in=module_name))
+
+        with self._lock:
+            self._schemas = {**schemas, **retv}
+        with _LOCK:
+            _KNOWN_SCHEMAS.update(retv)
+
+        return retv
+
     @classmethod
-    def schema_ref(cls, schema: str | Type[ma.Schema]) -> str:
+    def schema_ref(cls, schema: str | type[ma.Schema]) -> str:
         return f"#/components/schemas/{cls.schema_name(schema)}"
 
     @classmethod
-    def schema_name(cls, schema: str | Type[ma.Schema]) -> str:
+    def schema_name(cls, schema: str | type[ma.Schema]) -> str:
         return (schema if isinstance(schema, str) else schema.__name__).replace(
             "Schema", ""
         )
 
     @classmethod
-    def all_schemas(cls) -> dict[str, Type[ma.Schema]]:
+    def in_dependency_order(
+        cls, schemas: dict[str, type[ma.Schema]]
+    ) -> dict[str, ma.Schema]:
+        """
+        Instances of given schemas, ordered so that each schema comes after all
+        schemas nested in it. Registering them in this order, apispec only references
+        nested schemas instead of registering them by itself.
+
+        Nested schemas are found the same way apispec finds them (`Nested` fields,
+        also inside `List`, `Dict` and `Pluck` fields) and are visited in the same
+        order, so resulting order of components in spec is the same as if schemas had
+        been registered in their original order. Schemas nested with modifiers (ie.
+        `only`) and schemas that aren't in `schemas` are followed too, but aren't
+        included in returned dict.
+
+        Returned instances already have their nested schemas resolved, so apispec
+        should be given these instead of schema classes.
+        """
+        instances = {name: klass() for name, klass in schemas.items()}
+        keys = {name: make_schema_key(schema) for name, schema in instances.items()}
+        name_for_key: dict[tuple, str] = {}
+        for name, key in keys.items():
+            name_for_key.setdefault(key, name)
+
+        retv: dict[str, ma.Schema] = {}
+        visited: set[tuple] = set()
+        for name, schema in instances.items():
+            if keys[name] not in visited:
+                # Depth first search, schemas are added to retv when leaving them.
+                # Schema is marked as visited before its nested schemas are, which
+                # is also how apispec breaks circular references.
+                visited.add(keys[name])
+                stack = [(keys[name], _nested_schemas(schema))]
+                while stack:
+                    key, nested = stack[-1]
+                    for nested_schema in nested:
+                        nested_key = make_schema_key(nested_schema)
+                        if nested_key not in visited:
+                            visited.add(nested_key)
+                            stack.append((nested_key, _nested_schemas(nested_schema)))
+                            break
+                    else:
+                        stack.pop()
+                        if key in name_for_key:
+                            retv.setdefault(
+                                name_for_key[key], instances[name_for_key[key]]
+                            )
+
+            # Same schema class registered under another name too
+            retv.setdefault(name, schema)
+
+        return retv
+
+    @classmethod
+    def all_schemas(cls) -> dict[str, type[ma.Schema]]:
         return _KNOWN_SCHEMAS
 
     @classmethod
     def main_schema_cls(
-        cls, other_schema: str | ma.Schema | Type[ma.Schema]
-    ) -> Type[ma.Schema]:
+        cls, other_schema: str | ma.Schema | type[ma.Schema]
+    ) -> type[ma.Schema]:
         """
         Given ie. class FooCreateSchema or name "FooCreateSchema", returns class
         FooSchema.
@@ -52,44 +197,194 @@ class SchemasRegistry:
         return retv
 
     @classmethod
-    def find_all_schemas(cls, app_package_name: str) -> dict[str, Type[ma.Schema]]:
-        global _KNOWN_SCHEMAS
+    def register(
+        cls, schema_cls: type[ma.Schema], module_name: str | None = None
+    ) -> type[ma.Schema]:
+        """
+        Registers schema class for apps whose app package contains module
+        `module_name`, or for all apps if `module_name` is None.
+        """
+        with _LOCK:
+            _REGISTERED_SCHEMAS[(module_name, cls.schema_name(schema_cls))] = schema_cls
+            _KNOWN_SCHEMAS[cls.schema_name(schema_cls)] = schema_cls
+        return schema_cls
 
-        if _KNOWN_SCHEMAS:
-            return _KNOWN_SCHEMAS
+    @classmethod
+    def register_used(cls, view_func, *schemas: type[ma.Schema] | None):
+        """
+        Registers schemas used by `open_api` decorators of view function, for app
+        package of view function's module.
+        """
+        module_name = getattr(view_func, "__module__", None)
+        for schema_cls in schemas:
+            if (
+                module_name
+                and _is_schema_cls(schema_cls)
+                and schema_cls.__name__ not in _IGNORED_SCHEMA_NAMES
+            ):
+                cls.register(schema_cls, module_name)
 
-        modules = [
-            _[1]
-            for _ in inspect.getmembers(
-                importlib.import_module(".", app_package_name), inspect.ismodule
-            )
-        ]
+    @classmethod
+    def registered_schemas(cls, app_package_name: str) -> dict[str, type[ma.Schema]]:
+        """
+        Schemas registered from modules of app package and schemas registered for all
+        apps, in registration order.
+        """
+        importlib.import_module(app_package_name)
 
-        clss = {
-            _[1]
-            for _ in inspect.getmembers(
-                importlib.import_module(".", app_package_name), inspect.isclass
-            )
-        }
+        with _LOCK:
+            return {
+                name: klass
+                for (module_name, name), klass in _REGISTERED_SCHEMAS.items()
+                if module_name is None or _is_in_package(module_name, app_package_name)
+            }
+
+    @classmethod
+    def find_all_schemas(cls, app_package_name: str) -> dict[str, type[ma.Schema]]:
+        """
+        Schemas defined in app package and its subpackages (at any depth), schemas
+        imported into its modules and all registered schemas of app package.
+
+        This is fallback for apps that don't register all of their schemas. Each
+        package is scanned only once, after that this is just a dict lookup.
+        """
+        with _LOCK:
+            if app_package_name not in _DISCOVERED_PACKAGES:
+                _DISCOVERED_PACKAGES[app_package_name] = cls._discover_schemas(
+                    app_package_name
+                )
+                _KNOWN_SCHEMAS.update(_DISCOVERED_PACKAGES[app_package_name])
+
+            return {
+                **_DISCOVERED_PACKAGES[app_package_name],
+                **cls.registered_schemas(app_package_name),
+            }
 
-        for klass in {
-            _
-            for module_ in modules
-            for name, _ in inspect.getmembers(module_, inspect.isclass)
-        }.union(clss):
+    @classmethod
+    def _discover_schemas(cls, app_package_name: str) -> dict[str, type[ma.Schema]]:
+        importlib.import_module(app_package_name)
+
+        retv = {}
+
+        # Schemas defined in app package. Instead of inspecting members of each app
+        # module, this walks `ma.Schema.__subclasses__()` tree.
+        for klass in _schema_subclasses(ma.Schema):
             if (
-                issubclass(klass, ma.Schema)
-                and klass.__name__ != "Schema"
-                and klass.__name__ != "JsonApiSchema"
+                _is_in_package(klass.__module__, app_package_name)
+                # Skip classes defined inside functions
+                and "<locals>" not in klass.__qualname__
+                and klass.__name__ not in _IGNORED_SCHEMA_NAMES
             ):
-                _KNOWN_SCHEMAS[cls.schema_name(klass)] = klass
+                retv[cls.schema_name(klass)] = klass
+
+        # Schemas defined elsewhere (ie. in shared library) and imported into app
+        # modules
+        app_modules = [
+            module
+            for module_name, module in list(sys.modules.items())
+            if _is_in_package(module_name, app_package_name)
+        ]
+        for module in app_modules:
+            for name, klass in _module_schemas(module).items():
+                retv.setdefault(name, klass)
+
+        return retv
+
+
+def _is_in_package(module_name: str, package_name: str) -> bool:
+    return module_name == package_name or module_name.startswith(f"{package_name}.")
 
-        return _KNOWN_SCHEMAS
 
+def _is_schema_cls(obj) -> bool:
+    return isinstance(obj, type) and issubclass(obj, ma.Schema)
 
-def main_schema_cls(other_schema: str | ma.Schema) -> Type[ma.Schema]:
+
+def _module_schemas(
+    module: ModuleType, defined_in: str | None = None
+) -> dict[str, type[ma.Schema]]:
+    """Schema classes in module's namespace, optionally only those defined in it."""
+    return {
+        SchemasRegistry.schema_name(klass): klass
+        for klass in list(vars(module).values())
+        if _is_schema_cls(klass)
+        and klass.__name__ not in _IGNORED_SCHEMA_NAMES
+        and (defined_in is None or klass.__module__ == defined_in)
+    }
+
+
+def _schema_subclasses(
+    klass: type[ma.Schema],
+) -> Generator[type[ma.Schema], None, None]:
+    seen = set()
+    stack = list(reversed(klass.__subclasses__()))
+    while stack:
+        subclass = stack.pop()
+        if subclass in seen:
+            continue
+        seen.add(subclass)
+        yield subclass
+        stack.extend(reversed(subclass.__subclasses__()))
+
+
+def _nested_schemas(schema: ma.Schema) -> Generator[ma.Schema, None, None]:
+    """Schemas nested in schema's fields, in order in which apispec converts them."""
+    fields = filter_excluded_fields(
+        schema.fields, getattr(schema, "Meta", None), exclude_dump_only=False
+    )
+    for field in fields.values():
+        yield from _field_nested_schemas(field)
+
+
+def _field_nested_schemas(
+    field: ma.fields.Field,
+) -> Generator[ma.Schema, None, None]:
+    if isinstance(field, (ma.fields.Nested, ma.fields.Pluck)):
+        try:
+            nested = field.schema
+        except (ValueError, TypeError, ma.exceptions.RegistryError):
+            # apispec will report it, or treat it as reference to external schema
+            return
+
+        if isinstance(field, ma.fields.Pluck):
+            plucked = nested.fields.get(field.field_name)
+            if plucked is not None:
+                yield from _field_nested_schemas(plucked)
+        else:
+            yield nested
+
+    elif isinstance(field, ma.fields.List):
+        yield from _field_nested_schemas(field.inner)
+
+    elif isinstance(field, ma.fields.Dict) and field.value_field:
+        yield from _field_nested_schemas(field.value_field)
+
+
+def main_schema_cls(other_schema: str | ma.Schema) -> type[ma.Schema]:
     """
     Given ie. class FooCreateSchema or name "FooCreateSchema", returns class
     FooSchema.
     """
     return SchemasRegistry.main_schema_cls(other_schema)
+
+
+def register_schema(schema_cls: type[ma.Schema]) -> type[ma.Schema]:
+    """
+    Registers schema, so it is documented even if no `open_api` decorator uses it.
+    Schema is documented in app whose app package contains calling module. Schemas
+    used by decorators are registered automatically.
+
+    Example:
+
+        from other_library import SomeSchema
+
+        register_schema(SomeSchema)
+
+        @register_schema
+        class OtherSchema(ma.Schema):
+            ...
+    """
+    frame = inspect.currentframe()
+    caller = frame.f_back if frame else None
+    return SchemasRegistry.register(
+        schema_cls, caller.f_globals.get("__name__") if caller else None
+    )
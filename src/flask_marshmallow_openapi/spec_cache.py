@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, TypeVar
+
+import flask
+
+from .compression import accepts_gzip, gzip_bytes
+from .spec_shards import shard_slugs, split_by_tag
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from .middleware import OpenAPI
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class SerializedSpec:
+    """OpenAPI spec document serialized into immutable bytes."""
+
+    data: bytes
+    mimetype: str
+
+    #: Strong ETag, hex digest of `data`
+    etag: str
+
+    #: Precompressed `data`, served to clients that accept gzip encoding
+    gzipped_data: bytes
+
+    @classmethod
+    def from_bytes(cls, data: bytes, mimetype: str) -> SerializedSpec:
+        return cls(
+            data=data,
+            mimetype=mimetype,
+            etag=hashlib.sha256(data).hexdigest(),
+            gzipped_data=gzip_bytes(data),
+        )
+
+    def make_response(self) -> flask.Response:
+        """
+        Response for current request.
+
+        Negotiates `Accept-Encoding` and handles `If-None-Match` request header,
+        responding with `304 Not Modified` if client already has current version of
+        the document.
+        """
+        if accepts_gzip(flask.request):
+            response = flask.Response(self.gzipped_data, mimetype=self.mimetype)
+            response.content_encoding = "gzip"
+            # Different representation must have different strong ETag
+            response.set_etag(self.etag + "-gzip")
+        else:
+            response = flask.Response(self.data, mimetype=self.mimetype)
+            response.set_etag(self.etag)
+
+        response.vary.add("Accept-Encoding")
+        return response.make_conditional(flask.request)
+
+
+@dataclass(frozen=True)
+class SerializedShard:
+    """Part of OpenAPI spec containing operations with single tag."""
+
+    tag: str
+    spec: SerializedSpec
+
+
+class SpecCache:
+    """
+    Serialized swagger.json and swagger.yaml.
+
+    Each document is serialized on first access, and then served from memory until
+    `invalidate()` is called (ie. because OpenAPI spec has changed).
+
+    Documents are built and serialized without holding the cache lock, because
+    building spec takes `OpenAPI` build lock and that one is held while cache is
+    invalidated. Concurrent first accesses may serialize the same document more than
+    once, only one of results is kept.
+    """
+
+    def __init__(self, open_api: OpenAPI):
+        self.open_api = open_api
+        self._lock = threading.Lock()
+        # Incremented by each `invalidate()`, documents serialized from older spec
+        # are not cached
+        self._generation = 0
+        self._json: SerializedSpec | None = None
+        self._yaml: SerializedSpec | None = None
+        self._shards: dict[str, SerializedShard] | None = None
+        self._shards_index: SerializedSpec | None = None
+
+    def json(self) -> SerializedSpec:
+        return self._cached(
+            "_json",
+            lambda: SerializedSpec.from_bytes(
+                self.open_api._json_dumps(self.open_api._to_dict), "application/json"
+            ),
+        )
+
+    def yaml(self) -> SerializedSpec:
+        return self._cached(
+            "_yaml",
+            lambda: SerializedSpec.from_bytes(
+                self.open_api._to_yaml.encode("utf-8"), "application/x-yaml"
+            ),
+        )
+
+    def shards(self) -> dict[str, SerializedShard]:
+        """Serialized per tag shards of swagger.json, keyed by shard slug."""
+
+        def serialize() -> dict[str, SerializedShard]:
+            shards = split_by_tag(self.open_api._to_dict)
+            return {
+                slug: SerializedShard(
+                    tag=tag,
+                    spec=SerializedSpec.from_bytes(
+                        self.open_api._json_dumps(shards[tag]), "application/json"
+                    ),
+                )
+                for tag, slug in shard_slugs(list(shards)).items()
+            }
+
+        return self._cached("_shards", serialize)
+
+    def shards_index(self) -> SerializedSpec:
+        """
+        List of shards, in the same format as SwaggerUI `urls` config option.
+
+        URLs of shards are relative to the index itself, so the same document is
+        correct for any request, whatever the host or script root it came through.
+        """
+        return self._cached(
+            "_shards_index",
+            lambda: SerializedSpec.from_bytes(
+                self.open_api._json_dumps(
+                    [
+                        {"url": f"{slug}.json", "name": shard.tag}
+                        for slug, shard in self.shards().items()
+                    ]
+                ),
+                "application/json",
+            ),
+        )
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._json = None
+            self._yaml = None
+            self._shards = None
+            self._shards_index = None
+
+    def _cached(self, name: str, serialize: Callable[[], T]) -> T:
+        retv = getattr(self, name)
+        if retv is None:
+            generation = self._generation
+            serialized = serialize()
+            with self._lock:
+                retv = getattr(self, name)
+                if retv is None:
+                    retv = serialized
+                    if generation == self._generation:
+                        setattr(self, name, retv)
+        return retv
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, Final
+
+import inflection
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+#: Shard for operations without tags (SwaggerUI shows them under the same name)
+UNTAGGED_SHARD: Final[str] = "default"
+
+#: Name of shards index document, can't be used for shards
+SHARDS_INDEX: Final[str] = "index"
+
+_HTTP_METHODS: Final[frozenset[str]] = frozenset(
+    {"get", "put", "post", "delete", "options", "head", "patch", "trace"}
+)
+
+_COMPONENTS_REF_PREFIX: Final[str] = "#/components/"
+
+
+def split_by_tag(spec: dict) -> dict[str, dict]:
+    """
+    Splits OpenAPI spec into one document for each of operation tags.
+
+    Operation with multiple tags is included in shard of each of them, operations
+    without tags end up in `UNTAGGED_SHARD`. Each shard contains only components
+    that its operations reference (directly or via other components), and all of
+    `securitySchemes`. Shards are ordered as tags in spec's `tags` list, followed by
+    the rest of tags in order of first use.
+    """
+    tags_docs = {_["name"]: _ for _ in spec.get("tags", [])}
+    shards_paths: dict[str, dict[str, dict]] = {_: {} for _ in tags_docs}
+
+    for path, path_item in spec.get("paths", {}).items():
+        for method, operation in path_item.items():
+            if method not in _HTTP_METHODS:
+                continue
+
+            for tag in operation.get("tags") or [UNTAGGED_SHARD]:
+                shard_path_item = shards_paths.setdefault(tag, {}).setdefault(
+                    path,
+                    {k: v for k, v in path_item.items() if k not in _HTTP_METHODS},
+                )
+                shard_path_item[method] = operation
+
+    common = {k: v for k, v in spec.items() if k not in {"paths", "components", "tags"}}
+
+    retv = {}
+    for tag, paths in shards_paths.items():
+        if not paths:
+            continue
+
+        shard = dict(common)
+        if tag in tags_docs:
+            shard["tags"] = [tags_docs[tag]]
+        shard["paths"] = paths
+        components = _referenced_components(spec.get("components", {}), paths)
+        if components:
+            shard["components"] = components
+        retv[tag] = shard
+
+    return retv
+
+
+def shard_slugs(tags: list[str]) -> dict[str, str]:
+    """
+    For each tag, URL safe and unique name of its shard.
+    """
+    retv = {}
+    used = {SHARDS_INDEX}
+    for tag in tags:
+        base = inflection.parameterize(tag) or "tag"
+        slug = base
+        suffix = 1
+        while slug in used:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        used.add(slug)
+        retv[tag] = slug
+    return retv
+
+
+def _referenced_components(components: dict, paths: dict) -> dict:
+    retv: dict[str, dict] = {}
+    if "securitySchemes" in components:
+        retv["securitySchemes"] = components["securitySchemes"]
+
+    seen = set()
+    to_visit = list(_refs(paths))
+    while to_visit:
+        ref = to_visit.pop()
+        if ref in seen or not ref.startswith(_COMPONENTS_REF_PREFIX):
+            continue
+        seen.add(ref)
+
+        section, _, name = ref[len(_COMPONENTS_REF_PREFIX) :].partition("/")
+        # JSON pointer escaping
+        name = name.replace("~1", "/").replace("~0", "~")
+        component = components.get(section, {}).get(name)
+        if component is None:
+            continue
+
+        retv.setdefault(section, {})[name] = component
+        to_visit.extend(_refs(component))
+
+    # Keep components in the same order as they are in the whole spec
+    return {
+        section: {
+            name: component
+            for name, component in components[section].items()
+            if name in retv[section]
+        }
+        for section in components
+        if section in retv
+    }
+
+
+def _refs(obj: Any) -> Generator[str, None, None]:
+    to_visit = [obj]
+    while to_visit:
+        current = to_visit.pop()
+        if isinstance(current, dict):
+            ref = current.get("$ref")
+            if isinstance(ref, str):
+                yield ref
+            to_visit.extend(current.values())
+        elif isinstance(current, list):
+            to_visit.extend(current)
@@ -0,0 +1,222 @@
+from __future__ import annotations
+
+import hashlib
+import importlib.metadata
+import marshal
+import os
+import re
+import sys
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+import jinja2
+from jinja2 import nodes
+
+from . import __version__
+from .dev_reload import source_file
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+
+
+class SpecSnapshot:
+    """
+    On-disk snapshot of built OpenAPI spec.
+
+    Spec is stored in `marshal` format together with fingerprint of everything it
+    was built from (see `SpecFingerprint`). Processes booting with the same
+    fingerprint load spec from snapshot instead of building it again. Snapshot file
+    is written atomically, so processes can share it.
+
+    Any problems with reading or writing snapshot file are ignored - spec is then
+    simply built.
+    """
+
+    def __init__(self, file_path: str | Path):
+        self.file_path = Path(file_path)
+
+    def load(self, fingerprint: str) -> dict | None:
+        """Spec from snapshot, if it was stored with the same fingerprint."""
+        try:
+            # Our own snapshot file, same trust level as __pycache__
+            data = marshal.loads(self.file_path.read_bytes())  # noqa: S302
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+
+        if (
+            not isinstance(data, dict)
+            or data.get("fingerprint") != fingerprint
+            or not isinstance(data.get("spec"), dict)
+        ):
+            return None
+
+        return data["spec"]
+
+    def save(self, fingerprint: str, spec: dict):
+        try:
+            data = marshal.dumps({"fingerprint": fingerprint, "spec": spec})
+        except ValueError:
+            # Something in spec can't be marshaled, ie. datetime.date in docstring
+            return
+
+        tmp_path = self.file_path.with_name(f"{self.file_path.name}.{os.getpid()}.tmp")
+        try:
+            self.file_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_bytes(data)
+            tmp_path.replace(self.file_path)
+        except OSError:
+            return
+
+
+class SpecFingerprint:
+    """
+    Hash of spec build inputs.
+
+    Always includes versions of this library, of Python, of `marshal` format and of
+    libraries that generate parts of spec. Callers add the rest: plain values and
+    source files of functions and classes whose code affects generated spec.
+
+    Some inputs can't be fingerprinted so that the same input gives the same hash in
+    next process: source files that can't be read and objects whose `repr()` contains
+    memory address. Such fingerprint is not `is_reliable` and snapshot shouldn't be
+    used with it.
+    """
+
+    _LIBRARIES = ("apispec", "marshmallow", "openapi-pydantic-models")
+    # Config used by `url_for()`, which templates can call without reading config
+    _URL_CONFIG_KEYS = ("SERVER_NAME", "APPLICATION_ROOT", "PREFERRED_URL_SCHEME")
+    # Default `object.__repr__()`, ie. "<foo.Bar object at 0x7f...>"
+    _MEMORY_ADDRESS = re.compile(r"\bat 0x[0-9a-fA-F]+")
+
+    def __init__(self):
+        self._hash = hashlib.sha256()
+        self._source_files: set[str] = set()
+        #: False if some of inputs would be fingerprinted differently in next process
+        self.is_reliable = True
+
+        self.update(
+            __version__,
+            f"{sys.version_info.major}.{sys.version_info.minor}",
+            str(marshal.version),
+        )
+        for library in self._LIBRARIES:
+            try:
+                self.update(library, importlib.metadata.version(library))
+            except importlib.metadata.PackageNotFoundError:
+                self.update(library, None)
+
+    def update(self, *values: str | bytes | None):
+        for value in values:
+            if value is None:
+                self._hash.update(b"\1")
+            else:
+                self._hash.update(
+                    value.encode("utf-8") if isinstance(value, str) else value
+                )
+            self._hash.update(b"\0")
+
+    def update_source(self, obj: Any):
+        """
+        Adds contents of source file in which function or class was defined. Each
+        file is read only once.
+        """
+        file_path = source_file(obj)
+        if not file_path or file_path in self._source_files:
+            return
+        self._source_files.add(file_path)
+
+        try:
+            data = Path(file_path).read_bytes()
+        except OSError:
+            # Changes of this file couldn't invalidate fingerprint
+            self.is_reliable = False
+            data = None
+        self.update(hashlib.sha256(data).hexdigest() if data is not None else None)
+
+    def repr(self, obj: Any) -> str:
+        """
+        `repr(obj)`, to be used as fingerprint input. Marks fingerprint as not
+        reliable if it contains memory address, which changes between processes.
+        """
+        retv = repr(obj)
+        if self._MEMORY_ADDRESS.search(retv):
+            self.is_reliable = False
+        return retv
+
+    def update_config(
+        self,
+        config: Mapping[str, Any],
+        env: jinja2.Environment,
+        templates: Iterable[str],
+    ):
+        """
+        Adds `repr()` of values of config keys that Jinja templates read
+        (`config.KEY`, `config["KEY"]`, `config.get("KEY")`). If some template uses
+        `config` in any other way, all of config is added. Config that affects URLs
+        built by templates is always added.
+        """
+        keys = set(self._URL_CONFIG_KEYS)
+        for template in templates:
+            template_keys = _config_keys(env, template)
+            if template_keys is None:
+                keys = config.keys()
+                break
+            keys |= template_keys
+
+        for key in sorted(keys, key=repr):
+            self.update(self.repr(key), self.repr(config.get(key)))
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def _config_keys(env: jinja2.Environment, template: str) -> set[str] | None:
+    """
+    Keys of `config` read by template, or None if they can't be determined.
+    """
+    if "config" not in template:
+        return set()
+
+    try:
+        ast = env.parse(template)
+    except jinja2.TemplateSyntaxError:
+        return None
+
+    keys = set()
+    lookups = set()
+    for call in ast.find_all(nodes.Call):
+        lookup = call.node
+        if (
+            _is_config(lookup)
+            and lookup.attr == "get"
+            and call.args
+            and isinstance(call.args[0], nodes.Const)
+        ):
+            keys.add(call.args[0].value)
+            lookups.add(id(lookup))
+
+    for lookup in ast.find_all((nodes.Getattr, nodes.Getitem)):
+        if not _is_config(lookup) or id(lookup) in lookups:
+            continue
+        if isinstance(lookup, nodes.Getattr) and not hasattr(dict, lookup.attr):
+            keys.add(lookup.attr)
+        elif isinstance(lookup, nodes.Getitem) and isinstance(lookup.arg, nodes.Const):
+            keys.add(lookup.arg.value)
+        else:
+            return None
+        lookups.add(id(lookup))
+
+    config_names = [_ for _ in ast.find_all(nodes.Name) if _.name == "config"]
+    if len(config_names) != len(lookups):
+        # `config` passed around as a whole
+        return None
+
+    return keys
+
+
+def _is_config(node: nodes.Node) -> bool:
+    return (
+        isinstance(node, (nodes.Getattr, nodes.Getitem))
+        and isinstance(node.node, nodes.Name)
+        and node.node.name == "config"
+    )
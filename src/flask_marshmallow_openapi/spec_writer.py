@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import warnings
+from collections.abc import Callable
+from typing import IO, TYPE_CHECKING, Any, Final
+
+import yaml
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+if TYPE_CHECKING:
+    from collections.abc import Generator, Iterable
+
+#: Approximate size of chunks generated by `iter_json`
+CHUNK_SIZE: Final[int] = 64 * 1024
+
+# How deep into spec to split JSON into separately encoded pieces. Depth 3 encodes
+# each of path items and each of components separately.
+_JSON_SPLIT_DEPTH: Final[int] = 3
+
+_INDENT: Final[bytes] = b"  "
+
+# libyaml based dumper is much faster than pure Python one and gives the same output.
+# Not the safe one, apispec dumps with default dumper which also represents ie.
+# Decimal and frozenset.
+_YAML_DUMPER: Final = getattr(yaml, "CDumper", yaml.Dumper)
+
+#: Function that serializes object into UTF-8 encoded JSON, either compact or
+#: (with `indent=True`) indented with 2 spaces.
+JSONDumps = Callable[..., bytes]
+
+
+def stdlib_json_dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    Python's `json.dumps` with its default options: output is ASCII, with other
+    characters `\\uXXXX` escaped.
+    """
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def orjson_json_dumps(obj: Any, *, indent: bool = False) -> bytes:
+    return orjson.dumps(
+        obj, option=orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+    )
+
+
+# Separators between object items and between keys and values, in compact JSON
+_COMPACT_SEPARATORS: Final[dict[JSONDumps, tuple[bytes, bytes]]] = {
+    stdlib_json_dumps: (b", ", b": "),
+    orjson_json_dumps: (b",", b":"),
+}
+
+
+def json_backend(name: str = "stdlib") -> JSONDumps:
+    """
+    JSON serialization function for given backend name.
+
+    - "stdlib" - Python's `json` module, with its default options
+    - "orjson" - `orjson` package, installed by `flask-marshmallow-openapi[orjson]`.
+      If it is not installed, "stdlib" is used instead, with `RuntimeWarning`.
+
+    Backends don't produce the same bytes. orjson writes UTF-8 instead of `\\uXXXX`
+    escapes, compact JSON without spaces after separators and some values differently
+    (ie. floats in exponent notation, `1e16` instead of `1e+16`).
+    """
+    if name == "stdlib":
+        return stdlib_json_dumps
+
+    if name == "orjson":
+        if not orjson:
+            msg = 'JSON backend "orjson" is not installed, using "stdlib" instead!'
+            warnings.warn(msg, RuntimeWarning, stacklevel=2)
+            return stdlib_json_dumps
+        return orjson_json_dumps
+
+    msg = f'Unsupported JSON backend "{name}"!'
+    raise ValueError(msg)
+
+
+def iter_json(
+    spec: dict, *, indent: bool = False, dumps: JSONDumps = stdlib_json_dumps
+) -> Generator[bytes, None, None]:
+    """
+    Serializes spec into UTF-8 encoded JSON, in chunks of about `CHUNK_SIZE` bytes.
+
+    Output is the same as the one of `dumps(spec, indent=indent)`, but whole document
+    is never held in memory. Spec is encoded piece by piece (each of path items and
+    components separately) so fast, one-shot encoders can still be used.
+    """
+    return _coalesce(
+        _iter_json(spec, _JSON_SPLIT_DEPTH, dumps, indent=indent, level=0), CHUNK_SIZE
+    )
+
+
+def dump_yaml(spec: dict) -> str:
+    """
+    Serializes spec into YAML. Output is the same as `apispec.APISpec.to_yaml()`
+    would return.
+    """
+    return yaml.dump(spec, Dumper=_YAML_DUMPER, sort_keys=False)
+
+
+class HashingWriter:
+    """
+    Binary file wrapper that calculates SHA256 digest of everything written through
+    it. Accepts both `str` and `bytes`.
+    """
+
+    def __init__(self, f: IO[bytes]):
+        self.f = f
+        self._hash = hashlib.sha256()
+
+    def write(self, data: str | bytes) -> int:
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        self._hash.update(data)
+        return self.f.write(data)
+
+    def flush(self):
+        self.f.flush()
+
+    def hexdigest(self) -> str:
+        return self._hash.hexdigest()
+
+
+def write_json(
+    spec: dict,
+    f: IO[bytes],
+    *,
+    indent: bool = True,
+    dumps: JSONDumps = stdlib_json_dumps,
+) -> str:
+    """
+    Writes spec as JSON into binary file, chunk by chunk.
+
+    Returns SHA256 digest of written data.
+    """
+    writer = HashingWriter(f)
+    for chunk in iter_json(spec, indent=indent, dumps=dumps):
+        writer.write(chunk)
+    return writer.hexdigest()
+
+
+def write_yaml(spec: dict, f: IO[bytes]) -> str:
+    """
+    Writes spec as YAML into binary file, as it is being emitted. Output is the same
+    as the one of `dump_yaml()`.
+
+    Returns SHA256 digest of written data.
+    """
+    writer = HashingWriter(f)
+    yaml.dump(spec, stream=writer, Dumper=_YAML_DUMPER, sort_keys=False)
+    return writer.hexdigest()
+
+
+def _iter_json(
+    obj: Any, depth: int, dumps: JSONDumps, *, indent: bool, level: int
+) -> Generator[bytes, None, None]:
+    if not (depth and isinstance(obj, dict) and obj) or not all(
+        isinstance(_, str) for _ in obj
+    ):
+        data = dumps(obj, indent=indent)
+        if indent and level:
+            # JSON strings can't contain raw newlines, so this only indents lines
+            data = data.replace(b"\n", b"\n" + _INDENT * level)
+        yield data
+        return
+
+    if indent:
+        item_separator = b","
+        item_prefix = b"\n" + _INDENT * (level + 1)
+        key_separator = b": "
+    else:
+        item_separator, key_separator = _COMPACT_SEPARATORS.get(
+            dumps, _COMPACT_SEPARATORS[stdlib_json_dumps]
+        )
+        item_prefix = b""
+
+    yield b"{"
+    for i, (key, value) in enumerate(obj.items()):
+        yield (item_separator if i else b"") + item_prefix + dumps(key) + key_separator
+        yield from _iter_json(value, depth - 1, dumps, indent=indent, level=level + 1)
+    yield (b"\n" + _INDENT * level if indent else b"") + b"}"
+
+
+def _coalesce(chunks: Iterable[bytes], size: int) -> Generator[bytes, None, None]:
+    buffer: list[bytes] = []
+    buffered = 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        buffered += len(chunk)
+        if buffered >= size:
+            yield b"".join(buffer)
+            buffer = []
+            buffered = 0
+    if buffer:
+        yield b"".join(buffer)
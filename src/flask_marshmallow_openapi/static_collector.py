@@ -1,44 +1,119 @@
 from __future__ import annotations
 
+import fnmatch
 import hashlib
 import json
 import os
 import shutil
-from pathlib import Path
-from typing import TYPE_CHECKING
+from pathlib import Path, PurePosixPath
+from typing import TYPE_CHECKING, Final
 
 import flask
 from flask import current_app
 
+from .compression import is_compressible, write_gzip_sibling
+from .spec_shards import SHARDS_INDEX, shard_slugs, split_by_tag
+from .spec_writer import write_json, write_yaml
+
 if TYPE_CHECKING:
+    from collections.abc import Callable
+
     from .middleware import OpenAPI
 
 # TODO: This shouldn't be needed once we can fully rely on importlib.resources
 _SELF_PATH = Path(os.path.abspath(os.path.dirname(__file__)))
 
+#: Static files that aren't referenced by any of our templates: source maps and
+#: SwaggerUI bundle variants and example pages. Paths are relative to "static/".
+UNUSED_STATIC: Final[tuple[str, ...]] = (
+    "*.map",
+    "swagger_ui/index.html",
+    "swagger_ui/swagger-initializer.js",
+    "swagger_ui/swagger-ui.js",
+    "swagger_ui/swagger-ui-es-bundle*.js",
+)
+
+# Records size, mtime and digest of each of copied static files so that unchanged
+# ones can be skipped on next run, and digest of content from which their `.gz`
+# siblings were compressed
+_STATIC_MANIFEST: Final[str] = ".collect_static.json"
+
+# Records digest of content from which `.gz` siblings of generated files (HTML, spec)
+# were compressed, by paths of these files relative to "docs/"
+_GENERATED_MANIFEST: Final[str] = ".collect_generated.json"
+
+#: Maps names of collected static files to their content hashed names
+ASSET_MANIFEST: Final[str] = "asset_manifest.json"
+
+# Number of digest characters in content hashed file names
+_HASHED_NAME_DIGEST_LENGTH: Final[int] = 12
+
+
+def asset_url_builder(
+    asset_names: dict[str, str] | None = None,
+) -> Callable[[str], str]:
+    """
+    Returns `asset_url(filename)` function for templates, that builds URL of our
+    static file, using its content hashed name if there is one in `asset_names`.
+    """
+    asset_names = asset_names or {}
+
+    def asset_url(filename: str) -> str:
+        return flask.url_for(
+            "open_api.static", filename=asset_names.get(filename, filename)
+        )
+
+    return asset_url
+
 
 class StaticResourcesCollector:
-    def __init__(
+    def __init__(  # noqa: PLR0913, keyword-only options of OpenAPI.collect_static
         self,
         open_api: OpenAPI,
         destination_dir: str | Path,
         *,
         cache_bust_swagger_json: bool = True,
+        gzip_static: bool = True,
+        hardlink_static: bool = False,
+        exclude_unused_static: bool = False,
+        cache_bust_static: bool = False,
     ):
         self.open_api = open_api
         self.destination_dir = Path(destination_dir) / "docs"
         self.docs_static = self.destination_dir / "static"
         self.cache_bust_swagger_json = cache_bust_swagger_json
+        self.gzip_static = gzip_static
+        self.hardlink_static = hardlink_static
+        self.exclude_unused_static = exclude_unused_static
+        self.cache_bust_static = cache_bust_static
+        # Collected files with content hashed names, see ASSET_MANIFEST
+        self.asset_names: dict[str, str] = {}
+        # Entries of _STATIC_MANIFEST for collected static files, by their names
+        self.static_manifest: dict[str, dict] = {}
 
     def collect(self):
         os.makedirs(self.docs_static, exist_ok=True)
+        # Static files go first, so their content hashed names are known when
+        # rendering HTML
+        self._copy_src_static_folder()
         with current_app.test_request_context():
             # Do this so url_for generates correct URLs
             swagger_json_url, swagger_json_disk_path = self._write_swagger_json()
+            shards_urls = (
+                self._write_swagger_json_shards()
+                if self.open_api.config.shard_spec_by_tag
+                else None
+            )
             self._write_redoc_html(swagger_json_url)
-            self._write_swagger_ui_html(swagger_json_url)
+            self._write_swagger_ui_html(swagger_json_url, shards_urls)
             self._write_changelog_html()
-        self._copy_src_static_folder()
+        if self.cache_bust_static:
+            self._write_asset_manifest()
+        else:
+            (self.docs_static / ASSET_MANIFEST).unlink(missing_ok=True)
+        if self.gzip_static:
+            self._write_gzip_siblings()
+        self._write_static_manifest()
 
         return swagger_json_disk_path
 
@@ -46,23 +121,25 @@ class StaticResourcesCollector:
         swagger_json_filename = None
         swagger_json_disk_path = None
 
+        spec = self.open_api._to_dict
+
         for ext in ["json", "yaml"]:
-            with open(self.docs_static / "open_api_spec.tmp", "w") as f:
+            # Spec is written in chunks and hashed while being written
+            with (self.docs_static / "open_api_spec.tmp").open("wb") as f:
                 if ext == "json":
-                    json.dump(self.open_api._to_dict, f, indent=2)
+                    digest = write_json(spec, f, dumps=self.open_api._json_dumps)
                 else:
-                    f.write(self.open_api._to_yaml)
+                    digest = write_yaml(spec, f)
 
-            digest = (
-                _file_checksum(self.docs_static / "open_api_spec.tmp", hashlib.sha256)
-                if self.cache_bust_swagger_json
-                else None
-            )
+            if not self.cache_bust_swagger_json:
+                digest = None
             dest = f"swagger_{digest}.{ext}" if digest else f"swagger.{ext}"
 
             if ext == "json":
                 swagger_json_filename = dest
                 swagger_json_disk_path = self.docs_static / dest
+            if digest:
+                self.asset_names[f"swagger.{ext}"] = dest
 
             os.rename(self.docs_static / "open_api_spec.tmp", self.docs_static / dest)
 
@@ -72,20 +149,55 @@ class StaticResourcesCollector:
 
         return new_swagger_json_path, swagger_json_disk_path
 
+    def _write_swagger_json_shards(self) -> list[dict[str, str]]:
+        shards_dir = self.docs_static / "swagger"
+        shards_dir.mkdir(parents=True, exist_ok=True)
+
+        shards = split_by_tag(self.open_api._to_dict)
+        shards_urls = []
+        # Relative to index itself, the same as in served index
+        shards_index = []
+        for tag, slug in shard_slugs(list(shards)).items():
+            with (shards_dir / "open_api_spec.tmp").open("wb") as f:
+                digest = write_json(shards[tag], f, dumps=self.open_api._json_dumps)
+            dest = (
+                f"{slug}_{digest}.json"
+                if self.cache_bust_swagger_json
+                else f"{slug}.json"
+            )
+            (shards_dir / "open_api_spec.tmp").replace(shards_dir / dest)
+            shards_urls.append(
+                {
+                    "url": flask.url_for("open_api.static", filename=f"swagger/{dest}"),
+                    "name": tag,
+                }
+            )
+            shards_index.append({"url": dest, "name": tag})
+
+        (shards_dir / f"{SHARDS_INDEX}.json").write_bytes(
+            self.open_api._json_dumps(shards_index, indent=True)
+        )
+
+        return shards_urls
+
     def _write_redoc_html(self, swagger_json_url):
         page = flask.render_template(
             "re_doc.jinja2",
             swagger_json_path=swagger_json_url,
             api_name=self.open_api.config.api_name,
+            asset_url=asset_url_builder(self.asset_names),
         )
         with open(self.destination_dir / "re_doc.html", "w") as f:
             f.write(page)
 
-    def _write_swagger_ui_html(self, swagger_json_url):
+    def _write_swagger_ui_html(self, swagger_json_url, shards_urls=None):
         page = flask.render_template(
             "swagger_ui.jinja2",
             **self.open_api._swagger_ui_template_config(
-                config_overrides={"url": swagger_json_url}
+                config_overrides=(
+                    {"urls": shards_urls} if shards_urls else {"url": swagger_json_url}
+                ),
+                asset_names=self.asset_names,
             ),
         )
         with open(self.destination_dir / "swagger_ui.html", "w") as f:
@@ -103,18 +215,168 @@ class StaticResourcesCollector:
             f.write(page)
 
     def _copy_src_static_folder(self):
+        """
+        Copies (or hardlinks) our static files into `docs_static`.
+
+        Files that are unchanged since previous run, according to manifest written by
+        it, are skipped. Files collected by previous run that are no longer collected
+        (ie. because they are now excluded) are removed.
+        """
         # TODO: "../static/" should really be handled by importlib.resources but that
         # doesn't support extracting directories from package, only individual files.
-        shutil.copytree(_SELF_PATH / "static", self.docs_static, dirs_exist_ok=True)
+        src_dir = _SELF_PATH / "static"
+        old_manifest = _load_manifest(self.destination_dir / _STATIC_MANIFEST)
+        new_manifest = self.static_manifest = {}
+
+        for src_path in sorted(src_dir.rglob("*")):
+            if not src_path.is_file():
+                continue
+            name = src_path.relative_to(src_dir).as_posix()
+            if self.exclude_unused_static and _is_unused_static(name):
+                continue
+
+            stat = src_path.stat()
+            old_entry = old_manifest.get(name)
+            entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+            if old_entry and all(old_entry.get(k) == v for k, v in entry.items()):
+                entry["sha256"] = old_entry["sha256"]
+            else:
+                with src_path.open("rb") as f:
+                    entry["sha256"] = hashlib.file_digest(f, "sha256").hexdigest()
+            if old_entry and "gzip_sha256" in old_entry:
+                entry["gzip_sha256"] = old_entry["gzip_sha256"]
+            new_manifest[name] = entry
+
+            dest_path = self.docs_static / name
+            if not (
+                old_entry
+                and old_entry.get("sha256") == entry["sha256"]
+                and dest_path.is_file()
+                and dest_path.stat().st_size == entry["size"]
+            ):
+                self._install_static_file(src_path, dest_path)
+
+            if self.cache_bust_static:
+                hashed_name = _hashed_name(name, entry["sha256"])
+                entry["hashed_name"] = hashed_name
+                self.asset_names[name] = hashed_name
+                if not (self.docs_static / hashed_name).is_file():
+                    self._install_static_file(src_path, self.docs_static / hashed_name)
+
+        self._remove_stale_static_files(old_manifest)
+
+    def _remove_stale_static_files(self, old_manifest: dict[str, dict]):
+        """Removes files collected by previous run that are no longer collected."""
+        collected = set(self.static_manifest) | {
+            _["hashed_name"]
+            for _ in self.static_manifest.values()
+            if "hashed_name" in _
+        }
+        for name, old_entry in old_manifest.items():
+            for stale_name in (name, old_entry.get("hashed_name")):
+                if stale_name and stale_name not in collected:
+                    dest_path = self.docs_static / stale_name
+                    dest_path.unlink(missing_ok=True)
+                    _gzip_sibling(dest_path).unlink(missing_ok=True)
+
+    def _write_static_manifest(self):
+        with (self.destination_dir / _STATIC_MANIFEST).open("w") as f:
+            json.dump(self.static_manifest, f, indent=2, sort_keys=True)
+
+    def _write_asset_manifest(self):
+        with (self.docs_static / ASSET_MANIFEST).open("w") as f:
+            json.dump(self.asset_names, f, indent=2, sort_keys=True)
+
+    def _install_static_file(self, src_path: Path, dest_path: Path):
+        dest_path.parent.mkdir(parents=True, exist_ok=True)
+        # Never write into existing file, it could be hardlink to previous version of
+        # our package's file
+        dest_path.unlink(missing_ok=True)
+        _gzip_sibling(dest_path).unlink(missing_ok=True)
+
+        if self.hardlink_static:
+            try:
+                os.link(src_path, dest_path)
+            except OSError:
+                # ie. destination is on different filesystem
+                pass
+            else:
+                return
+
+        shutil.copy2(src_path, dest_path)
+
+    def _write_gzip_siblings(self):
+        """
+        Writes `.gz` sibling of each compressible collected file.
+
+        Siblings are written only if the digest of content they were compressed from
+        isn't the current one. For static files that digest is recorded in static
+        manifest. Generated files (HTML, spec) are rewritten on each run, so their
+        digests are computed here and recorded in a manifest of their own.
+        """
+        static_entries = {}
+        for name, entry in self.static_manifest.items():
+            for _ in (name, entry.get("hashed_name")):
+                if _:
+                    static_entries[self.docs_static / _] = entry
+        old_generated = _load_manifest(self.destination_dir / _GENERATED_MANIFEST)
+        generated = {}
+        manifests = {
+            self.destination_dir / _STATIC_MANIFEST,
+            self.destination_dir / _GENERATED_MANIFEST,
+        }
+
+        for path in sorted(self.destination_dir.rglob("*")):
+            if not (path.is_file() and is_compressible(path)) or path in manifests:
+                continue
+
+            entry = static_entries.get(path)
+            if entry is None:
+                name = path.relative_to(self.destination_dir).as_posix()
+                with path.open("rb") as f:
+                    digest = hashlib.file_digest(f, "sha256").hexdigest()
+                entry = generated[name] = {"sha256": digest}
+                old_entry = old_generated.get(name)
+                if old_entry and "gzip_sha256" in old_entry:
+                    entry["gzip_sha256"] = old_entry["gzip_sha256"]
+
+            if (
+                entry.get("gzip_sha256") == entry["sha256"]
+                and _gzip_sibling(path).is_file()
+            ):
+                continue
+
+            write_gzip_sibling(path)
+            entry["gzip_sha256"] = entry["sha256"]
+
+        with (self.destination_dir / _GENERATED_MANIFEST).open("w") as f:
+            json.dump(generated, f, indent=2, sort_keys=True)
+
+
+def _is_unused_static(name: str) -> bool:
+    return any(fnmatch.fnmatchcase(name, _) for _ in UNUSED_STATIC)
+
+
+def _hashed_name(name: str, digest: str) -> str:
+    """
+    Example: "swagger_ui/swagger-ui.css" -> "swagger_ui/swagger-ui.0123456789ab.css"
+    """
+    path = PurePosixPath(name)
+    return str(
+        path.with_name(
+            f"{path.stem}.{digest[:_HASHED_NAME_DIGEST_LENGTH]}{path.suffix}"
+        )
+    )
+
 
+def _gzip_sibling(path: Path) -> Path:
+    return path.with_name(path.name + ".gz")
 
-def _file_checksum(file_path: str | Path, hashlib_callable):
-    """Given path of the file and hash function, calculates file digest"""
-    if os.path.isfile(file_path) and callable(hashlib_callable):
-        hash_obj = hashlib_callable()
-        with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_obj.update(chunk)
-        return hash_obj.hexdigest()
 
-    return None
+def _load_manifest(manifest_path: Path) -> dict[str, dict]:
+    try:
+        with manifest_path.open() as f:
+            retv = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return retv if isinstance(retv, dict) else {}
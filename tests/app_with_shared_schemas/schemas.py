@@ -0,0 +1,8 @@
+import marshmallow as ma
+
+from ..shared_lib.schemas import ErrorSchema
+
+
+class OrderSchema(ma.Schema):
+    id = ma.fields.Integer(as_string=True)
+    error = ma.fields.Nested(ErrorSchema)
@@ -1 +1,36 @@
+# https://docs.pytest.org/en/latest/goodpractices.html#choosing-a-test-layout-import-rules
 # from .factories import *
+
+import pytest
+
+from flask_marshmallow_openapi import OpenAPI, OpenAPISettings
+
+from .example_api import create_app
+
+
+@pytest.fixture
+def open_api_settings():
+    return OpenAPISettings(
+        api_name="Example API",
+        api_version="v1",
+        app_package_name="tests.example_api",
+        mounted_at="/v1",
+        changelog_md_loader=lambda: "# CHANGELOG\n",
+    )
+
+
+@pytest.fixture
+def app(open_api_settings):
+    app = create_app()
+    OpenAPI(config=open_api_settings).init_app(app)
+    return app
+
+
+@pytest.fixture
+def open_api(app):
+    return app.extensions["open_api"]
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
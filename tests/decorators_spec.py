@@ -0,0 +1,36 @@
+from flask_marshmallow_openapi import open_api
+from flask_marshmallow_openapi.flask_paths import FlaskPathsManager
+
+from .example_api.schemas import BookCreateSchema, BookSchema, BookUpdateSchema
+
+
+class DescribeDecorators:
+    def it_attaches_docs_without_wrapping_view_function(self):
+        def view():
+            pass
+
+        decorated = open_api.get_list(BookSchema)(view)
+
+        assert decorated is view
+        assert FlaskPathsManager.operation_docs(view).operationId == ("book_list")
+
+    def it_merges_tags_of_request_and_response_schemas_in_declaration_order(self):
+        def view():
+            pass
+
+        created = open_api.post(BookCreateSchema, BookSchema)(view)
+        assert FlaskPathsManager.operation_docs(created).tags == [
+            "Books",
+            "Inventory",
+            "Catalogue",
+        ]
+
+        def other_view():
+            pass
+
+        updated = open_api.patch(BookUpdateSchema, BookSchema)(other_view)
+        assert FlaskPathsManager.operation_docs(updated).tags == [
+            "Books",
+            "Catalogue",
+            "Inventory",
+        ]
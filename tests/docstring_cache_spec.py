@@ -0,0 +1,50 @@
+from flask_marshmallow_openapi import OpenAPI, docstring_cache
+from flask_marshmallow_openapi.docstring_cache import DocstringCache
+
+from .example_api import create_app
+
+DOCSTRING = """
+    description: |
+        Some description
+    """
+
+
+class DescribeDocstringCache:
+    def it_parses_docstring_only_once_across_restarts(self, tmp_path, monkeypatch):
+        calls = []
+        parse_docstring = docstring_cache.parse_docstring
+
+        def counting_parse_docstring(docstring):
+            calls.append(docstring)
+            return parse_docstring(docstring)
+
+        monkeypatch.setattr(
+            docstring_cache, "parse_docstring", counting_parse_docstring
+        )
+
+        cache = DocstringCache(tmp_path / "docstrings.marshal")
+        assert cache.parse(DOCSTRING) == {"description": "Some description\n"}
+        cache.save()
+
+        cache = DocstringCache(tmp_path / "docstrings.marshal")
+        assert cache.parse(DOCSTRING) == {"description": "Some description\n"}
+
+        assert len(calls) == 1
+
+    def it_ignores_broken_cache_file(self, tmp_path):
+        (tmp_path / "docstrings.marshal").write_bytes(b"definitely not marshal data")
+
+        cache = DocstringCache(tmp_path / "docstrings.marshal")
+
+        assert cache.parse(DOCSTRING) == {"description": "Some description\n"}
+
+    def it_is_used_by_spec_build(self, open_api_settings, open_api, tmp_path):
+        open_api_settings.docstring_cache_dir = tmp_path
+        cached = OpenAPI(config=open_api_settings)
+        cached.init_app(create_app())
+
+        assert list(tmp_path.glob("docstrings-*.marshal"))
+        assert (
+            cached._to_dict["paths"]["/v1/books"]["get"]["description"]
+            == open_api._to_dict["paths"]["/v1/books"]["get"]["description"]
+        )
@@ -0,0 +1,17 @@
+"""
+Small Flask API used as fixture by tests.
+
+It exercises most of decorator features: list and detail GET routes, POST, PATCH and
+DELETE routes, `MethodView` routes, nested schemas, URL parameters and YAML docstrings.
+"""
+
+import flask
+
+from . import reviews, schemas, views
+from .views import api
+
+
+def create_app() -> flask.Flask:
+    app = flask.Flask(__name__)
+    app.register_blueprint(api, url_prefix="/v1")
+    return app
@@ -0,0 +1,11 @@
+import marshmallow as ma
+
+from flask_marshmallow_openapi import register_schema
+
+
+# Not used by any view, so it has to be registered to be documented
+@register_schema
+class ReviewSchema(ma.Schema):
+    id = ma.fields.Integer(as_string=True)
+    rating = ma.fields.Integer(metadata={"description": "From 1 to 5"})
+    text = ma.fields.String()
@@ -0,0 +1,72 @@
+import marshmallow as ma
+
+
+class SchemaOpts(ma.SchemaOpts):
+    def __init__(self, meta, *args, **kwargs):
+        self.tags = getattr(meta, "tags", [])
+        self.x_tags = getattr(meta, "x_tags", None)
+        self.url_id_field = getattr(meta, "url_id_field", None)
+        self.url_parameters = getattr(meta, "url_parameters", None)
+        super().__init__(meta, *args, **kwargs)
+
+
+class PublisherSchema(ma.Schema):
+    OPTIONS_CLASS = SchemaOpts
+
+    class Meta:
+        tags = ["Publishers"]
+        x_tags = ["Publishers"]
+        url_parameters = [
+            {
+                "name": "id",
+                "in": "path",
+                "required": True,
+                "allowEmptyValue": False,
+                "schema": {"type": "string", "format": "ULID"},
+            }
+        ]
+
+    id = ma.fields.String()
+    name = ma.fields.String(metadata={"description": "Publisher's name"})
+
+
+class AuthorSchema(ma.Schema):
+    OPTIONS_CLASS = SchemaOpts
+
+    class Meta:
+        tags = ["Authors", "Books"]
+
+    id = ma.fields.Integer(as_string=True)
+    name = ma.fields.String(required=True)
+
+
+class BookSchema(ma.Schema):
+    OPTIONS_CLASS = SchemaOpts
+
+    class Meta:
+        tags = ["Books", "Catalogue", "Inventory"]
+        url_id_field = "book_id"
+
+    id = ma.fields.Integer(as_string=True)
+    title = ma.fields.String(allow_none=False)
+    authors = ma.fields.List(ma.fields.Nested(AuthorSchema))
+    publisher = ma.fields.Nested(PublisherSchema)
+
+
+class BookCreateSchema(ma.Schema):
+    OPTIONS_CLASS = SchemaOpts
+
+    class Meta:
+        tags = ["Books", "Inventory"]
+
+    title = ma.fields.String(required=True)
+    publisher = ma.fields.Nested(PublisherSchema)
+
+
+class BookUpdateSchema(ma.Schema):
+    OPTIONS_CLASS = SchemaOpts
+
+    class Meta:
+        tags = ["Books", "Catalogue"]
+
+    title = ma.fields.String()
@@ -0,0 +1,103 @@
+import flask
+import flask.views
+
+from flask_marshmallow_openapi import Securities, open_api
+
+from .schemas import (
+    AuthorSchema,
+    BookCreateSchema,
+    BookSchema,
+    BookUpdateSchema,
+    PublisherSchema,
+)
+
+api = flask.Blueprint("example_api", __name__)
+
+
+@api.route("/books", methods=["GET"])
+@open_api.get_list(BookSchema, errors={401: "Not logged in!"})
+def books_list():
+    """
+    description: |
+        Lists books in {{ config.get("CATALOGUE_NAME", "catalogue") }}.
+
+        | foo | bar |
+        | --- | --- |
+        | 1   | 2   |
+    """
+    return flask.jsonify([])
+
+
+@api.route("/books/<int:book_id>", methods=["GET"])
+@open_api.get_detail(BookSchema)
+def books_detail(book_id):
+    """Single book details."""
+    return flask.jsonify({})
+
+
+@api.route("/books", methods=["POST"])
+@open_api.post(BookCreateSchema, BookSchema, errors={409: "Title must be unique!"})
+def books_create():
+    return flask.jsonify({})
+
+
+@api.route("/books/<int:book_id>", methods=["PATCH"])
+@open_api.patch(BookUpdateSchema, BookSchema)
+def books_update(book_id):
+    return flask.jsonify({})
+
+
+@api.route("/books/<int:book_id>", methods=["DELETE"])
+@open_api.delete(BookSchema)
+def books_delete(book_id):
+    return flask.jsonify({})
+
+
+@api.route("/books/<int:book_id>/cover", methods=["GET"])
+@open_api.get(
+    BookSchema,
+    operation_id="book_detail",
+    summary="Book cover",
+    is_list=False,
+    has_id_in_path=True,
+    security=Securities.no_token,
+)
+def books_cover(book_id):
+    return flask.jsonify({})
+
+
+class PublishersView(flask.views.MethodView):
+    @open_api.get_list(PublisherSchema)
+    def get(self):
+        """
+        get:
+            summary: Publishers listing
+            description: All publishers
+        """
+        return flask.jsonify([])
+
+    @open_api.post(PublisherSchema, security=Securities.refresh_token)
+    def post(self):
+        return flask.jsonify({})
+
+
+api.add_url_rule("/publishers", view_func=PublishersView.as_view("publishers"))
+
+
+@api.route("/authors", methods=["GET"])
+@open_api.get_list(AuthorSchema)
+def authors_list():
+    return flask.jsonify([])
+
+
+@api.route("/health_check", methods=["GET"])
+def health_check():
+    """
+    description: Undecorated, but documented via docstring
+    """
+    return flask.jsonify({})
+
+
+@api.route("/internal/ping", methods=["GET"])
+def internal_ping():
+    return "pong"
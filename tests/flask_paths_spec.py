@@ -0,0 +1,256 @@
+import re
+
+import flask
+import flask.views
+import pytest
+
+from flask_marshmallow_openapi import flask_paths, open_api
+from flask_marshmallow_openapi.flask_paths import FlaskPathsManager
+
+from .example_api.schemas import BookSchema
+
+
+@pytest.fixture
+def paths_manager():
+    return FlaskPathsManager(flask.Flask(__name__))
+
+
+def _register(paths_manager, operation_ids):
+    retv = []
+    for operation_id in operation_ids:
+        operation = {"operationId": operation_id}
+        paths_manager._register_operation_id(operation)
+        retv.append(operation["operationId"])
+    return retv
+
+
+def _register_with_regex_scan(operation_ids):
+    # Reference, former implementation of FlaskPathsManager._register_operation_id
+    encountered = set()
+    retv = []
+    for base in operation_ids:
+        operation_id = base
+        if operation_id in encountered:
+            operation_id += "_" + str(
+                len([_ for _ in encountered if re.match(base + r"[_0-9]*$", _)])
+            )
+        encountered.add(operation_id)
+        retv.append(operation_id)
+    return retv
+
+
+class DescribeOperationIdsDeduplication:
+    def it_assigns_same_suffixes_as_regex_scan(self, paths_manager):
+        operation_ids = [
+            "book_list",
+            "book_list",
+            "book_detail",
+            "book_list",
+            "book_list_1",
+            "book_list_1",
+            "book_detail",
+            "book_list",
+            "get_books",
+            "get_books2",
+            "get_books",
+        ]
+
+        assert _register(paths_manager, operation_ids) == _register_with_regex_scan(
+            operation_ids
+        )
+
+    def it_never_assigns_duplicate_ids(self, paths_manager):
+        operation_ids = ["foo", "foo_2", "foo", "foo", "foo"]
+
+        registered = _register(paths_manager, operation_ids)
+
+        assert len(set(registered)) == len(registered)
+
+    def it_suffixes_many_colliding_ids(self, paths_manager):
+        count = 10_000
+
+        registered = _register(paths_manager, ["get_foo"] * count)
+
+        assert registered == ["get_foo"] + [f"get_foo_{i}" for i in range(1, count)]
+
+    def it_does_constant_work_per_operation(self, paths_manager, monkeypatch):
+        lookups = 0
+
+        class CountingSet(set):
+            def __contains__(self, item):
+                nonlocal lookups
+                lookups += 1
+                return super().__contains__(item)
+
+        prefixes = 0
+        original = flask_paths._operation_id_prefixes
+
+        def counting_prefixes(operation_id):
+            nonlocal prefixes
+            for prefix in original(operation_id):
+                prefixes += 1
+                yield prefix
+
+        paths_manager._encountered_operation_ids = CountingSet()
+        monkeypatch.setattr(flask_paths, "_operation_id_prefixes", counting_prefixes)
+
+        # Worst case: every route generates the same operationId
+        count = 10_000
+        _register(paths_manager, ["get_foo"] * count)
+
+        # Former regex scan implementation did ~count / 2 matches per operation
+        assert lookups <= 2 * count
+        assert prefixes <= len(f"get_foo_{count}") * count
+
+
+class DescribeDescriptionsRendering:
+    @pytest.mark.parametrize(
+        "description",
+        ["", "Plain", "Plain\n", "Plain\n\n", "Some\r\nlines\r\n", "{ # }\n", "\r"],
+    )
+    @pytest.mark.parametrize("keep_trailing_newline", [False, True])
+    @pytest.mark.parametrize("newline_sequence", ["\n", "\r\n"])
+    def it_converts_plain_text_same_as_jinja(
+        self, paths_manager, description, keep_trailing_newline, newline_sequence
+    ):
+        env = paths_manager.app.jinja_env
+        env.keep_trailing_newline = keep_trailing_newline
+        env.newline_sequence = newline_sequence
+        with paths_manager.app.test_request_context():
+            expected = flask.render_template_string(description)
+
+        assert paths_manager._render_description(description) == expected
+
+    def it_renders_each_template_once_per_build(self, monkeypatch):
+        app = flask.Flask(__name__)
+        app.config["CATALOGUE_NAME"] = "shop"
+
+        for name in ["foo", "bar", "baz"]:
+
+            def view():
+                """
+                description: Items in {{ config["CATALOGUE_NAME"] }}.
+                """
+
+            app.add_url_rule(f"/{name}", name, view)
+
+        @app.route("/plain")
+        def plain():
+            """
+            description: Nothing to render.
+            """
+
+        rendered = []
+        original = flask.render_template_string
+        monkeypatch.setattr(
+            flask,
+            "render_template_string",
+            lambda source: rendered.append(source) or original(source),
+        )
+
+        docs = dict(FlaskPathsManager(app).collect_endpoints_docs())
+
+        assert rendered == ['Items in {{ config["CATALOGUE_NAME"] }}.']
+        assert docs["/foo"]["get"]["description"] == "Items in shop."
+        assert docs["/baz"]["get"]["description"] == "Items in shop."
+        assert docs["/plain"]["get"]["description"] == "Nothing to render."
+
+
+class DescribeRoutesIndex:
+    @pytest.fixture
+    def app(self):
+        app = flask.Flask(__name__)
+
+        @app.route("/books", methods=["GET", "POST"])
+        @app.route("/v2/books", methods=["GET"])
+        def books():
+            pass
+
+        @app.route("/books/<int:book_id>")
+        @open_api.get_detail(BookSchema)
+        def book(book_id):
+            pass
+
+        class AuthorsView(flask.views.MethodView):
+            @open_api.get_list(BookSchema)
+            def get(self):
+                pass
+
+            def post(self):
+                pass
+
+        app.add_url_rule("/authors", view_func=AuthorsView.as_view("authors"))
+        return app
+
+    def it_finds_rules_handled_by_view_function(self, app):
+        paths_manager = FlaskPathsManager(app)
+
+        assert [
+            _.rule for _ in paths_manager.rules_for(app.view_functions["books"])
+        ] == ["/v2/books", "/books"]
+        assert [
+            _.rule
+            for _ in paths_manager.rules_for(
+                app.view_functions["authors"].view_class.get
+            )
+        ] == ["/authors"]
+        assert paths_manager.rules_for(lambda: None) == []
+
+    def it_indexes_routes_added_after_first_use(self, app):
+        paths_manager = FlaskPathsManager(app)
+        assert "/publishers" not in [_.rule for _ in paths_manager.rules()]
+
+        @app.route("/publishers")
+        @open_api.get_list(BookSchema)
+        def publishers():
+            pass
+
+        assert paths_manager.rules()[-1].rule == "/publishers"
+        assert paths_manager.rules_for(publishers) == [paths_manager.rules()[-1]]
+        assert list(paths_manager.view_functions(paths_manager.rules()[-1])) == [
+            publishers
+        ]
+
+    def it_resolves_views_of_each_route_only_once(self, app, monkeypatch):
+        paths_manager = FlaskPathsManager(app)
+        paths_manager.rules()
+
+        resolved = []
+        resolve_methods = FlaskPathsManager._resolve_methods
+        monkeypatch.setattr(
+            FlaskPathsManager,
+            "_resolve_methods",
+            lambda self, rule: resolved.append(rule.rule)
+            or resolve_methods(self, rule),
+        )
+
+        @app.route("/publishers")
+        def publishers():
+            pass
+
+        paths_manager.rules()
+        paths_manager.rules_for(publishers)
+
+        assert resolved == ["/publishers"]
+
+    def it_looks_for_decorators_docs_only_in_decorated_views(self, app, monkeypatch):
+        looked_up = []
+        operation_docs = FlaskPathsManager.operation_docs
+        monkeypatch.setattr(
+            FlaskPathsManager,
+            "operation_docs",
+            staticmethod(
+                lambda view_func: looked_up.append(view_func.__name__)
+                or operation_docs(view_func)
+            ),
+        )
+
+        docs = dict(FlaskPathsManager(app).collect_endpoints_docs())
+
+        assert sorted(looked_up) == ["book", "get"]
+        assert docs["/books"] == {
+            "get": {"operationId": "get_books_1"},
+            "post": {"operationId": "post_books"},
+        }
+        assert docs["/authors"]["get"]["operationId"] == "book_list"
+        assert docs["/authors"]["post"] == {"operationId": "post_authors"}
@@ -0,0 +1,456 @@
+import gc
+import importlib
+import marshal
+import os
+import sys
+import textwrap
+import threading
+
+import pydantic
+import pytest
+from openapi_pydantic_models import OperationObject
+
+from flask_marshmallow_openapi import OpenAPI, OpenAPISettings
+from flask_marshmallow_openapi.flask_paths import FlaskPathsManager
+from flask_marshmallow_openapi.operation_record import OperationRecord
+
+from .example_api import create_app, views
+
+
+class DescribeLazySpecBuild:
+    @pytest.fixture
+    def lazy_open_api(self, open_api_settings):
+        open_api_settings.lazy_spec_build = True
+        open_api = OpenAPI(config=open_api_settings)
+        open_api.init_app(create_app())
+        return open_api
+
+    def it_doesnt_build_spec_in_init_app(self, lazy_open_api):
+        assert not lazy_open_api._is_spec_built
+        assert lazy_open_api._apispec is None
+
+    def it_builds_spec_on_first_request(self, lazy_open_api, open_api):
+        response = lazy_open_api._app.test_client().get("/v1/docs/static/swagger.json")
+
+        assert response.status_code == 200
+        assert lazy_open_api._is_spec_built
+        assert sorted(response.json["paths"]) == sorted(open_api._to_dict["paths"])
+
+    def it_builds_spec_exactly_once(self, lazy_open_api, monkeypatch):
+        calls = []
+        build_spec = lazy_open_api._build_spec
+
+        def counting_build_spec():
+            calls.append(1)
+            build_spec()
+
+        monkeypatch.setattr(lazy_open_api, "_build_spec", counting_build_spec)
+
+        threads = [
+            threading.Thread(target=lambda: lazy_open_api._to_dict) for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(calls) == 1
+
+
+class DescribeParallelSpecBuild:
+    @pytest.mark.parametrize("executor", ["thread", "process"])
+    def it_builds_same_spec_as_serial_build(
+        self, open_api_settings, open_api, executor
+    ):
+        open_api_settings.spec_build_workers = 2
+        open_api_settings.spec_build_executor = executor
+        parallel = OpenAPI(config=open_api_settings)
+        parallel.init_app(create_app())
+
+        assert parallel._to_dict == open_api._to_dict
+
+
+class DescribeDocstringsValidation:
+    def it_builds_same_spec_as_without_validation(self, open_api_settings, open_api):
+        open_api_settings.validate_docstrings = True
+        validated = OpenAPI(config=open_api_settings)
+        validated.init_app(create_app())
+
+        assert validated._to_dict == open_api._to_dict
+
+    def it_serializes_same_spec_bytes_as_without_validation(
+        self, open_api_settings, monkeypatch
+    ):
+        monkeypatch.setattr(
+            views.books_detail,
+            "__doc__",
+            """
+            responses:
+              "404":
+                description: Not found
+              default:
+                content:
+                  application/json:
+                    schema:
+                      type: object
+                description: Error
+            parameters:
+              - schema:
+                  type: string
+                in: query
+                name: fields
+            summary: Some book
+            """,
+        )
+
+        serialized = {}
+        for validate_docstrings in (True, False):
+            open_api_settings.validate_docstrings = validate_docstrings
+            app = create_app()
+            OpenAPI(config=open_api_settings).init_app(app)
+            client = app.test_client()
+            json_response = client.get("/v1/docs/static/swagger.json")
+            yaml_response = client.get("/v1/docs/static/swagger.yaml")
+            assert json_response.status_code == yaml_response.status_code == 200
+            serialized[validate_docstrings] = (json_response.data, yaml_response.data)
+
+        assert serialized[True] == serialized[False]
+
+    def it_validates_docstrings_only_if_enabled(self, open_api_settings, monkeypatch):
+        monkeypatch.setattr(
+            views.books_detail, "__doc__", "summary: Some book\nnot_a_field: 42"
+        )
+
+        merged = OpenAPI(config=open_api_settings)
+        merged.init_app(create_app())
+        operation = merged._to_dict["paths"]["/v1/books/{book_id}"]["get"]
+        assert operation["summary"] == "Some book"
+        assert operation["not_a_field"] == 42
+
+        open_api_settings.validate_docstrings = True
+        with pytest.raises(pydantic.ValidationError):
+            OpenAPI(config=open_api_settings).init_app(create_app())
+
+    def it_validates_docstrings_in_testing_mode_by_default(
+        self, open_api_settings, monkeypatch
+    ):
+        monkeypatch.setattr(
+            views.books_detail, "__doc__", "summary: Some book\nnot_a_field: 42"
+        )
+        app = create_app()
+        app.testing = True
+
+        assert open_api_settings.validate_docstrings is None
+        with pytest.raises(pydantic.ValidationError):
+            OpenAPI(config=open_api_settings).init_app(app)
+
+
+_WIDGETS_API = {
+    "__init__.py": """
+        import flask
+
+        from . import views
+
+
+        def create_app():
+            app = flask.Flask(__name__)
+            app.register_blueprint(views.api)
+            return app
+    """,
+    "schemas.py": """
+        import marshmallow as ma
+
+
+        class WidgetSchema(ma.Schema):
+            id = ma.fields.Integer()
+
+
+        class GadgetSchema(ma.Schema):
+            id = ma.fields.Integer()
+    """,
+    "views.py": """
+        import flask
+
+        from flask_marshmallow_openapi import open_api
+
+        from .schemas import WidgetSchema
+
+        api = flask.Blueprint("api", __name__)
+
+
+        @api.route("/widgets/<int:widget_id>", methods=["GET"])
+        @open_api.get_detail(WidgetSchema)
+        def widget_detail(widget_id):
+            \"\"\"
+            summary: Old summary
+            \"\"\"
+
+
+        @api.route("/widgets", methods=["GET"])
+        @open_api.get_list(WidgetSchema)
+        def widgets_list():
+            \"\"\"
+            summary: List of widgets
+            \"\"\"
+    """,
+}
+
+
+@pytest.fixture
+def package_dir(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+
+    package_dir = tmp_path / "widgets_api"
+    package_dir.mkdir()
+    for name, source in _WIDGETS_API.items():
+        (package_dir / name).write_text(textwrap.dedent(source))
+
+    yield package_dir
+
+    for name in list(sys.modules):
+        if name.split(".")[0] == "widgets_api":
+            del sys.modules[name]
+
+
+def _widgets_app(**settings):
+    app = importlib.import_module("widgets_api").create_app()
+    OpenAPI(
+        config=OpenAPISettings(
+            api_name="Widgets API",
+            api_version="v1",
+            app_package_name="widgets_api",
+            **settings,
+        )
+    ).init_app(app)
+    return app
+
+
+class DescribeMultipleApps:
+    def it_builds_same_spec_for_each_instance_of_app(self, open_api_settings, open_api):
+        other = OpenAPI(config=open_api_settings)
+        other.init_app(create_app())
+
+        assert other._to_dict == open_api._to_dict
+
+    def it_builds_apps_concurrently(self, open_api_settings, open_api):
+        open_api_settings.lazy_spec_build = True
+        instances = [OpenAPI(config=open_api_settings) for _ in range(4)]
+        for instance in instances:
+            instance.init_app(create_app())
+
+        threads = [
+            threading.Thread(target=lambda _=instance: _._to_dict)
+            for instance in instances
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        for instance in instances:
+            assert instance._to_dict == open_api._to_dict
+
+    def it_documents_only_schemas_of_own_app(self, package_dir, open_api):
+        widgets = _widgets_app().extensions["open_api"]
+
+        assert "Widget" in widgets._to_dict["components"]["schemas"]
+        assert "Book" not in widgets._to_dict["components"]["schemas"]
+        assert "Widget" not in open_api._to_dict["components"]["schemas"]
+        assert widgets._to_dict["info"]["title"] == "Widgets API"
+        assert open_api._to_dict["info"]["title"] == "Example API"
+
+
+class DescribeSchemasDiscovery:
+    def it_documents_only_schemas_used_by_decorators_by_default(self, package_dir):
+        widgets = _widgets_app().extensions["open_api"]
+
+        assert list(widgets._to_dict["components"]["schemas"]) == ["Widget"]
+
+    def it_documents_all_schemas_of_app_package_if_enabled(self, package_dir):
+        widgets = _widgets_app(discover_schemas=True).extensions["open_api"]
+
+        assert list(widgets._to_dict["components"]["schemas"]) == ["Widget", "Gadget"]
+
+
+class DescribeIncrementalRebuild:
+    @pytest.fixture
+    def client(self, package_dir):
+        return _widgets_app(incremental_rebuild=True).test_client()
+
+    def _edit(self, file_path, old, new):
+        file_path.write_text(file_path.read_text().replace(old, new))
+        stat = file_path.stat()
+        # Don't depend on filesystem timestamps resolution
+        os.utime(file_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    def it_rebuilds_docs_of_routes_whose_docstrings_changed(self, package_dir, client):
+        before = client.get("/docs/static/swagger.json").json
+
+        self._edit(package_dir / "views.py", "Old summary", "New summary")
+        after = client.get("/docs/static/swagger.json").json
+
+        old_get = before["paths"]["/widgets/{widget_id}"]["get"]
+        new_get = after["paths"]["/widgets/{widget_id}"]["get"]
+        assert old_get["summary"] == "Old summary"
+        assert new_get["summary"] == "New summary"
+        assert new_get["operationId"] == old_get["operationId"]
+        assert after["paths"]["/widgets"] == before["paths"]["/widgets"]
+
+    def it_doesnt_modify_docstrings_of_view_functions(self, package_dir, client):
+        client.get("/docs/static/swagger.json")
+
+        self._edit(package_dir / "views.py", "Old summary", "New summary")
+        client.get("/docs/static/swagger.json")
+
+        view_func = client.application.view_functions["api.widget_detail"]
+        assert "Old summary" in view_func.__doc__
+
+    def it_keeps_operation_ids_of_overridden_operations(self, package_dir, client):
+        open_api = client.application.extensions["open_api"]
+        client.get("/docs/static/swagger.json")
+        open_api.add_override(
+            "/widgets/<int:widget_id>",
+            "GET",
+            OperationObject(operationId="fetch_widget", summary="Overridden"),
+        )
+
+        self._edit(package_dir / "views.py", "Old summary", "New summary")
+        after = client.get("/docs/static/swagger.json").json
+
+        operation = after["paths"]["/widgets/{widget_id}"]["get"]
+        assert operation["operationId"] == "fetch_widget"
+        assert operation["summary"] == "Overridden"
+
+    def it_uses_operation_ids_changed_in_docstrings(self, package_dir, client):
+        before = client.get("/docs/static/swagger.json").json
+
+        self._edit(
+            package_dir / "views.py",
+            "summary: Old summary",
+            "operationId: fetch_widget\n    summary: Old summary",
+        )
+        renamed = client.get("/docs/static/swagger.json").json
+        self._edit(package_dir / "views.py", "operationId: fetch_widget\n", "")
+        dropped = client.get("/docs/static/swagger.json").json
+
+        operation_ids = [
+            _["paths"]["/widgets/{widget_id}"]["get"]["operationId"]
+            for _ in (before, renamed, dropped)
+        ]
+        assert operation_ids[1:] == ["fetch_widget", operation_ids[0]]
+
+    def it_doesnt_restore_operation_ids_dropped_by_overrides(self, package_dir, client):
+        open_api = client.application.extensions["open_api"]
+        client.get("/docs/static/swagger.json")
+        open_api.add_override(
+            "/widgets/<int:widget_id>", "GET", OperationObject(summary="Overridden")
+        )
+
+        self._edit(package_dir / "views.py", "Old summary", "New summary")
+        after = client.get("/docs/static/swagger.json").json
+
+        assert after["paths"]["/widgets/{widget_id}"]["get"] == {
+            "summary": "Overridden"
+        }
+
+    def it_replaces_components_of_changed_schemas(self, package_dir, client):
+        before = client.get("/docs/static/swagger.json").json
+
+        self._edit(
+            package_dir / "schemas.py",
+            "id = ma.fields.Integer()",
+            "id = ma.fields.Integer()\n    name = ma.fields.String()",
+        )
+        after = client.get("/docs/static/swagger.json").json
+
+        assert "name" not in before["components"]["schemas"]["Widget"]["properties"]
+        assert "name" in after["components"]["schemas"]["Widget"]["properties"]
+        assert after["paths"] == before["paths"]
+
+    def it_serves_cached_spec_when_nothing_changed(self, client):
+        first = client.get("/docs/static/swagger.json")
+        second = client.get(
+            "/docs/static/swagger.json",
+            headers={"If-None-Match": first.get_etag()[0]},
+        )
+
+        assert second.status_code == 304
+
+
+class DescribePrefork:
+    @pytest.fixture
+    def lazy_open_api(self, open_api_settings):
+        open_api_settings.lazy_spec_build = True
+        open_api_settings.shard_spec_by_tag = True
+        open_api = OpenAPI(config=open_api_settings)
+        open_api.init_app(create_app())
+        return open_api
+
+    def it_builds_and_serializes_all_documents(self, lazy_open_api, monkeypatch):
+        lazy_open_api.prefork(freeze_gc=False)
+
+        assert lazy_open_api._is_spec_built
+        assert lazy_open_api._spec_cache._json is not None
+        assert lazy_open_api._spec_cache._yaml is not None
+        assert lazy_open_api._spec_cache._shards
+
+        monkeypatch.setattr(
+            lazy_open_api, "_build_spec", lambda: pytest.fail("Spec built again")
+        )
+        response = lazy_open_api._app.test_client().get("/v1/docs/static/swagger.json")
+        assert response.data == lazy_open_api._spec_cache._json.data
+
+    def it_freezes_garbage_collector(self, lazy_open_api, monkeypatch):
+        calls = []
+        monkeypatch.setattr(gc, "freeze", lambda: calls.append(1))
+
+        lazy_open_api.prefork()
+
+        assert calls == [1]
+
+
+class DescribeReleaseBuildData:
+    @pytest.fixture
+    def released(self, open_api_settings):
+        open_api_settings.release_build_data = True
+        open_api = OpenAPI(config=open_api_settings)
+        open_api.init_app(create_app())
+        return open_api
+
+    def it_releases_build_data(self, released):
+        view_func = released._app.view_functions["example_api.books_list"]
+
+        assert released._apispec is None
+        assert released._paths_manager is None
+        assert released._spec_dict is None
+        assert released._packed_spec is not None
+        assert isinstance(
+            getattr(view_func, FlaskPathsManager.ATTRIBUTE_NAME), OperationRecord
+        )
+
+    def it_unpacks_spec_only_once(self, released, monkeypatch):
+        calls = []
+        loads = marshal.loads
+        monkeypatch.setattr(
+            marshal, "loads", lambda data: calls.append(1) or loads(data)
+        )
+
+        assert released._to_dict == released._to_dict
+        assert calls == [1]
+        assert released._packed_spec is None
+
+    def it_serves_the_same_spec(self, released, open_api):
+        assert released._to_dict == open_api._to_dict
+        assert released._to_yaml == open_api._to_yaml
+
+    def it_builds_spec_again_when_override_is_added(self, released, open_api):
+        released.add_override(
+            "example_api.authors_list", "GET", OperationObject(summary="Overridden")
+        )
+
+        rebuilt = released._to_dict
+        assert rebuilt["paths"]["/v1/authors"]["get"]["summary"] == "Overridden"
+        del rebuilt["paths"]["/v1/authors"]
+        expected = open_api._to_dict
+        del expected["paths"]["/v1/authors"]
+        assert rebuilt == expected
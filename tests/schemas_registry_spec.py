@@ -0,0 +1,150 @@
+import marshmallow as ma
+import pytest
+from apispec import APISpec
+from apispec.ext.marshmallow import MarshmallowPlugin
+
+from flask_marshmallow_openapi import open_api, register_schema, schemas_registry
+from flask_marshmallow_openapi.schemas_registry import SchemasRegistry
+
+from .app_with_shared_schemas.schemas import OrderSchema
+from .example_api.reviews.schemas import ReviewSchema
+from .example_api.schemas import BookSchema
+from .shared_lib.schemas import ErrorSchema
+
+
+@pytest.fixture(autouse=True)
+def _empty_registry(monkeypatch):
+    monkeypatch.setattr(schemas_registry, "_KNOWN_SCHEMAS", {})
+    monkeypatch.setattr(schemas_registry, "_REGISTERED_SCHEMAS", {})
+    monkeypatch.setattr(schemas_registry, "_DISCOVERED_PACKAGES", {})
+
+
+class ForeignSchema(ma.Schema):
+    foo = ma.fields.String()
+
+
+class DescribeRegisteredSchemas:
+    def it_registers_schemas_used_by_decorators(self):
+        @open_api.post(ForeignSchema, BookSchema)
+        def view():
+            pass
+
+        schemas = SchemasRegistry.registered_schemas(__name__)
+
+        assert schemas == {"Foreign": ForeignSchema, "Book": BookSchema}
+
+    def it_registers_schemas_for_app_package_of_registering_module(self):
+        register_schema(ForeignSchema)
+
+        assert SchemasRegistry.registered_schemas(__name__) == {
+            "Foreign": ForeignSchema
+        }
+        assert SchemasRegistry.registered_schemas("tests.example_api") == {}
+
+    def it_registers_schemas_without_module_for_all_apps(self):
+        SchemasRegistry.register(ForeignSchema)
+
+        assert SchemasRegistry.registered_schemas("tests.example_api") == {
+            "Foreign": ForeignSchema
+        }
+
+    def it_documents_only_registered_schemas_by_default(self):
+        SchemasRegistry.register(BookSchema, "tests.example_api.views")
+
+        schemas = SchemasRegistry("tests.example_api").schemas()
+
+        assert schemas == {"Book": BookSchema}
+
+
+class DescribeFindAllSchemas:
+    def it_finds_schemas_at_any_depth_of_app_package(self):
+        schemas = SchemasRegistry.find_all_schemas("tests.example_api")
+
+        assert schemas["Book"] is BookSchema
+        assert schemas["Review"] is ReviewSchema
+
+    def it_ignores_schemas_defined_outside_of_app_package(self):
+        class LocalSchema(ma.Schema):
+            pass
+
+        schemas = SchemasRegistry.find_all_schemas("tests.example_api")
+
+        assert "Foreign" not in schemas
+        assert "Local" not in schemas
+
+    def it_finds_schemas_imported_into_app_package(self):
+        schemas = SchemasRegistry.find_all_schemas("tests.app_with_shared_schemas")
+
+        assert schemas == {"Order": OrderSchema, "Error": ErrorSchema}
+
+    def it_includes_registered_schemas(self):
+        SchemasRegistry.register(ForeignSchema)
+
+        schemas = SchemasRegistry.find_all_schemas("tests.example_api")
+
+        assert schemas["Foreign"] is ForeignSchema
+
+    def it_scans_each_package_only_once(self, monkeypatch):
+        SchemasRegistry.find_all_schemas("tests.example_api")
+
+        monkeypatch.setattr(
+            SchemasRegistry,
+            "_discover_schemas",
+            classmethod(lambda cls, name: pytest.fail("Scanned again!")),
+        )
+
+        schemas = SchemasRegistry("tests.example_api", discover=True).schemas()
+
+        assert schemas["Review"] is ReviewSchema
+
+
+class PageSchema(ma.Schema):
+    number = ma.fields.Integer()
+
+
+class ChapterSchema(ma.Schema):
+    pages = ma.fields.List(ma.fields.Nested(PageSchema))
+    first_page = ma.fields.Nested(PageSchema(only=("number",)))
+
+
+class VolumeSchema(ma.Schema):
+    chapters = ma.fields.Dict(values=ma.fields.Nested(ChapterSchema))
+    # Lambda, because VolumeSchema isn't defined yet
+    previous = ma.fields.Nested(lambda: VolumeSchema())  # noqa: PLW0108
+
+
+class EditorSchema(ma.Schema):
+    # Lambda, because ImprintSchema is defined below
+    imprint = ma.fields.Nested(lambda: ImprintSchema())  # noqa: PLW0108
+
+
+class ImprintSchema(ma.Schema):
+    editor = ma.fields.Nested(EditorSchema)
+
+
+class DescribeInDependencyOrder:
+    def it_puts_nested_schemas_before_schemas_nesting_them(self):
+        ordered = SchemasRegistry.in_dependency_order(
+            {"Volume": VolumeSchema, "Foreign": ForeignSchema, "Page": PageSchema}
+        )
+
+        assert list(ordered) == ["Page", "Volume", "Foreign"]
+        assert isinstance(ordered["Volume"], VolumeSchema)
+
+    def it_keeps_order_of_schemas_that_dont_nest_each_other(self):
+        ordered = SchemasRegistry.in_dependency_order(
+            {"Foreign": ForeignSchema, "Page": PageSchema}
+        )
+
+        assert list(ordered) == ["Foreign", "Page"]
+
+    def it_orders_circular_references_as_apispec_registers_them(self):
+        spec = APISpec("Test", "v1", "3.1.0", plugins=[MarshmallowPlugin()])
+        spec.components.schema("Editor", schema=EditorSchema)
+
+        ordered = SchemasRegistry.in_dependency_order(
+            {"Editor": EditorSchema, "Imprint": ImprintSchema}
+        )
+
+        assert list(ordered) == list(spec.to_dict()["components"]["schemas"])
+        assert list(ordered) == ["Imprint", "Editor"]
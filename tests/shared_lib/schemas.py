@@ -0,0 +1,6 @@
+import marshmallow as ma
+
+
+class ErrorSchema(ma.Schema):
+    code = ma.fields.String()
+    message = ma.fields.String()
@@ -0,0 +1,171 @@
+import json
+from urllib.parse import urljoin
+
+import pytest
+
+from flask_marshmallow_openapi import OpenAPI
+from flask_marshmallow_openapi.spec_shards import (
+    UNTAGGED_SHARD,
+    shard_slugs,
+    split_by_tag,
+)
+
+from .example_api import create_app
+
+_SPEC = {
+    "openapi": "3.0.2",
+    "info": {"title": "Pets", "version": "v1"},
+    "tags": [{"name": "Dogs", "description": "Woof"}, {"name": "Cats"}],
+    "paths": {
+        "/dogs": {
+            "parameters": [{"name": "q", "in": "query"}],
+            "get": {
+                "tags": ["Dogs"],
+                "responses": {
+                    "200": {
+                        "content": {
+                            "application/json": {
+                                "schema": {"$ref": "#/components/schemas/Dog"}
+                            }
+                        }
+                    }
+                },
+            },
+        },
+        "/pets": {
+            "get": {
+                "tags": ["Cats", "Dogs"],
+                "responses": {"200": {"$ref": "#/components/responses/Pets"}},
+            },
+            "post": {"tags": ["Cats"]},
+        },
+        "/health": {"get": {}},
+    },
+    "components": {
+        "securitySchemes": {"token": {"type": "http", "scheme": "bearer"}},
+        "responses": {
+            "Pets": {
+                "content": {
+                    "application/json": {"schema": {"$ref": "#/components/schemas/Pet"}}
+                }
+            }
+        },
+        "schemas": {
+            "Owner": {"type": "object"},
+            "Pet": {"properties": {"owner": {"$ref": "#/components/schemas/Owner"}}},
+            "Dog": {"allOf": [{"$ref": "#/components/schemas/Pet"}]},
+            "Cat": {"type": "object"},
+        },
+    },
+}
+
+
+class DescribeSplitByTag:
+    def it_creates_shard_for_each_tag(self):
+        shards = split_by_tag(_SPEC)
+
+        assert list(shards) == ["Dogs", "Cats", UNTAGGED_SHARD]
+        assert list(shards["Dogs"]["paths"]) == ["/dogs", "/pets"]
+        assert list(shards["Cats"]["paths"]["/pets"]) == ["get", "post"]
+        assert list(shards["Dogs"]["paths"]["/pets"]) == ["get"]
+        assert list(shards[UNTAGGED_SHARD]["paths"]) == ["/health"]
+
+    def it_keeps_common_parts_of_spec(self):
+        dogs = split_by_tag(_SPEC)["Dogs"]
+
+        assert dogs["info"] == _SPEC["info"]
+        assert dogs["tags"] == [{"name": "Dogs", "description": "Woof"}]
+        assert dogs["paths"]["/dogs"]["parameters"] == [{"name": "q", "in": "query"}]
+
+    def it_includes_only_referenced_components(self):
+        shards = split_by_tag(_SPEC)
+
+        assert shards["Dogs"]["components"] == {
+            "securitySchemes": _SPEC["components"]["securitySchemes"],
+            "responses": _SPEC["components"]["responses"],
+            "schemas": {
+                "Owner": {"type": "object"},
+                "Pet": _SPEC["components"]["schemas"]["Pet"],
+                "Dog": _SPEC["components"]["schemas"]["Dog"],
+            },
+        }
+        assert "schemas" not in shards[UNTAGGED_SHARD]["components"]
+
+
+class DescribeShardSlugs:
+    def it_generates_unique_url_safe_names(self):
+        assert shard_slugs(["Books", "Grupa: Books", "books", "index"]) == {
+            "Books": "books",
+            "Grupa: Books": "grupa-books",
+            "books": "books-1",
+            "index": "index-1",
+        }
+
+
+class DescribeShardedSpec:
+    @pytest.fixture
+    def app(self, open_api_settings):
+        open_api_settings.shard_spec_by_tag = True
+        app = create_app()
+        OpenAPI(config=open_api_settings).init_app(app)
+        return app
+
+    def it_serves_shards_listed_in_index(self, client, open_api):
+        index_url = "/v1/docs/static/swagger/index.json"
+        index = client.get(index_url).json
+
+        assert sorted(_["name"] for _ in index) == sorted(
+            ["Authors", "Books", "Catalogue", "Inventory", "Publishers", UNTAGGED_SHARD]
+        )
+
+        paths = {}
+        for shard in index:
+            response = client.get(urljoin(index_url, shard["url"]))
+            assert response.status_code == 200
+            assert response.get_etag()[0]
+            for path, path_item in response.json["paths"].items():
+                paths.setdefault(path, {}).update(path_item)
+
+        assert paths == open_api._to_dict["paths"]
+
+    def it_includes_only_components_used_by_shard(self, client):
+        publishers = client.get("/v1/docs/static/swagger/publishers.json").json
+
+        assert list(publishers["components"]["schemas"]) == ["Publisher"]
+        assert "access_token" in publishers["components"]["securitySchemes"]
+
+    def it_responds_not_found_to_unknown_shard(self, client):
+        assert client.get("/v1/docs/static/swagger/nope.json").status_code == 404
+
+    def it_configures_swagger_ui_with_shards(self, client):
+        index_url = "/v1/docs/static/swagger/index.json"
+        index = client.get(index_url).json
+        page = client.get("/v1/docs/swagger_ui").get_data(as_text=True)
+
+        urls = [{"url": urljoin(index_url, _["url"]), "name": _["name"]} for _ in index]
+        assert json.dumps(urls) in page
+        assert "swagger.json" not in page
+
+    def it_serves_the_same_index_through_any_script_root(self, client):
+        first = client.get(
+            "/v1/docs/static/swagger/index.json",
+            environ_overrides={"SCRIPT_NAME": "/mounted"},
+        ).json
+        second = client.get("/v1/docs/static/swagger/index.json").json
+
+        assert first == second
+        assert all("/" not in _["url"] for _ in second)
+
+    def it_collects_shards(self, app, open_api, tmp_path):
+        with app.app_context():
+            open_api.collect_static(tmp_path)
+
+        shards_dir = tmp_path / "docs" / "static" / "swagger"
+        index = json.loads((shards_dir / "index.json").read_text())
+        swagger_ui = (tmp_path / "docs" / "swagger_ui.html").read_text()
+
+        assert len(index) == 6
+        for shard in index:
+            assert f"swagger/{shard['url']}" in swagger_ui
+            assert (shards_dir / shard["url"]).is_file()
+            assert (shards_dir / f"{shard['url']}.gz").is_file()
@@ -0,0 +1,141 @@
+import dataclasses
+
+import pytest
+from openapi_pydantic_models import OperationObject
+
+from flask_marshmallow_openapi import OpenAPI, spec_snapshot
+from flask_marshmallow_openapi.spec_snapshot import SpecFingerprint, SpecSnapshot
+
+from .example_api import create_app, views
+
+
+@pytest.fixture
+def snapshot_settings(open_api_settings, tmp_path):
+    return dataclasses.replace(open_api_settings, spec_snapshot_dir=tmp_path)
+
+
+def _boot(settings, **app_config):
+    app = create_app()
+    app.config.update(app_config)
+    open_api = OpenAPI(config=settings)
+    open_api.init_app(app)
+    return open_api
+
+
+class DescribeSpecSnapshot:
+    def it_ignores_snapshot_with_other_fingerprint(self, tmp_path):
+        snapshot = SpecSnapshot(tmp_path / "spec.marshal")
+        snapshot.save("foo", {"paths": {}})
+
+        assert snapshot.load("foo") == {"paths": {}}
+        assert snapshot.load("bar") is None
+
+    def it_ignores_broken_snapshot_file(self, tmp_path):
+        (tmp_path / "spec.marshal").write_bytes(b"definitely not marshal data")
+
+        assert SpecSnapshot(tmp_path / "spec.marshal").load("foo") is None
+
+
+class DescribeSpecFingerprint:
+    def it_is_reliable_for_plain_values_and_readable_sources(self):
+        fingerprint = SpecFingerprint()
+
+        fingerprint.update(fingerprint.repr({"foo": [1, "bar"]}))
+        fingerprint.update_source(SpecFingerprint)
+
+        assert fingerprint.is_reliable
+
+    def it_is_not_reliable_for_reprs_with_memory_address(self):
+        fingerprint = SpecFingerprint()
+
+        fingerprint.update(fingerprint.repr(object()))
+
+        assert not fingerprint.is_reliable
+
+    def it_is_not_reliable_for_unreadable_sources(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(
+            spec_snapshot, "source_file", lambda obj: str(tmp_path / "missing.py")
+        )
+        fingerprint = SpecFingerprint()
+
+        fingerprint.update_source(SpecFingerprint)
+
+        assert not fingerprint.is_reliable
+
+
+class DescribeSpecBuildFromSnapshot:
+    def it_loads_spec_instead_of_building_it(
+        self, snapshot_settings, open_api, monkeypatch
+    ):
+        built = _boot(snapshot_settings)
+        assert built._apispec is not None
+
+        monkeypatch.setattr(
+            OpenAPI, "_collect_endpoints_docs", lambda self: pytest.fail("Built!")
+        )
+        loaded = _boot(snapshot_settings)
+
+        assert loaded._apispec is None
+        assert loaded._to_dict == built._to_dict == open_api._to_dict
+        assert loaded._to_yaml == open_api._to_yaml
+
+    def it_builds_spec_when_docstring_changes(self, snapshot_settings, monkeypatch):
+        _boot(snapshot_settings)
+
+        monkeypatch.setattr(views.books_detail, "__doc__", "Changed description.")
+        rebuilt = _boot(snapshot_settings)
+
+        assert rebuilt._apispec is not None
+        assert (
+            rebuilt._to_dict["paths"]["/v1/books/{book_id}"]["get"]["description"]
+            == "Changed description."
+        )
+
+    def it_loads_spec_when_config_not_used_by_docstrings_changes(
+        self, snapshot_settings, monkeypatch
+    ):
+        _boot(snapshot_settings, SOME_CLIENT=object())
+
+        monkeypatch.setattr(
+            OpenAPI, "_collect_endpoints_docs", lambda self: pytest.fail("Built!")
+        )
+        loaded = _boot(snapshot_settings, SOME_CLIENT=object(), MAX_CONTENT_LENGTH=1)
+
+        assert loaded._apispec is None
+
+    def it_builds_spec_when_config_used_by_docstrings_changes(self, snapshot_settings):
+        _boot(snapshot_settings)
+
+        rebuilt = _boot(snapshot_settings, CATALOGUE_NAME="shop")
+
+        assert rebuilt._apispec is not None
+        assert "Lists books in shop." in (
+            rebuilt._to_dict["paths"]["/v1/books"]["get"]["description"]
+        )
+
+    def it_doesnt_use_snapshot_when_config_used_by_docstrings_has_memory_address(
+        self, snapshot_settings, tmp_path
+    ):
+        built = _boot(snapshot_settings, CATALOGUE_NAME=object())
+
+        assert built._apispec is not None
+        assert not list(tmp_path.glob("*.marshal"))
+
+    def it_builds_spec_when_config_used_by_url_for_changes(self, snapshot_settings):
+        _boot(snapshot_settings)
+
+        rebuilt = _boot(snapshot_settings, SERVER_NAME="api.example.com")
+
+        assert rebuilt._apispec is not None
+
+    def it_builds_spec_again_when_override_is_added(self, snapshot_settings):
+        _boot(snapshot_settings)
+        loaded = _boot(snapshot_settings)
+
+        loaded.add_override(
+            "example_api.authors_list", "GET", OperationObject(summary="Overridden")
+        )
+
+        assert loaded._to_dict["paths"]["/v1/authors"]["get"]["summary"] == (
+            "Overridden"
+        )
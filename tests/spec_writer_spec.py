@@ -0,0 +1,105 @@
+import decimal
+import hashlib
+import io
+import json
+
+import pytest
+import yaml
+
+from flask_marshmallow_openapi import spec_writer
+from flask_marshmallow_openapi.spec_writer import (
+    dump_yaml,
+    iter_json,
+    json_backend,
+    write_json,
+    write_yaml,
+)
+
+_TRICKY_VALUES = {
+    "strings": ["šđčćž", '\x01\t\n/"\\', "\u2028"],
+    "numbers": [0, -1, 1.5, 0.1, 2**40],
+    "nested": {"empty_dict": {}, "empty_list": [], "null": None, "bool": True},
+}
+
+_ORJSON = pytest.param(
+    "orjson",
+    marks=pytest.mark.skipif(
+        spec_writer.orjson is None, reason="orjson is not installed"
+    ),
+)
+
+
+class DescribeJsonBackends:
+    @pytest.mark.parametrize("indent", [False, True])
+    def it_serializes_with_json_dumps_defaults_by_default(self, open_api, indent):
+        spec = dict(open_api._to_dict, **{"x-tricky": _TRICKY_VALUES})
+
+        assert json_backend()(spec, indent=indent) == json.dumps(
+            spec, indent=2 if indent else None
+        ).encode("ascii")
+
+    @pytest.mark.parametrize("indent", [False, True])
+    def it_produces_equivalent_json_with_each_backend(self, open_api, indent):
+        pytest.importorskip("orjson")
+        spec = dict(open_api._to_dict, **{"x-tricky": _TRICKY_VALUES})
+
+        assert json.loads(json_backend("orjson")(spec, indent=indent)) == json.loads(
+            json_backend("stdlib")(spec, indent=indent)
+        )
+
+    def it_falls_back_to_stdlib_if_orjson_is_not_installed(self, monkeypatch):
+        monkeypatch.setattr(spec_writer, "orjson", None)
+
+        with pytest.warns(RuntimeWarning, match="orjson"):
+            assert json_backend("orjson") is json_backend("stdlib")
+
+    def it_rejects_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unsupported"):
+            json_backend("simplejson")
+
+
+class DescribeIterJson:
+    @pytest.mark.parametrize("backend", ["stdlib", _ORJSON])
+    @pytest.mark.parametrize("indent", [False, True])
+    def it_generates_same_json_as_one_shot_dumps(self, open_api, backend, indent):
+        spec = open_api._to_dict
+        dumps = json_backend(backend)
+
+        data = b"".join(iter_json(spec, indent=indent, dumps=dumps))
+
+        assert data == dumps(spec, indent=indent)
+        assert json.loads(data) == spec
+
+    def it_generates_chunks(self, open_api, monkeypatch):
+        monkeypatch.setattr(spec_writer, "CHUNK_SIZE", 256)
+
+        chunks = list(iter_json(open_api._to_dict))
+
+        assert len(chunks) > 1
+        assert all(len(_) >= 256 for _ in chunks[:-1])
+
+
+class DescribeWriteSpec:
+    def it_writes_json_and_returns_its_digest(self, open_api):
+        f = io.BytesIO()
+
+        digest = write_json(open_api._to_dict, f)
+
+        assert f.getvalue() == json.dumps(open_api._to_dict, indent=2).encode("utf-8")
+        assert digest == hashlib.sha256(f.getvalue()).hexdigest()
+
+    def it_writes_yaml_and_returns_its_digest(self, open_api):
+        f = io.BytesIO()
+
+        digest = write_yaml(open_api._to_dict, f)
+
+        assert f.getvalue() == dump_yaml(open_api._to_dict).encode("utf-8")
+        assert digest == hashlib.sha256(f.getvalue()).hexdigest()
+
+    def it_writes_the_same_yaml_as_apispec(self, open_api):
+        assert dump_yaml(open_api._to_dict) == open_api._ensure_spec().to_yaml()
+
+    def it_writes_yaml_of_values_safe_dumper_cant_represent(self):
+        spec = {"x-values": [decimal.Decimal("1.5"), frozenset({"a"})]}
+
+        assert dump_yaml(spec) == yaml.dump(spec, sort_keys=False)
@@ -0,0 +1,244 @@
+import gzip
+import json
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from flask_marshmallow_openapi import static_collector
+from flask_marshmallow_openapi.static_collector import StaticResourcesCollector
+
+_SRC_STATIC = static_collector._SELF_PATH / "static"
+
+
+@pytest.fixture
+def collect_static(app, open_api, tmp_path):
+    def collect(**kwargs):
+        with app.app_context():
+            return open_api.collect_static(tmp_path, **kwargs)
+
+    return collect
+
+
+@pytest.fixture
+def installed(monkeypatch):
+    retv = []
+    install = StaticResourcesCollector._install_static_file
+
+    def recording_install(self, src_path, dest_path):
+        retv.append(src_path.relative_to(_SRC_STATIC).as_posix())
+        install(self, src_path, dest_path)
+
+    monkeypatch.setattr(
+        StaticResourcesCollector, "_install_static_file", recording_install
+    )
+    return retv
+
+
+class DescribeCollectStatic:
+    def it_writes_gzip_siblings_for_spec_and_assets(self, collect_static, tmp_path):
+        swagger_json_path = collect_static()
+
+        for path in [
+            swagger_json_path,
+            *swagger_json_path.parent.glob("swagger_*.yaml"),
+            tmp_path / "docs" / "swagger_ui.html",
+            tmp_path / "docs" / "static" / "swagger_ui" / "swagger-ui-bundle.js",
+        ]:
+            gzipped = path.with_name(path.name + ".gz")
+            assert gzip.decompress(gzipped.read_bytes()) == path.read_bytes()
+
+        assert not (
+            tmp_path / "docs" / "static" / "swagger_ui" / "favicon-16x16.png.gz"
+        ).exists()
+
+    def it_skips_unchanged_static_files(self, collect_static, installed, tmp_path):
+        bundle_gz = (
+            tmp_path / "docs" / "static" / "swagger_ui" / "swagger-ui-bundle.js.gz"
+        )
+
+        collect_static()
+        assert "swagger_ui/swagger-ui-bundle.js" in installed
+        bundle_gz_mtime = bundle_gz.stat().st_mtime_ns
+
+        installed.clear()
+        collect_static()
+        assert installed == []
+        assert bundle_gz.stat().st_mtime_ns == bundle_gz_mtime
+
+    def it_skips_compressing_unchanged_generated_files(
+        self, collect_static, monkeypatch, tmp_path
+    ):
+        compressed = []
+        write_gzip_sibling = static_collector.write_gzip_sibling
+        monkeypatch.setattr(
+            static_collector,
+            "write_gzip_sibling",
+            lambda path: compressed.append(path) or write_gzip_sibling(path),
+        )
+        changelog = tmp_path / "docs" / "changelog.html"
+
+        swagger_json_path = collect_static()
+        assert swagger_json_path in compressed
+        assert changelog in compressed
+
+        compressed.clear()
+        collect_static()
+        assert compressed == []
+
+        changelog.with_name("changelog.html.gz").unlink()
+        collect_static()
+        assert compressed == [changelog]
+        assert (
+            gzip.decompress(changelog.with_name("changelog.html.gz").read_bytes())
+            == changelog.read_bytes()
+        )
+
+    def it_rewrites_gzip_siblings_compressed_from_other_content(
+        self, collect_static, tmp_path
+    ):
+        index_css = tmp_path / "docs" / "static" / "swagger_ui" / "index.css"
+        index_css_gz = index_css.with_name("index.css.gz")
+        collect_static()
+
+        manifest_path = tmp_path / "docs" / ".collect_static.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["swagger_ui/index.css"]["gzip_sha256"] = "0" * 64
+        manifest_path.write_text(json.dumps(manifest))
+        index_css_gz.write_bytes(gzip.compress(b"stale"))
+        future = index_css.stat().st_mtime_ns + 10**12
+        os.utime(index_css_gz, ns=(future, future))
+
+        collect_static()
+
+        assert gzip.decompress(index_css_gz.read_bytes()) == index_css.read_bytes()
+
+    def it_restores_missing_static_files(self, collect_static, installed, tmp_path):
+        collect_static()
+        (tmp_path / "docs" / "static" / "swagger_ui" / "index.css").unlink()
+
+        installed.clear()
+        collect_static()
+
+        assert installed == ["swagger_ui/index.css"]
+        assert (tmp_path / "docs" / "static" / "swagger_ui" / "index.css").is_file()
+
+    def it_hardlinks_static_files(self, collect_static, tmp_path):
+        collect_static(hardlink_static=True)
+
+        src = _SRC_STATIC / "swagger_ui" / "swagger-ui-bundle.js"
+        dest = tmp_path / "docs" / "static" / "swagger_ui" / "swagger-ui-bundle.js"
+        if src.stat().st_dev != dest.stat().st_dev:
+            pytest.skip("Hardlinks are not possible across filesystems")
+
+        assert src.samefile(dest)
+
+    def it_excludes_unused_static_files(self, collect_static, tmp_path):
+        swagger_ui = tmp_path / "docs" / "static" / "swagger_ui"
+
+        collect_static()
+        assert (swagger_ui / "swagger-ui-bundle.js.map").is_file()
+
+        collect_static(exclude_unused_static=True)
+        assert (swagger_ui / "swagger-ui-bundle.js").is_file()
+        assert (swagger_ui / "swagger-ui-standalone-preset.js").is_file()
+        assert (swagger_ui / "oauth2-redirect.html").is_file()
+        assert not list(swagger_ui.glob("*.map"))
+        assert not list(swagger_ui.glob("swagger-ui-es-bundle*"))
+        assert not (swagger_ui / "swagger-ui.js").exists()
+        assert not (swagger_ui / "index.html.gz").exists()
+
+    def it_writes_static_files_under_content_hashed_names(
+        self, collect_static, tmp_path
+    ):
+        docs_static = tmp_path / "docs" / "static"
+
+        swagger_json_path = collect_static(cache_bust_static=True)
+
+        asset_names = json.loads((docs_static / "asset_manifest.json").read_text())
+        assert asset_names["swagger.json"] == swagger_json_path.name
+
+        hashed_bundle = asset_names["swagger_ui/swagger-ui-bundle.js"]
+        assert re.fullmatch(
+            r"swagger_ui/swagger-ui-bundle\.[0-9a-f]{12}\.js", hashed_bundle
+        )
+        assert (docs_static / hashed_bundle).read_bytes() == (
+            _SRC_STATIC / "swagger_ui" / "swagger-ui-bundle.js"
+        ).read_bytes()
+
+        swagger_ui = (tmp_path / "docs" / "swagger_ui.html").read_text()
+        assert hashed_bundle in swagger_ui
+        assert "swagger-ui-bundle.js" not in swagger_ui
+        re_doc = (tmp_path / "docs" / "re_doc.html").read_text()
+        assert asset_names["redoc_favicon.png"] in re_doc
+
+    def it_removes_stale_content_hashed_files(self, collect_static, tmp_path):
+        docs_static = tmp_path / "docs" / "static"
+        collect_static(cache_bust_static=True)
+
+        manifest_path = tmp_path / "docs" / ".collect_static.json"
+        manifest = json.loads(manifest_path.read_text())
+        stale = docs_static / "swagger_ui" / "index.000000000000.css"
+        stale.write_text("old")
+        manifest["swagger_ui/index.css"][
+            "hashed_name"
+        ] = "swagger_ui/index.000000000000.css"
+        manifest_path.write_text(json.dumps(manifest))
+
+        collect_static(cache_bust_static=True)
+
+        assert not stale.exists()
+
+
+_COLLECT_STATIC_SCRIPT = """
+import sys
+
+from flask_marshmallow_openapi import OpenAPI, OpenAPISettings
+from tests.example_api import create_app
+
+app = create_app()
+open_api = OpenAPI(
+    config=OpenAPISettings(
+        api_name="Example API",
+        api_version="v1",
+        app_package_name="tests.example_api",
+        mounted_at="/v1",
+        changelog_md_loader=lambda: "# CHANGELOG\\n",
+        shard_spec_by_tag=True,
+    )
+)
+open_api.init_app(app)
+with app.app_context():
+    open_api.collect_static(
+        sys.argv[1], cache_bust_static=True, exclude_unused_static=True
+    )
+"""
+
+
+class DescribeDeterministicOutput:
+    def it_writes_identical_files_regardless_of_hash_seed(self, tmp_path):
+        spec_files = {}
+        hash_seeds = ["0", "1", "2", "3", "42"]
+        for hash_seed in hash_seeds:
+            destination_dir = tmp_path / hash_seed
+            subprocess.run(  # noqa: S603
+                [sys.executable, "-c", _COLLECT_STATIC_SCRIPT, str(destination_dir)],
+                check=True,
+                cwd=Path(__file__).parent.parent,
+                env=dict(os.environ, PYTHONHASHSEED=hash_seed),
+            )
+            docs_static = destination_dir / "docs" / "static"
+            spec_files[hash_seed] = {
+                path.relative_to(docs_static).as_posix(): path.read_bytes()
+                for path in [
+                    *docs_static.glob("swagger*.*"),
+                    *docs_static.glob("swagger/*"),
+                    docs_static / "asset_manifest.json",
+                ]
+            }
+
+        for hash_seed in hash_seeds[1:]:
+            assert spec_files[hash_seed] == spec_files[hash_seeds[0]]
@@ -0,0 +1,147 @@
+import collections
+import gzip
+import json
+import threading
+import time
+
+import pytest
+from openapi_pydantic_models import OperationObject
+
+from flask_marshmallow_openapi import OpenAPI
+
+from .example_api import create_app
+
+
+class DescribeSwaggerJson:
+    def it_serves_spec_with_strong_etag(self, client, open_api):
+        response = client.get("/v1/docs/static/swagger.json")
+
+        assert response.status_code == 200
+        assert response.mimetype == "application/json"
+        assert json.loads(response.data) == open_api._to_dict
+
+        etag, is_weak = response.get_etag()
+        assert etag
+        assert not is_weak
+
+    def it_responds_not_modified_to_matching_if_none_match(self, client):
+        for url in ["/v1/docs/static/swagger.json", "/v1/docs/static/swagger.yaml"]:
+            etag, _ = client.get(url).get_etag()
+
+            response = client.get(url, headers={"If-None-Match": f'"{etag}"'})
+
+            assert response.status_code == 304
+            assert not response.data
+
+    def it_regenerates_document_after_override(self, client, open_api):
+        old_etag, _ = client.get("/v1/docs/static/swagger.json").get_etag()
+
+        open_api.add_override(
+            "example_api.authors_list", "GET", OperationObject(summary="Overridden")
+        )
+
+        response = client.get(
+            "/v1/docs/static/swagger.json", headers={"If-None-Match": f'"{old_etag}"'}
+        )
+        assert response.status_code == 200
+        assert response.get_etag()[0] != old_etag
+        assert response.json["paths"]["/v1/authors"]["get"] == {"summary": "Overridden"}
+
+    def it_serves_gzipped_spec_to_clients_accepting_gzip(self, client, open_api):
+        response = client.get(
+            "/v1/docs/static/swagger.json", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.status_code == 200
+        assert response.content_encoding == "gzip"
+        assert "Accept-Encoding" in response.vary
+        assert json.loads(gzip.decompress(response.data)) == open_api._to_dict
+
+
+class DescribeStaticFiles:
+    def it_serves_gzipped_assets_to_clients_accepting_gzip(self, client):
+        url = "/v1/docs/static/swagger_ui/swagger-ui.css"
+        plain = client.get(url)
+        response = client.get(url, headers={"Accept-Encoding": "gzip, deflate"})
+
+        assert response.status_code == 200
+        assert response.content_encoding == "gzip"
+        assert gzip.decompress(response.data) == plain.data
+        assert len(response.data) < len(plain.data)
+
+        etag, _ = response.get_etag()
+        response = client.get(
+            url, headers={"Accept-Encoding": "gzip", "If-None-Match": f'"{etag}"'}
+        )
+        assert response.status_code == 304
+        plain.close()
+
+    def it_keeps_bounded_number_of_gzipped_assets_in_memory(
+        self, client, open_api, monkeypatch
+    ):
+        monkeypatch.setattr(open_api.blueprint, "GZIPPED_FILES_CACHE_SIZE", 1)
+        for name in ("swagger-ui.css", "swagger-ui-bundle.js", "swagger-ui.css"):
+            response = client.get(
+                f"/v1/docs/static/swagger_ui/{name}",
+                headers={"Accept-Encoding": "gzip"},
+            )
+            assert response.content_encoding == "gzip"
+
+        assert [
+            path.rsplit("/", 1)[-1] for path in open_api.blueprint._gzipped_files
+        ] == ["swagger-ui.css"]
+
+    def it_serves_gzipped_assets_from_multiple_threads(
+        self, app, open_api, monkeypatch
+    ):
+        class YieldingCache(collections.OrderedDict):
+            def __setitem__(self, key, value):
+                super().__setitem__(key, value)
+                # Let other threads update cache in the middle of this update
+                time.sleep(0.001)
+
+        monkeypatch.setattr(open_api.blueprint, "GZIPPED_FILES_CACHE_SIZE", 1)
+        monkeypatch.setattr(open_api.blueprint, "_gzipped_files", YieldingCache())
+        names = ["swagger-ui.css", "index.css", "swagger-initializer.js"]
+        statuses = []
+
+        def serve():
+            client = app.test_client()
+            for i in range(10):
+                response = client.get(
+                    f"/v1/docs/static/swagger_ui/{names[i % len(names)]}",
+                    headers={"Accept-Encoding": "gzip"},
+                )
+                statuses.append(response.status_code)
+
+        threads = [threading.Thread(target=serve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert statuses == [200] * 10 * len(threads)
+        assert len(open_api.blueprint._gzipped_files) == 1
+
+
+class DescribeStreamedSwaggerJson:
+    @pytest.fixture
+    def app(self, open_api_settings):
+        open_api_settings.stream_spec_json = True
+        app = create_app()
+        OpenAPI(config=open_api_settings).init_app(app)
+        return app
+
+    def it_streams_spec(self, client, open_api):
+        response = client.get("/v1/docs/static/swagger.json")
+
+        assert response.is_streamed
+        assert response.data == open_api._json_dumps(open_api._to_dict)
+
+    def it_streams_compressed_spec(self, client, open_api):
+        response = client.get(
+            "/v1/docs/static/swagger.json", headers={"Accept-Encoding": "gzip"}
+        )
+
+        assert response.content_encoding == "gzip"
+        assert gzip.decompress(response.data) == open_api._json_dumps(open_api._to_dict)